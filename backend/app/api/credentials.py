@@ -0,0 +1,41 @@
+"""
+Credentials for the MCP server.
+This module reads the Kit.com credential of a request from its headers or the environment.
+"""
+
+from typing import Dict, Mapping, Optional
+import os
+
+def kit_credentials(api_key: Optional[str] = None, access_token: Optional[str] = None,
+                    environment: bool = True) -> Dict[str, Optional[str]]:
+    """
+    Pick the Kit.com credential to lease a client with.
+
+    An OAuth access token wins over an API key, since only access tokens can
+    use the bulk endpoints.
+
+    Args:
+        api_key: Kit.com API key sent with the request
+        access_token: Kit.com OAuth access token sent with the request
+        environment: Fall back to KIT_ACCESS_TOKEN and KIT_API_KEY when neither is sent
+
+    Returns:
+        Keyword arguments for KitClientRegistry.lease, with at most one credential set
+    """
+    if not api_key and not access_token and environment:
+        api_key, access_token = os.getenv("KIT_API_KEY"), os.getenv("KIT_ACCESS_TOKEN")
+    if access_token:
+        return {"api_key": None, "access_token": access_token}
+    return {"api_key": api_key or None, "access_token": None}
+
+def kit_credentials_from_headers(headers: Mapping[str, str]) -> Dict[str, Optional[str]]:
+    """
+    Pick the Kit.com credential sent in the X-Kit-Access-Token or X-Kit-API-Key header.
+
+    Args:
+        headers: Request headers
+
+    Returns:
+        Keyword arguments for KitClientRegistry.lease, with at most one credential set
+    """
+    return kit_credentials(headers.get("X-Kit-API-Key"), headers.get("X-Kit-Access-Token"))
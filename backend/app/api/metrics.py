@@ -0,0 +1,27 @@
+"""
+Metrics endpoint for the MCP server.
+This module exposes the server's metrics in the Prometheus text exposition format.
+"""
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+import logging
+
+from ..telemetry.metrics import KIT_CLIENT_RETRIES, KIT_CLIENTS, KIT_QUEUE_DEPTH, KIT_THROTTLED, registry
+
+router = APIRouter(tags=["metrics"])
+
+logger = logging.getLogger(__name__)
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    """
+    Get per-stage, Kit.com API and Claude API latency histograms, retry, 429 and
+    cache counters, Kit.com client queueing gauges, and token usage for Prometheus to scrape.
+    """
+    kit_stats = request.app.state.kit_client_registry.stats()
+    KIT_CLIENTS.set(kit_stats["clients"])
+    KIT_QUEUE_DEPTH.set(kit_stats["queue_depth"])
+    KIT_THROTTLED.set(kit_stats["throttled"])
+    KIT_CLIENT_RETRIES.set(kit_stats["retries"])
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
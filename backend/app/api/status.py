@@ -8,11 +8,10 @@ import os
 import logging
 from typing import Dict, Any
 
-from ..kit_client.api import KitClient, KitClientConfig
+from .credentials import kit_credentials_from_headers
 
 router = APIRouter(prefix="/api/status", tags=["status"])
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @router.get("/kit")
@@ -20,22 +19,21 @@ async def kit_status(request: Request):
     """
     Check the status of the Kit.com API connection.
     """
-    api_key = request.headers.get("X-Kit-API-Key") or os.getenv("KIT_API_KEY", "")
+    credential = kit_credentials_from_headers(request.headers)
     
-    if not api_key:
-        raise HTTPException(status_code=400, detail="Kit.com API key is required")
+    if not any(credential.values()):
+        raise HTTPException(status_code=400, detail="Kit.com API key or access token is required")
     
     try:
-        kit_client = KitClient(KitClientConfig(api_key=api_key))
-        account_info = await kit_client.get_account_info()
-        await kit_client.close()
+        async with request.app.state.kit_client_registry.lease(**credential) as kit_client:
+            account_info = await kit_client.get_account_info()
         
         return {
             "status": "connected",
             "account": account_info.get("account", {}).get("name", "Unknown")
         }
     except Exception as e:
-        logger.error(f"Error connecting to Kit.com API: {str(e)}")
+        logger.error("Error connecting to Kit.com API: %s", e)
         error_message = str(e)
         
         if "401 Unauthorized" in error_message:
@@ -58,8 +56,9 @@ async def claude_status(request: Request):
         raise HTTPException(status_code=400, detail="Claude API key is required")
     
     try:
-        intent_service = ClaudeIntentService(api_key=api_key)
-        test_result = await intent_service.determine_intent("Test message", {})
+        async with request.app.state.claude_client_registry.lease(api_key) as claude_client:
+            intent_service = ClaudeIntentService(api_key=api_key, client=claude_client)
+            test_result = await intent_service.determine_intent("Test message", {})
         
         if "authentication_error" in str(test_result):
             raise HTTPException(status_code=401, detail="Invalid Claude API key")
@@ -69,5 +68,61 @@ async def claude_status(request: Request):
             "model": intent_service.model
         }
     except Exception as e:
-        logger.error(f"Error connecting to Claude API: {str(e)}")
+        logger.error("Error connecting to Claude API: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to connect to Claude API: {str(e)}")
+
+@router.get("/intent-router")
+async def intent_router_status(request: Request):
+    """
+    Report how many messages the local intent router resolved without calling Claude.
+    """
+    return request.app.state.intent_router.stats()
+
+@router.get("/prompt-cache")
+async def prompt_cache_status(request: Request):
+    """
+    Report how often Claude served the cached prompt prefix.
+    """
+    return request.app.state.prompt_cache_stats.stats()
+
+@router.get("/semantic-cache")
+async def semantic_cache_status(request: Request):
+    """
+    Report how many intents and concept explanations were answered from earlier Claude responses.
+    """
+    cache = request.app.state.semantic_cache
+    return cache.stats() if cache is not None else {"enabled": False}
+
+@router.get("/conversations")
+async def conversations_status(request: Request):
+    """
+    Report live conversations and how many were expired or evicted.
+    """
+    return await request.app.state.conversation_manager.stats()
+
+@router.get("/kit-clients")
+async def kit_clients_status(request: Request):
+    """
+    Report pooled Kit.com clients with their request queue depth, throttling waits, retries and 429s.
+    """
+    return request.app.state.kit_client_registry.stats()
+
+@router.get("/kit-bulk")
+async def kit_bulk_status(request: Request):
+    """
+    Report the most recent results Kit.com posted for enqueued bulk requests, newest first.
+    """
+    return {"results": list(reversed(request.app.state.bulk_results))}
+
+@router.get("/kit-mirror")
+async def kit_mirror_status(request: Request):
+    """
+    Report what the local Kit.com account mirror holds and how many reads it answered.
+    """
+    credential = kit_credentials_from_headers(request.headers)
+    
+    if not any(credential.values()):
+        raise HTTPException(status_code=400, detail="Kit.com API key or access token is required")
+    
+    async with request.app.state.kit_client_registry.lease(**credential) as kit_client:
+        return kit_client.mirror.stats()
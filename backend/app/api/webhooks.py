@@ -0,0 +1,116 @@
+"""
+Webhook endpoints for the MCP server.
+This module provides endpoints for registering and receiving Kit.com webhooks.
+
+The account mirror the webhooks feed lives in the memory of one process, and
+Kit.com delivers each event to whichever worker accepts the request, so the
+mirror is only enabled when the server runs a single worker (WEB_CONCURRENCY).
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from typing import Optional
+from datetime import datetime
+import hmac
+import os
+import logging
+
+from .credentials import kit_credentials_from_headers
+
+router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
+
+logger = logging.getLogger(__name__)
+
+# Failures kept per recorded bulk result.
+BULK_FAILURE_SAMPLE = 20
+
+def _webhook_secret() -> str:
+    """Get the shared secret webhook URLs carry, failing if webhooks are not configured."""
+    secret = os.getenv("KIT_WEBHOOK_SECRET", "")
+    if not secret:
+        raise HTTPException(status_code=503, detail="Kit.com webhooks are not configured")
+    return secret
+
+def _mirror_enabled() -> bool:
+    """Whether the server runs a single worker, so that every webhook reaches the one account mirror."""
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1")) <= 1
+    except ValueError:
+        return False
+
+@router.post("/kit/register")
+async def register_kit_webhooks(request: Request):
+    """
+    Register the Kit.com webhooks that keep the local account mirror up to date.
+
+    Only available when the server runs a single worker. The account's client
+    then stays in the registry until shutdown so that its mirror keeps
+    receiving events.
+    """
+    credential = kit_credentials_from_headers(request.headers)
+    
+    if not any(credential.values()):
+        raise HTTPException(status_code=400, detail="Kit.com API key or access token is required")
+    
+    secret = _webhook_secret()
+    if not _mirror_enabled():
+        raise HTTPException(status_code=409, detail="The Kit.com account mirror requires a single server worker")
+    base_url = os.getenv("KIT_WEBHOOK_BASE_URL") or f"{str(request.base_url).rstrip('/')}{router.prefix}/kit"
+    
+    try:
+        async with request.app.state.kit_client_registry.lease(**credential) as kit_client:
+            created = await kit_client.register_mirror_webhooks(base_url, secret)
+        
+        return {
+            "status": "registered",
+            "account_id": kit_client.account_id,
+            "created": len(created)
+        }
+    except Exception as e:
+        logger.error("Error registering Kit.com webhooks: %s", e)
+        raise HTTPException(status_code=500, detail=f"Failed to register Kit.com webhooks: {str(e)}")
+
+@router.post("/kit/bulk")
+async def receive_kit_bulk_results(request: Request, token: str = ""):
+    """
+    Record the results Kit.com posts to KIT_BULK_CALLBACK_URL once an enqueued bulk request is processed.
+    """
+    if not hmac.compare_digest(token, _webhook_secret()):
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+    
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    
+    failures = payload.get("failures") or []
+    result = {
+        "received_at": datetime.now().isoformat(),
+        "succeeded": len(payload.get("subscribers") or []),
+        "failed": len(failures),
+        "failures": failures[:BULK_FAILURE_SAMPLE]
+    }
+    request.app.state.bulk_results.append(result)
+    logger.info("Kit.com bulk request finished: %d succeeded, %d failed", result["succeeded"], result["failed"])
+    return {"status": "recorded"}
+
+@router.post("/kit/{account_id}/{event}")
+async def receive_kit_webhook(account_id: str, event: str, request: Request, token: str = "",
+                              tag_id: Optional[int] = None, form_id: Optional[int] = None):
+    """
+    Apply a Kit.com webhook event to the account mirror.
+    """
+    if not hmac.compare_digest(token, _webhook_secret()):
+        raise HTTPException(status_code=401, detail="Invalid webhook token")
+    
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON")
+    
+    kit_client = request.app.state.kit_client_registry.find(account_id)
+    if kit_client is None or not _mirror_enabled():
+        # The mirror lives with the account's client; without one, or with several workers, there is nothing to update.
+        return {"status": "ignored"}
+    
+    applied = kit_client.mirror.apply_event(event, payload, tag_id=tag_id, form_id=form_id)
+    return {"status": "applied" if applied else "ignored"}
@@ -4,29 +4,74 @@ This module provides a service for managing conversation state and context.
 """
 
 from typing import Dict, Any, List, Optional
+import asyncio
 import logging
 import uuid
 import time
 from datetime import datetime
 
-logging.basicConfig(level=logging.INFO)
+from .storage import ConversationStore, InMemoryConversationStore, Message
+
 logger = logging.getLogger(__name__)
 
 class ConversationManager:
     """Manager for conversation state and context."""
 
-    def __init__(self, max_history: int = 10):
+    def __init__(self, max_history: int = 10, store: Optional[ConversationStore] = None,
+                 ttl: float = 3600.0, sweep_interval: float = 60.0):
         """
         Initialize the Conversation Manager.
 
         Args:
             max_history: Maximum number of messages to keep in history
+            store: Conversation storage backend, in-memory by default
+            ttl: Number of seconds after its last update a conversation expires
+            sweep_interval: Number of seconds between expiry sweeps
         """
-        self.conversations: Dict[str, Dict[str, Any]] = {}
+        self.store = store or InMemoryConversationStore()
         self.max_history = max_history
-        logger.info(f"ConversationManager initialized with max_history={max_history}")
+        self.ttl = ttl
+        self.sweep_interval = sweep_interval
+        self._sweeper: Optional[asyncio.Task] = None
+        logger.info("ConversationManager initialized with max_history=%s, store=%s", max_history,
+                    type(self.store).__name__)
+
+    async def open(self) -> None:
+        """Open the storage backend and start the background expiry sweep."""
+        await self.store.open()
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def _sweep(self) -> None:
+        """Periodically delete expired conversations."""
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.cleanup_old_conversations(self.ttl)
+            except Exception as e:
+                logger.error("Error cleaning up old conversations: %s", e)
+
+    async def close(self) -> None:
+        """Stop the expiry sweep, flush pending writes and close the storage backend."""
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+        await self.store.close()
+
+    async def stats(self) -> Dict[str, Any]:
+        """
+        Get conversation statistics.
+
+        Returns:
+            Number of live conversations and evictions reported by the storage backend
+        """
+        return {"store": type(self.store).__name__, "ttl": self.ttl, **await self.store.stats()}
 
-    def create_conversation(self) -> str:
+    async def create_conversation(self) -> str:
         """
         Create a new conversation.
 
@@ -34,16 +79,30 @@ class ConversationManager:
             Conversation ID
         """
         conversation_id = str(uuid.uuid4())
-        self.conversations[conversation_id] = {
-            "created_at": datetime.now().isoformat(),
-            "messages": [],
-            "context": {},
-            "last_updated": time.time()
-        }
-        logger.info(f"Created new conversation with ID: {conversation_id}")
+        await self.store.create(conversation_id, datetime.now().isoformat(), time.time())
+        logger.info("Created new conversation with ID: %s", conversation_id)
         return conversation_id
 
-    def get_context(self, conversation_id: str) -> Dict[str, Any]:
+    async def _get_or_recreate(self, conversation_id: str) -> Dict[str, Any]:
+        """
+        Get a conversation, recreating it under the same ID if it expired or was evicted.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            The stored conversation, or an empty one if it had to be recreated
+        """
+        conversation = await self.store.get(conversation_id)
+        if conversation is not None:
+            return conversation
+        now = time.time()
+        created_at = datetime.now().isoformat()
+        await self.store.create(conversation_id, created_at, now)
+        logger.info("Recreated expired or evicted conversation with ID: %s", conversation_id)
+        return {"created_at": created_at, "context": {}, "last_updated": now}
+
+    async def get_context(self, conversation_id: str) -> Dict[str, Any]:
         """
         Get the context for a conversation.
 
@@ -51,15 +110,15 @@ class ConversationManager:
             conversation_id: Conversation ID
 
         Returns:
-            Conversation context
+            Conversation context, empty for a new or recreated conversation
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"Conversation ID not found: {conversation_id}")
-            return {}
-        
-        return self.conversations[conversation_id].get("context", {})
+        conversation = await self._get_or_recreate(conversation_id)
+        context = dict(conversation["context"])
+        if context:
+            context["history"] = await self.store.get_messages(conversation_id, self.max_history * 2)
+        return context
 
-    def update_context(self, conversation_id: str, message: str, intent_result: Dict[str, Any]) -> None:
+    async def update_context(self, conversation_id: str, message: str, intent_result: Dict[str, Any]) -> None:
         """
         Update the context for a conversation.
 
@@ -68,34 +127,18 @@ class ConversationManager:
             message: User message
             intent_result: Intent recognition result
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"Conversation ID not found: {conversation_id}")
-            return
-        
-        context = self.conversations[conversation_id].get("context", {})
-        
-        messages = self.conversations[conversation_id].get("messages", [])
-        messages.append({
-            "role": "user",
-            "content": message,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        if len(messages) > self.max_history * 2:  # *2 because we store both user and assistant messages
-            messages = messages[-self.max_history * 2:]
-        
+        conversation = await self._get_or_recreate(conversation_id)
+        context = dict(conversation["context"])
         context["last_intent"] = intent_result.get("tool")
         context["last_parameters"] = intent_result.get("parameters", {})
         
-        context["history"] = messages
-        
-        self.conversations[conversation_id]["context"] = context
-        self.conversations[conversation_id]["messages"] = messages
-        self.conversations[conversation_id]["last_updated"] = time.time()
+        now = time.time()
+        await self.store.save_context(conversation_id, context, now)
+        await self._append_message(conversation_id, "user", message, now)
         
-        logger.info(f"Updated context for conversation: {conversation_id}")
+        logger.info("Updated context for conversation: %s", conversation_id)
 
-    def add_response(self, conversation_id: str, response: str) -> None:
+    async def add_response(self, conversation_id: str, response: str) -> None:
         """
         Add an assistant response to a conversation.
 
@@ -103,26 +146,17 @@ class ConversationManager:
             conversation_id: Conversation ID
             response: Assistant response
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"Conversation ID not found: {conversation_id}")
-            return
+        await self._get_or_recreate(conversation_id)
+        await self._append_message(conversation_id, "assistant", response, time.time())
         
-        messages = self.conversations[conversation_id].get("messages", [])
-        messages.append({
-            "role": "assistant",
-            "content": response,
-            "timestamp": datetime.now().isoformat()
-        })
-        
-        if len(messages) > self.max_history * 2:  # *2 because we store both user and assistant messages
-            messages = messages[-self.max_history * 2:]
-        
-        self.conversations[conversation_id]["messages"] = messages
-        self.conversations[conversation_id]["last_updated"] = time.time()
-        
-        logger.info(f"Added response to conversation: {conversation_id}")
+        logger.info("Added response to conversation: %s", conversation_id)
 
-    def get_conversation_history(self, conversation_id: str) -> List[Dict[str, Any]]:
+    async def _append_message(self, conversation_id: str, role: str, content: str, now: float) -> None:
+        """Append a message to a conversation's history."""
+        # *2 because we store both user and assistant messages
+        await self.store.append_message(conversation_id, Message(role, content, now), now, self.max_history * 2)
+
+    async def get_conversation_history(self, conversation_id: str) -> List[Dict[str, Any]]:
         """
         Get the message history for a conversation.
 
@@ -132,13 +166,13 @@ class ConversationManager:
         Returns:
             List of messages
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"Conversation ID not found: {conversation_id}")
+        if await self.store.get(conversation_id) is None:
+            logger.warning("Conversation ID not found: %s", conversation_id)
             return []
         
-        return self.conversations[conversation_id].get("messages", [])
+        return await self.store.get_messages(conversation_id, self.max_history * 2)
 
-    def delete_conversation(self, conversation_id: str) -> bool:
+    async def delete_conversation(self, conversation_id: str) -> bool:
         """
         Delete a conversation.
 
@@ -148,15 +182,14 @@ class ConversationManager:
         Returns:
             True if deleted, False otherwise
         """
-        if conversation_id not in self.conversations:
-            logger.warning(f"Conversation ID not found: {conversation_id}")
+        if not await self.store.delete(conversation_id):
+            logger.warning("Conversation ID not found: %s", conversation_id)
             return False
         
-        del self.conversations[conversation_id]
-        logger.info(f"Deleted conversation: {conversation_id}")
+        logger.info("Deleted conversation: %s", conversation_id)
         return True
 
-    def cleanup_old_conversations(self, max_age_seconds: int = 3600) -> int:
+    async def cleanup_old_conversations(self, max_age_seconds: int = 3600) -> int:
         """
         Clean up old conversations.
 
@@ -166,16 +199,8 @@ class ConversationManager:
         Returns:
             Number of conversations deleted
         """
-        current_time = time.time()
-        to_delete = []
-        
-        for conversation_id, conversation in self.conversations.items():
-            last_updated = conversation.get("last_updated", 0)
-            if current_time - last_updated > max_age_seconds:
-                to_delete.append(conversation_id)
-        
-        for conversation_id in to_delete:
-            del self.conversations[conversation_id]
+        deleted = await self.store.delete_older_than(time.time() - max_age_seconds)
         
-        logger.info(f"Cleaned up {len(to_delete)} old conversations")
-        return len(to_delete)
+        if deleted:
+            logger.info("Cleaned up %s old conversations", deleted)
+        return deleted
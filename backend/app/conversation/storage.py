@@ -0,0 +1,704 @@
+"""
+Conversation storage backends for the MCP server.
+This module provides in-memory, SQLite and Postgres stores for conversation state,
+so conversations survive restarts and can be shared between workers.
+"""
+
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from datetime import datetime
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import logging
+import sqlite3
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CONVERSATION_OVERHEAD = 512
+
+MESSAGE_OVERHEAD = 128
+
+class Message:
+    """A conversation message with a Unix timestamp."""
+
+    __slots__ = ("role", "content", "timestamp")
+
+    def __init__(self, role: str, content: str, timestamp: float):
+        self.role = role
+        self.content = content
+        self.timestamp = timestamp
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the message to a dict with an ISO-format timestamp."""
+        return {
+            "role": self.role,
+            "content": self.content,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat()
+        }
+
+class ConversationStore(ABC):
+    """Interface for conversation storage backends."""
+
+    async def open(self) -> None:
+        """Open connections and create the schema if needed."""
+
+    async def close(self) -> None:
+        """Flush pending writes and close connections."""
+
+    async def stats(self) -> Dict[str, int]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Number of live conversations and evictions
+        """
+        return {}
+
+    @abstractmethod
+    async def create(self, conversation_id: str, created_at: str, last_updated: float) -> None:
+        """
+        Create a conversation; does nothing if it already exists.
+
+        Args:
+            conversation_id: Conversation ID
+            created_at: Creation time in ISO format
+            last_updated: Last update time as a Unix timestamp
+        """
+
+    @abstractmethod
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a conversation without its messages.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Conversation with created_at, context and last_updated, or None if not found
+        """
+
+    @abstractmethod
+    async def save_context(self, conversation_id: str, context: Dict[str, Any], last_updated: float) -> None:
+        """
+        Save the context of a conversation.
+
+        Args:
+            conversation_id: Conversation ID
+            context: Conversation context, without history
+            last_updated: Last update time as a Unix timestamp
+        """
+
+    @abstractmethod
+    async def append_message(self, conversation_id: str, message: Message,
+                             last_updated: float, max_messages: int) -> None:
+        """
+        Append a message to a conversation, keeping at most `max_messages`.
+
+        Args:
+            conversation_id: Conversation ID
+            message: Message to append
+            last_updated: Last update time as a Unix timestamp
+            max_messages: Maximum number of messages to keep
+        """
+
+    @abstractmethod
+    async def get_messages(self, conversation_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Get the most recent messages of a conversation, oldest first.
+
+        Args:
+            conversation_id: Conversation ID
+            limit: Maximum number of messages to return
+
+        Returns:
+            List of messages with role, content and an ISO-format timestamp
+        """
+
+    @abstractmethod
+    async def delete(self, conversation_id: str) -> bool:
+        """
+        Delete a conversation and its messages.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            True if deleted, False if not found
+        """
+
+    @abstractmethod
+    async def delete_older_than(self, cutoff: float) -> int:
+        """
+        Delete conversations last updated before a cutoff.
+
+        Args:
+            cutoff: Unix timestamp
+
+        Returns:
+            Number of conversations deleted
+        """
+
+class _Conversation:
+    """An in-memory conversation and its approximate size in bytes."""
+
+    __slots__ = ("created_at", "context", "context_bytes", "messages", "message_bytes", "last_updated")
+
+    def __init__(self, created_at: str, last_updated: float):
+        self.created_at = created_at
+        self.context: Dict[str, Any] = {}
+        self.context_bytes = 2
+        self.messages: Optional["deque[Message]"] = None
+        self.message_bytes = 0
+        self.last_updated = last_updated
+
+    @property
+    def size(self) -> int:
+        return CONVERSATION_OVERHEAD + self.context_bytes + self.message_bytes
+
+def _message_size(message: Message) -> int:
+    """Estimate the memory used by a stored message."""
+    return MESSAGE_OVERHEAD + len(message.content)
+
+class InMemoryConversationStore(ConversationStore):
+    """
+    Conversation store keeping everything in a process-local dict.
+
+    Conversations are kept in last-updated order, so expiring and evicting
+    the least recently used conversations only touches the conversations
+    removed. Optional caps on the number of conversations and their
+    approximate total size evict the least recently used ones first.
+    """
+
+    def __init__(self, max_conversations: Optional[int] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the in-memory store.
+
+        Args:
+            max_conversations: Maximum number of conversations to keep
+            max_bytes: Maximum approximate total size of the conversations in bytes
+        """
+        self.conversations: "OrderedDict[str, _Conversation]" = OrderedDict()
+        self.max_conversations = max_conversations
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _touch(self, conversation_id: str, conversation: _Conversation, last_updated: float) -> None:
+        """Mark a conversation as updated, moving it to the end of the expiry order."""
+        conversation.last_updated = max(conversation.last_updated, last_updated)
+        self.conversations.move_to_end(conversation_id)
+
+    def _remove(self, conversation_id: str) -> Optional[_Conversation]:
+        """Remove a conversation and release its bytes."""
+        conversation = self.conversations.pop(conversation_id, None)
+        if conversation is not None:
+            self.bytes -= conversation.size
+        return conversation
+
+    def _enforce_limits(self) -> None:
+        """Evict least recently updated conversations until the caps are met, keeping the newest one."""
+        while len(self.conversations) > 1 and (
+            (self.max_conversations is not None and len(self.conversations) > self.max_conversations)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            conversation_id = next(iter(self.conversations))
+            self._remove(conversation_id)
+            self.evicted += 1
+            logger.info("Evicted conversation %s to stay within memory limits", conversation_id)
+
+    async def create(self, conversation_id: str, created_at: str, last_updated: float) -> None:
+        if conversation_id in self.conversations:
+            return
+        conversation = _Conversation(created_at, last_updated)
+        self.conversations[conversation_id] = conversation
+        self.bytes += conversation.size
+        self._enforce_limits()
+
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        return {
+            "created_at": conversation.created_at,
+            "context": conversation.context,
+            "last_updated": conversation.last_updated
+        }
+
+    async def save_context(self, conversation_id: str, context: Dict[str, Any], last_updated: float) -> None:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return
+
+        context_bytes = len(json.dumps(context, default=str))
+        self.bytes += context_bytes - conversation.context_bytes
+        conversation.context = context
+        conversation.context_bytes = context_bytes
+        self._touch(conversation_id, conversation, last_updated)
+        self._enforce_limits()
+
+    async def append_message(self, conversation_id: str, message: Message,
+                             last_updated: float, max_messages: int) -> None:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return
+
+        messages = conversation.messages
+        if messages is None or messages.maxlen != max_messages:
+            messages = conversation.messages = deque(messages or (), maxlen=max_messages)
+            conversation.message_bytes = sum(_message_size(old) for old in messages)
+
+        added = _message_size(message)
+        if len(messages) == max_messages:
+            added -= _message_size(messages[0])
+        messages.append(message)
+        conversation.message_bytes += added
+        self.bytes += added
+        self._touch(conversation_id, conversation, last_updated)
+        self._enforce_limits()
+
+    async def get_messages(self, conversation_id: str, limit: int) -> List[Dict[str, Any]]:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None or not conversation.messages:
+            return []
+        messages = conversation.messages
+        return [messages[index].to_dict() for index in range(max(0, len(messages) - limit), len(messages))]
+
+    async def delete(self, conversation_id: str) -> bool:
+        return self._remove(conversation_id) is not None
+
+    async def delete_older_than(self, cutoff: float) -> int:
+        deleted = 0
+        while self.conversations:
+            conversation_id, conversation = next(iter(self.conversations.items()))
+            if conversation.last_updated >= cutoff:
+                break
+            self._remove(conversation_id)
+            deleted += 1
+        self.expired += deleted
+        return deleted
+
+    async def stats(self) -> Dict[str, int]:
+        return {
+            "conversations": len(self.conversations),
+            "bytes": self.bytes,
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
+
+class SQLConversationStore(ConversationStore):
+    """
+    Base class for SQL conversation stores.
+
+    Messages are written in batches: appends are buffered and flushed together
+    every `flush_interval` seconds, once `batch_size` messages are pending, or
+    before any read of a conversation with pending messages.
+    """
+
+    placeholder = "?"
+    message_id_column = "INTEGER PRIMARY KEY AUTOINCREMENT"
+
+    def __init__(self, batch_size: int = 100, flush_interval: float = 0.05):
+        """
+        Initialize the SQL store.
+
+        Args:
+            batch_size: Number of pending messages that triggers a flush
+            flush_interval: Maximum number of seconds a message stays buffered
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending: List[Tuple[str, Message, float, int]] = []
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self.expired = 0
+
+    def _sql(self, statement: str) -> str:
+        """Convert a statement written with ? placeholders to this backend's parameter style."""
+        return statement.replace("?", self.placeholder)
+
+    def _schema(self) -> List[str]:
+        """Get the statements that create the schema."""
+        return [
+            """CREATE TABLE IF NOT EXISTS conversations (
+                conversation_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                context TEXT NOT NULL,
+                last_updated DOUBLE PRECISION NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS conversations_last_updated_idx ON conversations (last_updated)",
+            f"""CREATE TABLE IF NOT EXISTS conversation_messages (
+                id {self.message_id_column},
+                conversation_id TEXT NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp DOUBLE PRECISION NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS conversation_messages_conversation_idx "
+            "ON conversation_messages (conversation_id, id)",
+        ]
+
+    @abstractmethod
+    async def _execute(self, statements: Sequence[Tuple[str, Sequence[Any]]]) -> List[int]:
+        """
+        Run write statements in one transaction.
+
+        Args:
+            statements: Pairs of SQL (with ? placeholders) and parameters
+
+        Returns:
+            Number of rows affected by each statement
+        """
+
+    @abstractmethod
+    async def _executemany(self, statement: str, rows: Sequence[Sequence[Any]],
+                           follow_up: Sequence[Tuple[str, Sequence[Any]]]) -> None:
+        """
+        Run one statement for many parameter rows, then follow-up statements, in one transaction.
+
+        Args:
+            statement: SQL with ? placeholders
+            rows: Parameter rows
+            follow_up: Pairs of SQL and parameters to run afterwards
+        """
+
+    @abstractmethod
+    async def _fetchall(self, statement: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        """
+        Run a query.
+
+        Args:
+            statement: SQL with ? placeholders
+            params: Parameters
+
+        Returns:
+            Result rows
+        """
+
+    async def open(self) -> None:
+        await self._execute([(statement, ()) for statement in self._schema()])
+
+    async def close(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self.flush()
+
+    async def create(self, conversation_id: str, created_at: str, last_updated: float) -> None:
+        await self._execute([(
+            "INSERT INTO conversations (conversation_id, created_at, context, last_updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (conversation_id) DO NOTHING",
+            (conversation_id, created_at, "{}", last_updated)
+        )])
+
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._fetchall(
+            "SELECT created_at, context, last_updated FROM conversations WHERE conversation_id = ?",
+            (conversation_id,)
+        )
+        if not rows:
+            return None
+        created_at, context, last_updated = rows[0]
+        return {"created_at": created_at, "context": json.loads(context), "last_updated": last_updated}
+
+    async def save_context(self, conversation_id: str, context: Dict[str, Any], last_updated: float) -> None:
+        await self._execute([(
+            "UPDATE conversations SET context = ?, last_updated = ? WHERE conversation_id = ?",
+            (json.dumps(context, default=str), last_updated, conversation_id)
+        )])
+
+    async def append_message(self, conversation_id: str, message: Message,
+                             last_updated: float, max_messages: int) -> None:
+        self._pending.append((conversation_id, message, last_updated, max_messages))
+
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        """Flush pending messages after the flush interval."""
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error("Error flushing conversation messages: %s", e)
+
+    async def flush(self) -> None:
+        """Write every pending message in one transaction and trim old messages."""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+
+            rows = [
+                (conversation_id, message.role, message.content, message.timestamp)
+                for conversation_id, message, _, _ in pending
+            ]
+            latest: Dict[str, Tuple[float, int]] = {}
+            for conversation_id, _, last_updated, max_messages in pending:
+                latest[conversation_id] = (last_updated, max_messages)
+
+            follow_up = []
+            for conversation_id, (last_updated, max_messages) in latest.items():
+                follow_up.append((
+                    "UPDATE conversations SET last_updated = ? WHERE conversation_id = ? AND last_updated < ?",
+                    (last_updated, conversation_id, last_updated)
+                ))
+                follow_up.append((
+                    "DELETE FROM conversation_messages WHERE conversation_id = ? AND id < ("
+                    "SELECT MIN(id) FROM (SELECT id FROM conversation_messages WHERE conversation_id = ? "
+                    "ORDER BY id DESC LIMIT ?) AS recent)",
+                    (conversation_id, conversation_id, max_messages)
+                ))
+
+            try:
+                await self._executemany(
+                    "INSERT INTO conversation_messages (conversation_id, role, content, timestamp) VALUES (?, ?, ?, ?)",
+                    rows, follow_up
+                )
+            except Exception:
+                self._pending = pending + self._pending
+                raise
+
+    async def _flush_for(self, conversation_id: str) -> None:
+        """Flush pending messages if any belong to a conversation about to be read."""
+        if any(pending[0] == conversation_id for pending in self._pending):
+            await self.flush()
+
+    async def get_messages(self, conversation_id: str, limit: int) -> List[Dict[str, Any]]:
+        await self._flush_for(conversation_id)
+        rows = await self._fetchall(
+            "SELECT role, content, timestamp FROM conversation_messages WHERE conversation_id = ? "
+            "ORDER BY id DESC LIMIT ?",
+            (conversation_id, limit)
+        )
+        return [Message(role, content, timestamp).to_dict() for role, content, timestamp in reversed(rows)]
+
+    async def delete(self, conversation_id: str) -> bool:
+        await self._flush_for(conversation_id)
+        counts = await self._execute([
+            ("DELETE FROM conversation_messages WHERE conversation_id = ?", (conversation_id,)),
+            ("DELETE FROM conversations WHERE conversation_id = ?", (conversation_id,)),
+        ])
+        return counts[1] > 0
+
+    async def delete_older_than(self, cutoff: float) -> int:
+        await self.flush()
+        counts = await self._execute([
+            ("DELETE FROM conversation_messages WHERE conversation_id IN ("
+             "SELECT conversation_id FROM conversations WHERE last_updated < ?)", (cutoff,)),
+            ("DELETE FROM conversations WHERE last_updated < ?", (cutoff,)),
+        ])
+        self.expired += counts[1]
+        return counts[1]
+
+    async def stats(self) -> Dict[str, int]:
+        rows = await self._fetchall("SELECT COUNT(*) FROM conversations", ())
+        return {
+            "conversations": rows[0][0],
+            "pending_messages": len(self._pending),
+            "expired": self.expired
+        }
+
+class SQLiteConversationStore(SQLConversationStore):
+    """Conversation store backed by a SQLite database file, shareable by workers on one host."""
+
+    def __init__(self, path: str, pool_size: int = 4, **kwargs: Any):
+        """
+        Initialize the SQLite store.
+
+        Args:
+            path: Path of the database file
+            pool_size: Number of pooled connections
+            **kwargs: Batching options passed to SQLConversationStore
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.pool_size = pool_size
+        self._pool: "asyncio.Queue[sqlite3.Connection]" = asyncio.Queue()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with WAL journaling for concurrent workers."""
+        connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30.0)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    async def open(self) -> None:
+        for _ in range(self.pool_size):
+            connection = await asyncio.to_thread(self._connect)
+            self._connections.append(connection)
+            self._pool.put_nowait(connection)
+        await super().open()
+        logger.info("SQLiteConversationStore opened %s with %s connections", self.path, self.pool_size)
+
+    async def close(self) -> None:
+        await super().close()
+        for connection in self._connections:
+            await asyncio.to_thread(connection.close)
+        self._connections.clear()
+
+    async def _run(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run a blocking operation on a pooled connection in a worker thread."""
+        connection = await self._pool.get()
+        try:
+            return await asyncio.to_thread(operation, connection)
+        finally:
+            self._pool.put_nowait(connection)
+
+    async def _execute(self, statements: Sequence[Tuple[str, Sequence[Any]]]) -> List[int]:
+        def run(connection: sqlite3.Connection) -> List[int]:
+            with _sqlite_transaction(connection):
+                return [connection.execute(self._sql(sql), params).rowcount for sql, params in statements]
+        return await self._run(run)
+
+    async def _executemany(self, statement: str, rows: Sequence[Sequence[Any]],
+                           follow_up: Sequence[Tuple[str, Sequence[Any]]]) -> None:
+        def run(connection: sqlite3.Connection) -> None:
+            with _sqlite_transaction(connection):
+                connection.executemany(self._sql(statement), rows)
+                for sql, params in follow_up:
+                    connection.execute(self._sql(sql), params)
+        await self._run(run)
+
+    async def _fetchall(self, statement: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        return await self._run(lambda connection: connection.execute(self._sql(statement), params).fetchall())
+
+class _sqlite_transaction:
+    """Context manager running a block in an immediate SQLite transaction."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> None:
+        self.connection.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        self.connection.execute("ROLLBACK" if exc_type else "COMMIT")
+
+class PostgresConversationStore(SQLConversationStore):
+    """Conversation store backed by Postgres through psycopg, shareable by any number of workers."""
+
+    placeholder = "%s"
+    message_id_column = "BIGSERIAL PRIMARY KEY"
+
+    def __init__(self, conninfo: str, min_size: int = 1, max_size: int = 10, **kwargs: Any):
+        """
+        Initialize the Postgres store.
+
+        Args:
+            conninfo: Postgres connection string
+            min_size: Number of connections opened up front
+            max_size: Maximum number of pooled connections
+            **kwargs: Batching options passed to SQLConversationStore
+        """
+        super().__init__(**kwargs)
+        self.conninfo = conninfo
+        self.min_size = min_size
+        self.max_size = max_size
+        self._idle: "asyncio.Queue[Any]" = asyncio.Queue()
+        self._size = 0
+        self._size_lock = asyncio.Lock()
+
+    async def _new_connection(self) -> Any:
+        """Open a new pooled connection."""
+        import psycopg
+
+        self._size += 1
+        try:
+            return await psycopg.AsyncConnection.connect(self.conninfo, autocommit=False)
+        except Exception:
+            self._size -= 1
+            raise
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[Any]:
+        """Borrow a connection, opening one if the pool is below its maximum size."""
+        connection = None
+        if self._idle.empty():
+            async with self._size_lock:
+                if self._size < self.max_size:
+                    connection = await self._new_connection()
+        if connection is None:
+            connection = await self._idle.get()
+
+        try:
+            if connection.closed:
+                self._size -= 1
+                connection = await self._new_connection()
+            yield connection
+        except BaseException:
+            await connection.rollback()
+            raise
+        finally:
+            self._idle.put_nowait(connection)
+
+    async def open(self) -> None:
+        for _ in range(self.min_size):
+            self._idle.put_nowait(await self._new_connection())
+        await super().open()
+        logger.info("PostgresConversationStore opened with %s-%s connections", self.min_size, self.max_size)
+
+    async def close(self) -> None:
+        await super().close()
+        while not self._idle.empty():
+            await self._idle.get_nowait().close()
+        self._size = 0
+
+    async def _execute(self, statements: Sequence[Tuple[str, Sequence[Any]]]) -> List[int]:
+        async with self._connection() as connection:
+            counts = []
+            async with connection.cursor() as cursor:
+                for sql, params in statements:
+                    await cursor.execute(self._sql(sql), params)
+                    counts.append(cursor.rowcount)
+            await connection.commit()
+            return counts
+
+    async def _executemany(self, statement: str, rows: Sequence[Sequence[Any]],
+                           follow_up: Sequence[Tuple[str, Sequence[Any]]]) -> None:
+        async with self._connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.executemany(self._sql(statement), rows)
+                for sql, params in follow_up:
+                    await cursor.execute(self._sql(sql), params)
+            await connection.commit()
+
+    async def _fetchall(self, statement: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        async with self._connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(self._sql(statement), params)
+                rows = await cursor.fetchall()
+            await connection.commit()
+            return rows
+
+def create_conversation_store(url: Optional[str] = None, max_conversations: Optional[int] = None,
+                              max_bytes: Optional[int] = None) -> ConversationStore:
+    """
+    Create a conversation store from a URL.
+
+    Args:
+        url: "memory" (default), "sqlite:///path/to/file.db", or a postgresql:// connection string
+        max_conversations: Maximum number of conversations kept by the in-memory store
+        max_bytes: Maximum approximate size of the conversations kept by the in-memory store
+
+    Returns:
+        Conversation store
+    """
+    if not url or url == "memory":
+        return InMemoryConversationStore(max_conversations=max_conversations, max_bytes=max_bytes)
+
+    scheme = urlparse(url).scheme
+    if scheme == "sqlite":
+        path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else url[len("sqlite://"):]
+        return SQLiteConversationStore(path or ":memory:", pool_size=1 if not path else 4)
+    if scheme in ("postgres", "postgresql"):
+        return PostgresConversationStore(url)
+
+    raise ValueError(f"Unsupported conversation store URL: {url}")
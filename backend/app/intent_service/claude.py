@@ -3,54 +3,376 @@ Intent Recognition Service using Claude API.
 This module provides a service for determining user intent from messages using Claude API.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+import copy
 import logging
 import json
 import os
-from anthropic import Anthropic, HUMAN_PROMPT, AI_PROMPT
+import time
+import zlib
+from anthropic import AsyncAnthropic
+
+from .context import (FORMAT_CONTEXT_FIELDS, GENERATE_CONTEXT_FIELDS, INTENT_CONTEXT_FIELDS,
+                      compact_json, serialize_context)
+from .router import LocalIntentRouter
+from .semantic_cache import SemanticCache, normalize_text
+from .templates import render_response
+from ..telemetry.metrics import LLM_REQUEST_SECONDS, LLM_TOKENS
+from ..telemetry.tracing import span
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DeltaCallback = Callable[[str], Awaitable[None]]
+
+TOOLS_DESCRIPTION = """Available tools:
+1. get_tags() - Get all tags from Kit.com
+2. count_tags() - Count the number of tags
+3. create_tag(name: str) - Create a new tag
+4. tag_subscriber(email: str, tag_name: str) - Tag a subscriber with a specific tag
+5. get_subscribers(limit: int = 10, sort_by: str = "created_at", sort_order: str = "desc") - Get subscribers
+6. count_subscribers() - Count the number of subscribers
+7. get_subscriber_details(email: str) - Get details for a specific subscriber
+8. create_subscriber(email: str, first_name: Optional[str] = None) - Create a new subscriber
+9. get_forms() - Get all forms from Kit.com
+10. create_form(name: str, redirect_url: Optional[str] = None) - Create a new form
+11. explain_concept(concept: str) - Explain a Kit.com concept
+12. bulk_create_subscribers(emails: List[str]) - Create many subscribers at once
+13. bulk_tag_subscribers(emails: List[str], tag_name: str, create_missing: bool = False) - Tag many existing subscribers with a specific tag at once (create_missing only if the user asks to add new subscribers)
+14. bulk_add_subscribers_to_form(emails: List[str], form_name: str, create_missing: bool = False) - Add many existing subscribers to a form at once (create_missing only if the user asks to add new subscribers)
+15. filter_subscribers_by_tag(emails: List[str], tag_name: str) - Check which of the given subscribers have a specific tag
+16. segment_subscribers(tag_names: List[str], exclude_tag_names: Optional[List[str]] = None, limit: int = 10) - Find active subscribers with all of some tags and none of others"""
+
+INTENT_SYSTEM_PROMPT = f"""You are an assistant that helps determine user intent for a Kit.com MCP server. Your task is to analyze the user's message and determine which tool to use and what parameters to pass to it. Respond in JSON format only.
+
+{TOOLS_DESCRIPTION}
+
+Each user turn contains the user's message followed by the conversation context as JSON.
+Analyze the user's message and determine which tool to use and what parameters to pass to it.
+If you need more information from the user to determine the intent, indicate that clarification is needed.
+
+Respond in the following JSON format:
+```json
+{{
+    "tool": "tool_name",
+    "parameters": {{
+        "param1": "value1",
+        "param2": "value2"
+    }},
+    "needs_clarification": false,
+    "clarification_question": null
+}}
+```
+
+If clarification is needed:
+```json
+{{
+    "tool": null,
+    "parameters": {{}},
+    "needs_clarification": true,
+    "clarification_question": "What specific information do you need?"
+}}
+```
+
+If the message asks for several things, respond with a plan of steps instead. List the steps in the order the user asked for them; each step lists the ids of the steps that must finish before it starts, and steps that do not depend on each other run at the same time:
+```json
+{{
+    "steps": [
+        {{"id": "1", "tool": "create_tag", "parameters": {{"name": "VIP"}}, "depends_on": []}},
+        {{"id": "2", "tool": "bulk_tag_subscribers", "parameters": {{"emails": ["a@example.com", "b@example.com"], "tag_name": "VIP"}}, "depends_on": ["1"]}},
+        {{"id": "3", "tool": "count_tags", "parameters": {{}}, "depends_on": ["1"]}}
+    ],
+    "needs_clarification": false,
+    "clarification_question": null
+}}
+```"""
+
+def _json_intent_system_prompt(tools: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    Get the system prompt of JSON-mode intent calls.
+
+    The parameter schemas of the tools are appended to INTENT_SYSTEM_PROMPT, so
+    the cached prefix spells out every parameter and is long enough (over 1,024
+    tokens) for the API to cache it. The schemas are built once per process, so
+    the prompt is byte-identical on every call.
+
+    Args:
+        tools: Tool-use schemas of the available tools
+
+    Returns:
+        System prompt
+    """
+    if not tools:
+        return INTENT_SYSTEM_PROMPT
+    return f"{INTENT_SYSTEM_PROMPT}\n\nParameter schemas of the tools, as JSON:\n{compact_json(tools)}"
+
+TOOL_USE_SYSTEM_PROMPT = """You are an assistant that helps determine user intent for a Kit.com MCP server. Your task is to analyze the user's message and call the tool that fulfils it, with the parameters it needs.
+If the message asks for several things, call one tool per step in the order the user asked for them; calls that do not affect each other run at the same time.
+
+Each user turn contains the user's message followed by the conversation context as JSON.
+If you need more information from the user to determine the intent, do not call a tool; reply with a short clarification question instead."""
+
+# Usage attributes of Claude API responses, by the token type label they are recorded under.
+USAGE_TOKEN_TYPES = (
+    ("input", "input_tokens"),
+    ("output", "output_tokens"),
+    ("cache_read", "cache_read_input_tokens"),
+    ("cache_write", "cache_creation_input_tokens"),
+)
+
+def _record_usage(operation: str, usage: Any) -> None:
+    """
+    Record the token usage of a Claude API response as metrics.
+
+    Args:
+        operation: Intent service operation that made the request
+        usage: Usage object of the response
+    """
+    if usage is None:
+        return
+    for token_type, attribute in USAGE_TOKEN_TYPES:
+        tokens = getattr(usage, attribute, None) or 0
+        if tokens:
+            LLM_TOKENS.inc(tokens, operation=operation, type=token_type)
+
+# Words that decide which tool a message maps to. A cached intent is only reused for
+# a near-identical message if none of the words that differ between them is one of these.
+INTENT_KEY_TERMS = {
+    "tag", "tags", "tagged", "untag", "subscriber", "subscribers", "form", "forms", "broadcast", "broadcasts",
+    "sequence", "sequences", "segment", "segments", "webhook", "webhooks", "create", "add", "new", "remove",
+    "delete", "unsubscribe", "list", "show", "count", "many", "explain", "details", "not", "without", "and",
+    "or", "then"
+}
+
+def _parameter_values(value: Any) -> Iterator[str]:
+    """Yield every scalar in a parameter value as text."""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _parameter_values(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _parameter_values(item)
+    elif value is not None:
+        yield str(value)
+
+def _reusable_intent(message: str) -> Callable[[str, Dict[str, Any]], bool]:
+    """
+    Build the check deciding whether a cached intent may answer a message.
+
+    The intent must not depend on anything but the message: every parameter
+    value has to appear in the message as whole words, and the words that
+    differ between the message and the cached one must not change the tool.
+
+    Args:
+        message: User's message
+
+    Returns:
+        Predicate called with the normalized cached message and its intent
+    """
+    normalized = normalize_text(message)
+    padded = f" {normalized} "
+    words = set(normalized.split())
+
+    def accept(cached_text: str, intent: Dict[str, Any]) -> bool:
+        for word in words.symmetric_difference(cached_text.split()):
+            if word in INTENT_KEY_TERMS or any(character.isdigit() for character in word):
+                return False
+        parameters = [intent.get("parameters") or {}] + [step.get("parameters") or {}
+                                                          for step in intent.get("steps") or []]
+        for value in _parameter_values(parameters):
+            value = normalize_text(value)
+            if value and f" {value} " not in padded:
+                return False
+        return True
+
+    return accept
+
+class PromptCacheStats:
+    """Prompt cache usage of intent requests reported by the Claude API, shared across requests."""
+
+    def __init__(self):
+        """Initialize the counters."""
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self.cache_read_tokens = 0
+        self.cache_write_tokens = 0
+        self.uncached_input_tokens = 0
+
+    def record(self, usage: Any) -> None:
+        """
+        Record the usage of a Claude API response.
+
+        Args:
+            usage: Usage object of the response
+        """
+        if usage is None:
+            return
+
+        read = getattr(usage, "cache_read_input_tokens", None) or 0
+        self.requests += 1
+        if read:
+            self.hits += 1
+        else:
+            self.misses += 1
+        self.cache_read_tokens += read
+        self.cache_write_tokens += getattr(usage, "cache_creation_input_tokens", None) or 0
+        self.uncached_input_tokens += getattr(usage, "input_tokens", None) or 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get prompt cache statistics.
+
+        Returns:
+            Requests, cache hits and misses, hit rate and token totals
+        """
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / self.requests, 3) if self.requests else 0.0,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "uncached_input_tokens": self.uncached_input_tokens
+        }
+
 class ClaudeIntentService:
     """Service for determining user intent using Claude API."""
 
-    def __init__(self, api_key: str, model: str = "claude-3-opus-20240229"):
+    def __init__(self, api_key: str, model: str = "claude-3-opus-20240229",
+                 client: Optional[AsyncAnthropic] = None, router: Optional[LocalIntentRouter] = None,
+                 llm_formatting: bool = False, context_token_budget: int = 1000,
+                 cache_stats: Optional[PromptCacheStats] = None, tool_use: bool = False,
+                 response_cache: Optional[SemanticCache] = None):
         """
         Initialize the Claude Intent Service.
 
         Args:
             api_key: Claude API key
             model: Claude model to use
+            client: Shared asynchronous Claude API client; when omitted a new one is created
+            router: Local intent router tried before calling Claude
+            llm_formatting: Format every tool result with Claude instead of local templates
+            context_token_budget: Approximate number of tokens of conversation context sent per prompt
+            cache_stats: Shared prompt cache statistics to record API usage in
+            tool_use: Determine intent with native tool use when tool schemas are given
+            response_cache: Shared cache answering repeated intent and concept requests without Claude
         """
         self.api_key = api_key
-        self.client = Anthropic(api_key=api_key)
+        self.client = client or AsyncAnthropic(api_key=api_key)
+        self.router = router
+        self.llm_formatting = llm_formatting
+        self.context_token_budget = context_token_budget
+        self.cache_stats = cache_stats or PromptCacheStats()
+        self.tool_use = tool_use
+        self.response_cache = response_cache
         self.model = model
-        logger.info(f"ClaudeIntentService initialized with model {model}")
+        logger.debug("ClaudeIntentService initialized with model %s", model)
+
+    async def _complete(self, on_delta: Optional[DeltaCallback] = None, operation: str = "completion",
+                        **request: Any) -> str:
+        """
+        Run a Claude completion and return its text, streaming it if a callback is given.
 
-    async def determine_intent(self, message: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        Args:
+            on_delta: Coroutine function called with each text delta as it arrives
+            operation: Name the request's latency and token usage are recorded under
+            **request: Arguments for the Claude messages API
+
+        Returns:
+            Full text of the completion
+        """
+        started = time.perf_counter()
+        status = "error"
+        with span("llm.request", {"llm.operation": operation, "llm.model": request.get("model")}):
+            try:
+                if on_delta is None:
+                    response = await self.client.messages.create(**request)
+                    _record_usage(operation, getattr(response, "usage", None))
+                    status = "ok"
+                    return response.content[0].text
+
+                chunks = []
+                async with self.client.messages.stream(**request) as stream:
+                    async for text in stream.text_stream:
+                        chunks.append(text)
+                        await on_delta(text)
+                    final_message = await stream.get_final_message()
+                _record_usage(operation, getattr(final_message, "usage", None))
+                status = "ok"
+                return "".join(chunks)
+            finally:
+                LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=operation, status=status)
+
+    async def determine_intent(self, message: str, context: Dict[str, Any],
+                               tools: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Determine the intent of a user message.
 
         Args:
             message: User's message
             context: Conversation context
+            tools: Tool-use schemas of the available tools, used when tool use is enabled
+
+        Repeated and near-identical messages are answered from the response
+        cache when the cached intent depends on nothing but the message.
 
         Returns:
             Intent information including tool to use and parameters
         """
-        prompt = self._construct_intent_prompt(message, context)
+        if self.router is not None:
+            intent_data = self.router.route(message)
+            if intent_data is not None:
+                return intent_data
+
+        use_tools = self.tool_use and bool(tools)
+        namespace = self._intent_namespace(tools if use_tools else None)
+        if self.response_cache is not None:
+            cached = self.response_cache.get(namespace, message, accept=_reusable_intent(message))
+            if cached is not None:
+                return {**copy.deepcopy(cached), "source": "cache"}
+
+        prompt = self._construct_intent_prompt(message, context, json_response=not use_tools)
+        request: Dict[str, Any] = {}
+        if use_tools:
+            # The tool definitions precede the system prompt in the cached prefix.
+            request["tools"] = tools[:-1] + [{**tools[-1], "cache_control": {"type": "ephemeral"}}]
+            system_prompt = TOOL_USE_SYSTEM_PROMPT
+        else:
+            system_prompt = _json_intent_system_prompt(tools)
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0,
-                system="You are an assistant that helps determine user intent for a Kit.com MCP server. Your task is to analyze the user's message and determine which tool to use and what parameters to pass to it. Respond in JSON format only.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            started = time.perf_counter()
+            status = "error"
+            with span("llm.request", {"llm.operation": "determine_intent", "llm.model": self.model}):
+                try:
+                    response = await self.client.messages.create(
+                        model=self.model,
+                        max_tokens=1000,
+                        temperature=0,
+                        system=[
+                            {"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}
+                        ],
+                        messages=[
+                            {"role": "user", "content": prompt}
+                        ],
+                        **request
+                    )
+                    status = "ok"
+                finally:
+                    LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, operation="determine_intent",
+                                                status=status)
+
+            usage = getattr(response, "usage", None)
+            self.cache_stats.record(usage)
+            _record_usage("determine_intent", usage)
+            if self.router is not None:
+                tokens = usage.input_tokens + usage.output_tokens if usage else 0
+                self.router.record_llm_call(time.perf_counter() - started, tokens)
+
+            if use_tools:
+                intent_data = self._parse_tool_use(response)
+                self._cache_intent(namespace, message, context, intent_data)
+                return intent_data
 
             content = response.content[0].text
 
@@ -62,10 +384,17 @@ class ClaudeIntentService:
                 else:
                     intent_data = json.loads(content)
 
-                logger.info(f"Intent determined: {intent_data}")
+                steps = intent_data.get("steps")
+                if isinstance(steps, list) and steps and isinstance(steps[0], dict) and not intent_data.get("tool"):
+                    intent_data["tool"] = steps[0].get("tool")
+                    intent_data["parameters"] = steps[0].get("parameters") or {}
+
+                logger.info("Intent determined: %s", intent_data.get("tool"),
+                            extra={"tool": intent_data.get("tool"), "steps": len(steps) if isinstance(steps, list) else 1})
+                self._cache_intent(namespace, message, context, intent_data)
                 return intent_data
             except json.JSONDecodeError:
-                logger.error(f"Failed to parse Claude response as JSON: {content}")
+                logger.error("Failed to parse Claude response as JSON: %s", content)
                 return {
                     "tool": "explain_concept",
                     "parameters": {"concept": "error"},
@@ -74,7 +403,7 @@ class ClaudeIntentService:
                 }
 
         except Exception as e:
-            logger.error(f"Error calling Claude API: {str(e)}")
+            logger.error("Error calling Claude API: %s", e)
             if "invalid x-api-key" in str(e) or "authentication_error" in str(e):
                 return {
                     "tool": None,
@@ -89,81 +418,115 @@ class ClaudeIntentService:
                 "clarification_question": "I'm sorry, I encountered an error processing your request. Could you please try again?"
             }
 
-    def _construct_intent_prompt(self, message: str, context: Dict[str, Any]) -> str:
+    def _intent_namespace(self, tools: Optional[List[Dict[str, Any]]]) -> str:
+        """Get the response cache namespace of intents from this model and set of tools."""
+        if not tools:
+            return f"intent:{self.model}:json"
+        names = ",".join(sorted(tool["name"] for tool in tools))
+        return f"intent:{self.model}:tools:{zlib.crc32(names.encode('utf-8')):08x}"
+
+    def _cache_intent(self, namespace: str, message: str, context: Dict[str, Any], intent_data: Dict[str, Any]) -> None:
         """
-        Construct a prompt for Claude to determine intent.
+        Cache an intent determined by Claude if it can answer the same message in any conversation.
+
+        Only intents of a conversation's first message are cached, since later
+        ones may resolve references to earlier turns ("tag them too").
 
         Args:
+            namespace: Response cache namespace
             message: User's message
-            context: Conversation context
+            context: Conversation context the intent was determined with
+            intent_data: Intent information
+        """
+        if self.response_cache is None or context.get("history"):
+            return
+        if intent_data.get("needs_clarification") or not intent_data.get("tool"):
+            return
+        if not _reusable_intent(message)(normalize_text(message), intent_data):
+            return
+        self.response_cache.put(namespace, message, copy.deepcopy(intent_data))
+
+    def _parse_tool_use(self, response: Any) -> Dict[str, Any]:
+        """
+        Convert a tool-use response into intent information.
+
+        Args:
+            response: Claude API response
 
         Returns:
-            Prompt for Claude
+            Intent for the called tool, a plan of steps if Claude called several tools,
+            or a clarification request if Claude replied with text
         """
-        tools_description = """
-        Available tools:
-        1. get_tags() - Get all tags from Kit.com
-        2. count_tags() - Count the number of tags
-        3. create_tag(name: str) - Create a new tag
-        4. tag_subscriber(email: str, tag_name: str) - Tag a subscriber with a specific tag
-        5. get_subscribers(limit: int = 10, sort_by: str = "created_at", sort_order: str = "desc") - Get subscribers
-        6. count_subscribers() - Count the number of subscribers
-        7. get_subscriber_details(email: str) - Get details for a specific subscriber
-        8. create_subscriber(email: str, first_name: Optional[str] = None) - Create a new subscriber
-        9. get_forms() - Get all forms from Kit.com
-        10. create_form(name: str, redirect_url: Optional[str] = None) - Create a new form
-        11. explain_concept(concept: str) - Explain a Kit.com concept
+        calls = [block for block in response.content if getattr(block, "type", None) == "tool_use"]
+        if calls:
+            logger.info("Intent determined with tool use: %s", ", ".join(block.name for block in calls))
+            intent_data = {
+                "tool": calls[0].name,
+                "parameters": dict(calls[0].input or {}),
+                "needs_clarification": False,
+                "clarification_question": None
+            }
+            if len(calls) > 1:
+                # Dependencies are inferred from the call order (see build_plan).
+                intent_data["steps"] = [
+                    {"id": str(index + 1), "tool": block.name, "parameters": dict(block.input or {})}
+                    for index, block in enumerate(calls)
+                ]
+            return intent_data
+
+        text = "".join(getattr(block, "text", "") for block in response.content).strip()
+        return {
+            "tool": None,
+            "parameters": {},
+            "needs_clarification": True,
+            "clarification_question": text or "Could you tell me a bit more about what you would like to do?"
+        }
+
+    def _construct_intent_prompt(self, message: str, context: Dict[str, Any], json_response: bool = True) -> str:
         """
+        Construct the variable part of the intent prompt.
 
-        prompt = f"""
-        {message}
+        The instructions and tool catalogue live in the system prompt, which is
+        identical on every call and sent as a cached prefix; only the message
+        and context change between calls.
 
-        {json.dumps(context, indent=2)}
-
-        {tools_description}
-
-        Analyze the user's message and determine which tool to use and what parameters to pass to it.
-        If you need more information from the user to determine the intent, indicate that clarification is needed.
-
-        Respond in the following JSON format:
-        ```json
-        {{
-            "tool": "tool_name",
-            "parameters": {{
-                "param1": "value1",
-                "param2": "value2"
-            }},
-            "needs_clarification": false,
-            "clarification_question": null
-        }}
-        ```
-
-        If clarification is needed:
-        ```json
-        {{
-            "tool": null,
-            "parameters": {{}},
-            "needs_clarification": true,
-            "clarification_question": "What specific information do you need?"
-        }}
-        ```
-
-        JSON response only:
+        Args:
+            message: User's message
+            context: Conversation context
+            json_response: Ask for the JSON intent format rather than a tool call
+
+        Returns:
+            Prompt for Claude
         """
+        prompt = f"""{message}
+
+{serialize_context(context, INTENT_CONTEXT_FIELDS, self.context_token_budget)}"""
 
-        return prompt
+        return prompt + "\n\nJSON response only:" if json_response else prompt
 
-    async def explain_concept(self, concept: str, documentation: str) -> str:
+    async def explain_concept(self, concept: str, documentation: str,
+                              on_delta: Optional[DeltaCallback] = None) -> str:
         """
         Explain a Kit.com concept using the documentation.
 
         Args:
             concept: The concept to explain
             documentation: Kit.com documentation
+            on_delta: Coroutine function called with each text delta as it is generated
+
+        Explanations are cached per concept and documentation, so a repeated
+        question is answered (and streamed as one delta) without calling Claude.
 
         Returns:
             Explanation of the concept
         """
+        namespace = f"explain:{self.model}:{zlib.crc32(documentation.encode('utf-8')):08x}"
+        if self.response_cache is not None:
+            cached = self.response_cache.get(namespace, concept)
+            if cached is not None:
+                if on_delta is not None:
+                    await on_delta(cached)
+                return cached
 
         prompt = f"""
         {documentation}
@@ -175,7 +538,9 @@ class ClaudeIntentService:
         """
 
         try:
-            response = self.client.messages.create(
+            explanation = await self._complete(
+                on_delta,
+                operation="explain_concept",
                 model=self.model,
                 max_tokens=1000,
                 temperature=0.2,
@@ -184,33 +549,45 @@ class ClaudeIntentService:
                     {"role": "user", "content": prompt}
                 ]
             )
-
-            explanation = response.content[0].text
-            logger.info(f"Concept explanation generated for: {concept}")
+            logger.info("Concept explanation generated for: %s", concept)
+            if self.response_cache is not None and explanation:
+                self.response_cache.put(namespace, concept, explanation)
             return explanation
 
         except Exception as e:
-            logger.error(f"Error calling Claude API for concept explanation: {str(e)}")
+            logger.error("Error calling Claude API for concept explanation: %s", e)
             return f"I'm sorry, I encountered an error while trying to explain the concept of {concept}. Please try again later."
 
-    async def format_response(self, tool_name: str, result: Any, context: Dict[str, Any]) -> str:
+    async def format_response(self, tool_name: str, result: Any, context: Dict[str, Any],
+                              on_delta: Optional[DeltaCallback] = None) -> str:
         """
         Format the response to the user based on the tool result.
 
+        Results are rendered with the local template for the tool unless LLM
+        formatting is enabled or the tool has no template.
+
         Args:
             tool_name: Name of the tool that was executed
             result: Result of the tool execution
             context: Conversation context
+            on_delta: Coroutine function called with each text delta as it is generated
 
         Returns:
             Formatted response to the user
         """
+        if not self.llm_formatting:
+            rendered = render_response(tool_name, result)
+            if rendered is not None:
+                if on_delta is not None:
+                    await on_delta(rendered)
+                return rendered
+
         prompt = f"""
         {tool_name}
 
-        {json.dumps(result, indent=2)}
+        {compact_json(result)}
 
-        {json.dumps(context, indent=2)}
+        {serialize_context(context, FORMAT_CONTEXT_FIELDS, self.context_token_budget)}
 
         Format the result into a helpful, natural language response for the user.
         Use Markdown formatting for better readability.
@@ -219,7 +596,9 @@ class ClaudeIntentService:
         """
 
         try:
-            response = self.client.messages.create(
+            formatted_response = await self._complete(
+                on_delta,
+                operation="format_response",
                 model=self.model,
                 max_tokens=1000,
                 temperature=0.3,
@@ -228,25 +607,92 @@ class ClaudeIntentService:
                     {"role": "user", "content": prompt}
                 ]
             )
-
-            formatted_response = response.content[0].text
-            logger.info(f"Response formatted for tool: {tool_name}")
+            logger.info("Response formatted for tool: %s", tool_name)
             return formatted_response
 
         except Exception as e:
-            logger.error(f"Error calling Claude API for response formatting: {str(e)}")
+            logger.error("Error calling Claude API for response formatting: %s", e)
             if isinstance(result, list):
                 return f"Here are the results:\n\n```json\n{json.dumps(result, indent=2)}\n```"
             else:
                 return f"Here is the result:\n\n```json\n{json.dumps(result, indent=2)}\n```"
 
-    async def generate_response(self, message: str, context: Dict[str, Any]) -> str:
+    async def format_plan_response(self, outcomes: List[Dict[str, Any]], context: Dict[str, Any],
+                                   on_delta: Optional[DeltaCallback] = None) -> str:
+        """
+        Format the results of a multi-step plan as one response.
+
+        Each step is rendered with its local template unless LLM formatting is
+        enabled or a step has no template, in which case all results are
+        formatted with a single Claude call.
+
+        Args:
+            outcomes: Outcome of each step, with tool, parameters and either result or error
+            context: Conversation context
+            on_delta: Coroutine function called with each text delta as it is generated
+
+        Returns:
+            Formatted response to the user
+        """
+        if not self.llm_formatting:
+            sections = []
+            for outcome in outcomes:
+                action = str(outcome["tool"]).replace("_", " ")
+                if outcome.get("skipped"):
+                    sections.append(f"I didn't {action} because an earlier step failed.")
+                elif "error" in outcome:
+                    sections.append(f"I couldn't {action}. Error: {outcome['error']}")
+                else:
+                    rendered = render_response(outcome["tool"], outcome["result"])
+                    if rendered is None:
+                        break
+                    sections.append(rendered)
+            else:
+                response = "\n\n".join(sections)
+                if on_delta is not None:
+                    await on_delta(response)
+                return response
+
+        prompt = f"""
+        {compact_json(outcomes)}
+
+        {serialize_context(context, FORMAT_CONTEXT_FIELDS, self.context_token_budget)}
+
+        These are the results of several tools run for one user request, in the order the user asked for them.
+        Format them into a single helpful, natural language response for the user.
+        Mention any step that failed or was skipped.
+        Use Markdown formatting for better readability.
+        Be concise but informative.
+        """
+
+        try:
+            formatted_response = await self._complete(
+                on_delta,
+                operation="format_plan_response",
+                model=self.model,
+                max_tokens=1500,
+                temperature=0.3,
+                system="You are an assistant that formats technical results into helpful, natural language responses for users.",
+                messages=[
+                    {"role": "user", "content": prompt}
+                ]
+            )
+            logger.info("Response formatted for plan of %s steps", len(outcomes))
+            return formatted_response
+
+        except Exception as e:
+            logger.error("Error calling Claude API for plan response formatting: %s", e)
+            return f"Here are the results:\n\n```json\n{json.dumps(outcomes, indent=2, default=str)}\n```"
+
+    async def generate_response(self, message: str, context: Dict[str, Any],
+                                on_delta: Optional[DeltaCallback] = None) -> str:
         """
         Generate a response to a user message when no specific tool matches.
 
         Args:
             message: User's message
             context: Conversation context
+            on_delta: Coroutine function called with each text delta as it is generated
 
         Returns:
             Generated response
@@ -254,14 +700,16 @@ class ClaudeIntentService:
         prompt = f"""
         {message}
 
-        {json.dumps(context, indent=2)}
+        {serialize_context(context, GENERATE_CONTEXT_FIELDS, self.context_token_budget)}
 
         Generate a helpful response to the user's message. If you don't know the answer, suggest what tools or information might help.
         Use Markdown formatting for better readability.
         """
 
         try:
-            response = self.client.messages.create(
+            generated_response = await self._complete(
+                on_delta,
+                operation="generate_response",
                 model=self.model,
                 max_tokens=1000,
                 temperature=0.3,
@@ -270,11 +718,9 @@ class ClaudeIntentService:
                     {"role": "user", "content": prompt}
                 ]
             )
-
-            generated_response = response.content[0].text
             logger.info("Generated response for user message")
             return generated_response
 
         except Exception as e:
-            logger.error(f"Error calling Claude API for response generation: {str(e)}")
+            logger.error("Error calling Claude API for response generation: %s", e)
             return "I'm sorry, I encountered an error while processing your request. Please try again later."
@@ -0,0 +1,91 @@
+"""
+Prompt context serialization for the MCP server.
+This module turns conversation context into compact JSON that fits a token budget.
+"""
+
+from typing import Any, Dict, List, Sequence
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+MAX_MESSAGE_CHARS = 1000
+
+INTENT_CONTEXT_FIELDS = ("last_intent", "last_parameters", "history")
+
+FORMAT_CONTEXT_FIELDS = ("last_intent", "last_parameters")
+
+GENERATE_CONTEXT_FIELDS = ("last_intent", "history")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without calling the API.
+
+    Args:
+        text: Text to estimate
+
+    Returns:
+        Approximate number of tokens, assuming about four characters per token
+    """
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def compact_json(value: Any) -> str:
+    """
+    Serialize a value as JSON without insignificant whitespace.
+
+    Args:
+        value: Value to serialize
+
+    Returns:
+        Compact JSON
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def _compact_message(message: Dict[str, Any]) -> Dict[str, str]:
+    """Keep only the role and a bounded amount of content of a history message."""
+    content = str(message.get("content") or "")
+    if len(content) > MAX_MESSAGE_CHARS:
+        content = content[:MAX_MESSAGE_CHARS] + "…"
+    return {"role": message.get("role", "user"), "content": content}
+
+def serialize_context(context: Dict[str, Any], fields: Sequence[str], max_tokens: int = 1000) -> str:
+    """
+    Serialize the fields of a conversation context a prompt needs as compact JSON.
+
+    History is trimmed from the oldest message until the serialized context
+    fits the token budget; the other fields are always kept.
+
+    Args:
+        context: Conversation context
+        fields: Context fields to include
+        max_tokens: Approximate token budget for the serialized context
+
+    Returns:
+        Compact JSON, or "{}" if none of the fields are set
+    """
+    selected = {field: context[field] for field in fields if context.get(field) not in (None, "", [], {})}
+    history = selected.pop("history", None)
+    serialized = compact_json(selected)
+
+    if not history:
+        return serialized
+
+    budget = max_tokens - estimate_tokens(serialized) - estimate_tokens(',"history":[]')
+    kept: List[str] = []
+    for message in reversed(history):
+        encoded = compact_json(_compact_message(message))
+        cost = estimate_tokens(encoded) + 1
+        if cost > budget:
+            break
+        kept.append(encoded)
+        budget -= cost
+
+    if len(kept) < len(history):
+        logger.debug("Trimmed %s history messages to fit %s context tokens", len(history) - len(kept), max_tokens)
+    if not kept:
+        return serialized
+
+    prefix = serialized[:-1] + ("," if selected else "")
+    return f'{prefix}"history":[{",".join(reversed(kept))}]}}'
@@ -0,0 +1,148 @@
+"""
+Claude API client registry for the MCP server.
+This module provides a registry of shared non-blocking Claude API clients keyed by API key.
+"""
+
+from typing import AsyncIterator, Dict, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import logging
+import time
+from anthropic import AsyncAnthropic
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+class ClaudeClientPoolConfig(BaseModel):
+    """Configuration for the Claude API client registry."""
+    max_clients: int = 64
+    idle_timeout: float = 600.0
+    max_retries: int = 2
+    timeout: float = 60.0
+
+class _PooledClient:
+    """A registry entry holding a shared client and its usage bookkeeping."""
+
+    __slots__ = ("client", "leases", "last_used")
+
+    def __init__(self, client: AsyncAnthropic):
+        self.client = client
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+class ClaudeClientRegistry:
+    """Registry of shared asynchronous Claude API clients keyed by API key."""
+
+    def __init__(self, config: Optional[ClaudeClientPoolConfig] = None):
+        """
+        Initialize the Claude API client registry.
+
+        Args:
+            config: Configuration for the registry
+        """
+        self.config = config or ClaudeClientPoolConfig()
+        self._clients: "OrderedDict[str, _PooledClient]" = OrderedDict()
+        self.evictions = 0
+        logger.info("ClaudeClientRegistry initialized with max_clients=%s", self.config.max_clients)
+
+    @staticmethod
+    def _credential_key(api_key: str) -> str:
+        """
+        Build the registry key for an API key without keeping the raw secret as a key.
+
+        Args:
+            api_key: Claude API key
+
+        Returns:
+            Registry key
+        """
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    def get(self, api_key: str) -> AsyncAnthropic:
+        """
+        Get the shared client for an API key, creating it if needed.
+
+        Args:
+            api_key: Claude API key
+
+        Returns:
+            Shared asynchronous Claude API client
+        """
+        key = self._credential_key(api_key)
+        entry = self._clients.get(key)
+
+        if entry is None:
+            client = AsyncAnthropic(
+                api_key=api_key,
+                max_retries=self.config.max_retries,
+                timeout=self.config.timeout
+            )
+            entry = _PooledClient(client)
+            self._clients[key] = entry
+            self._evict(keep=key)
+        else:
+            self._clients.move_to_end(key)
+
+        entry.last_used = time.monotonic()
+        return entry.client
+
+    @asynccontextmanager
+    async def lease(self, api_key: str) -> AsyncIterator[AsyncAnthropic]:
+        """
+        Lease the shared client for an API key for the duration of a block.
+
+        Args:
+            api_key: Claude API key
+
+        Yields:
+            Shared asynchronous Claude API client
+        """
+        client = self.get(api_key)
+        entry = self._clients[self._credential_key(api_key)]
+        entry.leases += 1
+        try:
+            yield client
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+
+    def _evict(self, keep: str) -> None:
+        """
+        Evict idle clients that are expired or beyond capacity, least recently used first.
+
+        Args:
+            keep: Registry key that must not be evicted
+        """
+        cutoff = time.monotonic() - self.config.idle_timeout
+
+        for key in list(self._clients.keys()):
+            entry = self._clients[key]
+            over_capacity = len(self._clients) > self.config.max_clients
+            if not over_capacity and entry.last_used >= cutoff:
+                break
+            if entry.leases == 0 and key != keep:
+                del self._clients[key]
+                self.evictions += 1
+                asyncio.ensure_future(entry.client.close())
+
+    async def close(self) -> None:
+        """Close every client."""
+        entries = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(*(entry.client.close() for entry in entries), return_exceptions=True)
+        logger.info("ClaudeClientRegistry closed %s clients", len(entries))
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get registry statistics.
+
+        Returns:
+            Number of live clients, leased clients and evictions
+        """
+        return {
+            "clients": len(self._clients),
+            "leased": sum(1 for entry in self._clients.values() if entry.leases),
+            "evictions": self.evictions
+        }
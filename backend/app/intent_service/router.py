@@ -0,0 +1,369 @@
+"""
+Local intent router for the MCP server.
+This module provides a pattern-based classifier that resolves unambiguous commands
+without a Claude round trip, deferring everything else to the Claude Intent Service.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"[\w.+'-]+@[\w-]+(?:\.[\w-]+)+")
+QUOTED_PATTERN = re.compile(r"[\"“'‘]([^\"”'’]+)[\"”'’]")
+NUMBER_PATTERN = re.compile(r"\b\d+\b")
+# A number only limits a subscriber list in a count context: "first 20", "last 5 subscribers".
+LIMIT_PATTERN = re.compile(
+    r"\b(?:first|last|top|latest|newest|recent)\s+(\d{1,4})\b"
+    r"|\b(\d{1,4})\s+(?:(?:most\s+)?(?:recent|latest|newest|new)\s+)?subscribers?\b",
+    re.IGNORECASE
+)
+MAX_LIST_LIMIT = 100
+TOOL_VERBS = (r"(create|make|add|tag|untag|list|show|get|display|count|find|look ?up|subscribe|sign up|import|"
+              r"explain|define|remove|delete|unsubscribe|how many)")
+COMPOUND_PATTERN = re.compile(
+    rf"\b(and then|then|also|after that|afterwards|as well as)\b|;|\band\s+(?:please\s+)?{TOOL_VERBS}\b",
+    re.IGNORECASE
+)
+RESOURCES = r"(?:tags?|subscribers?|forms?|broadcasts?|sequences?|segments?)"
+# Several resources in one request ("my tags and forms", "tags, forms") need one call each.
+RESOURCE_LIST_PATTERN = re.compile(
+    rf"\b{RESOURCES}\s*(?:,|&|\band\b|\bor\b)\s*(?:(?:my|all|our|the|your)\s+)?{RESOURCES}\b",
+    re.IGNORECASE
+)
+# Unquoted names containing these list several names ("VIP, Customers"), each its own call.
+NAME_LIST_PATTERN = re.compile(r"[,;]|\b(and|or)\b", re.IGNORECASE)
+# Negated and questioning messages ("don't create...", "how do I add...?") are not commands.
+NEGATION_PATTERN = re.compile(r"\b(don['’]?t|do not|never|not|no longer|stop)\b", re.IGNORECASE)
+QUESTION_PATTERN = re.compile(
+    r"\?\s*$|^\s*(how|why|when|where|should|can|could|would|will|do|does|did|is|are|may)\b",
+    re.IGNORECASE
+)
+TRAILING_FILLER = re.compile(r"(?:[\s,]+(?:please|pls|thanks|thank you|thx|now|for me))+$", re.IGNORECASE)
+TAG_WORD = r"tag(?:s|ged)?"
+PRONOUNS = {"it", "that", "this", "them", "same", "the same", "same tag", "the same tag", "that tag", "this tag"}
+CONCEPTS = r"(tags?|subscribers?|forms?|broadcasts?|sequences?|segments?|double opt-in|landing pages?)"
+
+Extractor = Callable[[str, List[str]], Optional[Dict[str, Any]]]
+
+def _quoted(message: str) -> Optional[str]:
+    """Return the first quoted phrase in a message."""
+    match = QUOTED_PATTERN.search(message)
+    return match.group(1).strip() if match else None
+
+def _clean_name(name: Optional[str]) -> Optional[str]:
+    """Strip trailing punctuation and filler words from an extracted name."""
+    if not name:
+        return None
+    name = name.strip().strip("?.!,:")
+    name = TRAILING_FILLER.sub("", name).strip().strip("?.!,:")
+    name = re.sub(r"^(the|a|an)\s+", "", name, flags=re.IGNORECASE)
+    if name.lower() in PRONOUNS:
+        # Names like "it" refer back to earlier turns, which only Claude can resolve.
+        return None
+    return name or None
+
+def _single_name(name: Optional[str]) -> Optional[str]:
+    """Reject an unquoted name that lists several names, which only Claude can split into calls."""
+    return name if name and not NAME_LIST_PATTERN.search(name) else None
+
+def _named(message: str) -> Optional[str]:
+    """Extract a name introduced by "called" or "named", or a quoted name."""
+    quoted = _quoted(message)
+    if quoted:
+        return quoted
+    match = re.search(r"\b(?:called|named|titled)\s+(.+)$", message, re.IGNORECASE)
+    return _single_name(_clean_name(match.group(1))) if match else None
+
+def _tag_name(message: str) -> Optional[str]:
+    """Extract the tag name from a tagging command."""
+    quoted = _quoted(message)
+    if quoted:
+        return quoted
+
+    without_emails = EMAIL_PATTERN.sub(" ", message)
+    patterns = (
+        r"\b(?:with|as)\s+(?:the\s+)?(?:tag\s+)?(.+?)(?:\s+tag)?\s*[?.!]*$",
+        r"\badd\s+(?:the\s+)?(?:tag\s+)?(.+?)(?:\s+tag)?\s+to\b",
+        r"\btag(?:ged)?\s+(?:named|called)\s+(.+?)\s*[?.!]*$",
+    )
+    for pattern in patterns:
+        match = re.search(pattern, without_emails, re.IGNORECASE)
+        if match:
+            name = _single_name(_clean_name(match.group(1)))
+            if name:
+                return name
+    return None
+
+def _form_name(message: str) -> Optional[str]:
+    """Extract the form name from a form command."""
+    quoted = _quoted(message)
+    if quoted:
+        return quoted
+
+    without_emails = EMAIL_PATTERN.sub(" ", message)
+    patterns = (
+        r"\bto\s+(?:the\s+)?(?:form\s+)?(.+?)\s+form\b",
+        r"\bto\s+(?:the\s+)?form\s+(.+?)\s*[?.!]*$",
+    )
+    for pattern in patterns:
+        match = re.search(pattern, without_emails, re.IGNORECASE)
+        if match:
+            return _clean_name(match.group(1))
+    return None
+
+def _no_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Accept messages without email addresses; the tool takes no parameters."""
+    return {} if not emails else None
+
+def _create_tag_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the name of a tag to create."""
+    if emails:
+        return None
+    name = _named(message)
+    if not name:
+        match = re.search(r"\btag\s+(.+?)\s*[?.!]*$", message, re.IGNORECASE)
+        name = _single_name(_clean_name(match.group(1))) if match else None
+    return {"name": name} if name else None
+
+def _tag_subscriber_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the email address and tag name for tagging one subscriber."""
+    tag_name = _tag_name(message)
+    if len(emails) != 1 or not tag_name:
+        return None
+    return {"email": emails[0], "tag_name": tag_name}
+
+def _bulk_tag_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the email addresses and tag name for tagging several subscribers."""
+    tag_name = _tag_name(message)
+    if len(emails) < 2 or not tag_name:
+        return None
+    return {"emails": emails, "tag_name": tag_name}
+
+def _get_subscribers_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract an optional number of subscribers to list, deferring other numbers (e.g. years) to Claude."""
+    if emails:
+        return None
+    match = LIMIT_PATTERN.search(message)
+    if match:
+        return {"limit": min(int(match.group(1) or match.group(2)), MAX_LIST_LIMIT)}
+    return {} if not NUMBER_PATTERN.search(message) else None
+
+def _subscriber_details_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the email address of the subscriber to look up."""
+    return {"email": emails[0]} if len(emails) == 1 else None
+
+def _create_subscriber_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the email address and optional first name of a new subscriber."""
+    if len(emails) != 1:
+        return None
+    params: Dict[str, Any] = {"email": emails[0]}
+    match = re.search(r"\b(?:named|called|first name(?: is)?)\s+([A-Za-z][\w'-]*)", message, re.IGNORECASE)
+    if match:
+        params["first_name"] = match.group(1)
+    return params
+
+def _bulk_create_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the email addresses of several new subscribers."""
+    return {"emails": emails} if len(emails) >= 2 else None
+
+def _create_form_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the name of a form to create."""
+    if emails:
+        return None
+    name = _named(message)
+    return {"name": name} if name else None
+
+def _bulk_form_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the email addresses and form name for adding subscribers to a form."""
+    form_name = _form_name(message)
+    if not emails or not form_name:
+        return None
+    return {"emails": emails, "form_name": form_name}
+
+def _explain_params(message: str, emails: List[str]) -> Optional[Dict[str, Any]]:
+    """Extract the Kit.com concept to explain."""
+    match = re.search(CONCEPTS, message, re.IGNORECASE)
+    return {"concept": match.group(1).lower()} if match and not emails else None
+
+class _Rule:
+    """A tool matching rule: a compiled pattern, its base score and a parameter extractor."""
+
+    __slots__ = ("tool", "pattern", "score", "extract")
+
+    def __init__(self, tool: str, pattern: str, score: float, extract: Extractor):
+        self.tool = tool
+        self.pattern: Pattern[str] = re.compile(pattern, re.IGNORECASE)
+        self.score = score
+        self.extract = extract
+
+RULES = (
+    _Rule("count_tags", r"\b(how many|count|number of|total)\b.*\btags?\b", 0.95, _no_params),
+    _Rule("count_subscribers", r"\b(how many|count|number of|total)\b.*\bsubscribers?\b", 0.95, _no_params),
+    _Rule("get_tags", r"\b(list|show|get|display|see|view|fetch|what are)\b.*\b(my|all|our|the)\s+tags\b", 0.9, _no_params),
+    _Rule("get_forms", r"\b(list|show|get|display|see|view|fetch|what are)\b.*\b(my|all|our|the)\s+forms\b", 0.9, _no_params),
+    _Rule("get_subscribers", r"\b(list|show|get|display|see|view|fetch)\b.*\b(subscribers)\b", 0.85, _get_subscribers_params),
+    _Rule("create_tag", r"\b(create|make|add|new)\b.*\btag\b", 0.85, _create_tag_params),
+    _Rule("create_form", r"\b(create|make|new)\b.*\bform\b", 0.85, _create_form_params),
+    _Rule("tag_subscriber", r"\btag\b", 0.9, _tag_subscriber_params),
+    _Rule("bulk_tag_subscribers", r"\btag\b", 0.9, _bulk_tag_params),
+    _Rule("get_subscriber_details", r"\b(details?|info|information|look ?up|find|who is|show|get)\b", 0.85, _subscriber_details_params),
+    _Rule("create_subscriber", r"\b(add|create|new|subscribe|sign up)\b", 0.85, _create_subscriber_params),
+    _Rule("bulk_create_subscribers", r"\b(add|create|import|subscribe|sign up)\b", 0.85, _bulk_create_params),
+    _Rule("bulk_add_subscribers_to_form", r"\bform\b", 0.9, _bulk_form_params),
+    _Rule("explain_concept", rf"^\s*(what (is|are)|explain|define|tell me about)\s+(a |an |the )?{CONCEPTS}\s*\??\s*$", 0.95, _explain_params),
+)
+
+# Words that make a rule's intent ambiguous even if its pattern matches.
+CONFLICTS = {
+    "create_tag": re.compile(r"\b(subscribers?|forms?)\b", re.IGNORECASE),
+    "create_form": re.compile(rf"\b(subscribers?|{TAG_WORD})\b", re.IGNORECASE),
+    "get_subscriber_details": re.compile(rf"\b({TAG_WORD}|forms?|create|add|delete|remove|unsubscribe)\b",
+                                         re.IGNORECASE),
+    "create_subscriber": re.compile(rf"\b({TAG_WORD}|forms?|delete|remove|unsubscribe)\b", re.IGNORECASE),
+    "bulk_create_subscribers": re.compile(rf"\b({TAG_WORD}|forms?|delete|remove|unsubscribe)\b", re.IGNORECASE),
+    "get_subscribers": re.compile(rf"\b({TAG_WORD}|forms?|how many|count)\b", re.IGNORECASE),
+    "count_tags": re.compile(r"\bsubscribers?\b", re.IGNORECASE),
+    "count_subscribers": re.compile(rf"\b{TAG_WORD}\b", re.IGNORECASE),
+    "tag_subscriber": re.compile(r"\b(remove|untag|delete)\b", re.IGNORECASE),
+    "bulk_tag_subscribers": re.compile(r"\b(remove|untag|delete)\b", re.IGNORECASE),
+}
+
+# Tools that change the account; negated or questioning messages never run them locally.
+WRITE_TOOLS = {"create_tag", "create_form", "tag_subscriber", "bulk_tag_subscribers", "create_subscriber",
+               "bulk_create_subscribers", "bulk_add_subscribers_to_form"}
+
+# The action of each tool. Candidates with different actions mean the message asks for
+# several things ("create tag VIP and count my tags"), which only Claude can plan.
+TOOL_ACTIONS = {
+    "count_tags": "count", "count_subscribers": "count",
+    "get_tags": "read", "get_forms": "read", "get_subscribers": "read", "get_subscriber_details": "read",
+    "create_tag": "create", "create_form": "create", "create_subscriber": "create",
+    "bulk_create_subscribers": "create",
+    "tag_subscriber": "tag", "bulk_tag_subscribers": "tag",
+    "bulk_add_subscribers_to_form": "add_to_form",
+    "explain_concept": "explain",
+}
+
+class LocalIntentRouter:
+    """Pattern-based intent classifier placed in front of the Claude Intent Service."""
+
+    def __init__(self, threshold: float = 0.8, max_words: int = 40):
+        """
+        Initialize the local intent router.
+
+        Args:
+            threshold: Minimum confidence for a locally resolved intent
+            max_words: Messages longer than this (excluding email addresses) are deferred to Claude
+        """
+        self.threshold = threshold
+        self.max_words = max_words
+        self.hits = 0
+        self.misses = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.llm_tokens = 0
+        logger.info("LocalIntentRouter initialized with threshold=%s", threshold)
+
+    def _score(self, message: str) -> List[Tuple[float, str, Dict[str, Any]]]:
+        """
+        Score every rule against a message.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Matching (confidence, tool, parameters) candidates, best first
+        """
+        emails = list(dict.fromkeys(email.lower() for email in EMAIL_PATTERN.findall(message)))
+        without_emails = EMAIL_PATTERN.sub(" ", message)
+        words = len(without_emails.split())
+        penalty = 0.0
+        not_a_command = bool(NEGATION_PATTERN.search(without_emails) or QUESTION_PATTERN.search(message))
+
+        if words > self.max_words:
+            return []
+        if COMPOUND_PATTERN.search(without_emails) or RESOURCE_LIST_PATTERN.search(without_emails):
+            penalty += 0.3
+        if words > self.max_words // 2:
+            penalty += 0.1
+
+        candidates = []
+        for rule in RULES:
+            if not rule.pattern.search(message):
+                continue
+            if rule.tool in WRITE_TOOLS and not_a_command:
+                continue
+            conflict = CONFLICTS.get(rule.tool)
+            if conflict is not None and conflict.search(without_emails):
+                continue
+            params = rule.extract(message, emails)
+            if params is None:
+                continue
+            candidates.append((rule.score - penalty, rule.tool, params))
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return candidates
+
+    def route(self, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a message to a tool call locally if the match is unambiguous.
+
+        Args:
+            message: User's message
+
+        Returns:
+            Intent information in the Claude Intent Service format, or None to defer to Claude
+        """
+        candidates = self._score(message.strip())
+
+        if candidates:
+            confidence, tool, params = candidates[0]
+            ambiguous = len(candidates) > 1 and confidence - candidates[1][0] < 0.05
+            # Several actions in one message are a compound request, however they are joined.
+            ambiguous = ambiguous or len({TOOL_ACTIONS.get(candidate[1]) for candidate in candidates}) > 1
+            if confidence >= self.threshold and not ambiguous:
+                self.hits += 1
+                logger.info("Intent resolved locally: %s (confidence %.2f)", tool, confidence)
+                return {
+                    "tool": tool,
+                    "parameters": params,
+                    "needs_clarification": False,
+                    "clarification_question": None,
+                    "confidence": round(confidence, 2),
+                    "source": "local"
+                }
+
+        self.misses += 1
+        return None
+
+    def record_llm_call(self, seconds: float, tokens: int) -> None:
+        """
+        Record the cost of an intent classification that went to Claude.
+
+        Args:
+            seconds: Duration of the Claude call
+            tokens: Input plus output tokens used
+        """
+        self.llm_calls += 1
+        self.llm_seconds += seconds
+        self.llm_tokens += tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get router statistics, estimating savings from the average cost of a Claude call.
+
+        Returns:
+            Hit and miss counts, hit rate and estimated seconds and tokens saved
+        """
+        total = self.hits + self.misses
+        average_seconds = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+        average_tokens = self.llm_tokens / self.llm_calls if self.llm_calls else 0.0
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "estimated_seconds_saved": round(self.hits * average_seconds, 3),
+            "estimated_tokens_saved": int(self.hits * average_tokens)
+        }
@@ -0,0 +1,322 @@
+"""
+Semantic response cache for the Claude Intent Service.
+This module answers repeated and near-identical requests from earlier Claude responses.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+import importlib.util
+import json
+import logging
+import math
+import os
+import re
+import time
+import unicodedata
+import zlib
+
+from ..telemetry.metrics import SEMANTIC_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+NGRAM_SIZE = 3
+NON_WORD_PATTERN = re.compile(r"[^\w@]+")
+CACHE_FILE_VERSION = 1
+
+Vector = Dict[int, float]
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for cache keys: Unicode compatibility form, lowercase, punctuation as single spaces.
+
+    Args:
+        text: Text to normalize
+
+    Returns:
+        Normalized text, e.g. "what are tags" for "What are  tags?"
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    return NON_WORD_PATTERN.sub(" ", text).strip()
+
+def text_vector(normalized: str, dimensions: int) -> Vector:
+    """
+    Build the unit-length character n-gram vector of a normalized text.
+
+    N-grams are hashed into a fixed number of dimensions with CRC-32, which
+    is stable across processes, so persisted entries index the same way.
+
+    Args:
+        normalized: Normalized text
+        dimensions: Number of hashed dimensions
+
+    Returns:
+        Weight by dimension
+    """
+    padded = f" {normalized} "
+    counts: Vector = {}
+    for start in range(max(len(padded) - NGRAM_SIZE + 1, 1)):
+        index = zlib.crc32(padded[start:start + NGRAM_SIZE].encode("utf-8")) % dimensions
+        counts[index] = counts.get(index, 0.0) + 1.0
+    norm = math.sqrt(sum(weight * weight for weight in counts.values()))
+    return {index: weight / norm for index, weight in counts.items()}
+
+def _cosine(a: Vector, b: Vector) -> float:
+    """Get the cosine similarity of two unit-length vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(index, 0.0) for index, weight in a.items())
+
+class _Entry:
+    """A cached response with its key text, vector and expiry time."""
+
+    __slots__ = ("namespace", "text", "value", "vector", "expires_at", "slot")
+
+    def __init__(self, namespace: str, text: str, value: Any, vector: Vector, expires_at: float):
+        self.namespace = namespace
+        self.text = text
+        self.value = value
+        self.vector = vector
+        self.expires_at = expires_at
+        self.slot: Optional[int] = None
+
+class SemanticCache:
+    """
+    LRU and TTL bounded cache of Claude responses, looked up by exact normalized
+    text first and by character n-gram cosine similarity second.
+
+    Entries live in namespaces (e.g. intent classification per model, concept
+    explanations per documentation), and only entries of the same namespace are
+    compared. With NumPy installed, the vectors are kept in one matrix and a
+    similarity lookup is a single matrix-vector product; without it, they are
+    compared one by one. Shared across requests; only used from the event loop,
+    so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int = 2048, ttl: float = 86400.0, threshold: float = 0.85,
+                 path: Optional[str] = None, dimensions: int = 1024):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            max_entries: Maximum number of cached responses; the least recently used is evicted first
+            ttl: Seconds a response is served for
+            threshold: Minimum cosine similarity of a near-identical request
+            path: JSON file the cache is loaded from and saved to, or None to keep it in memory only
+            dimensions: Number of hashed n-gram dimensions
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self.path = path
+        self.dimensions = dimensions
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if NUMPY_AVAILABLE:
+            self._matrix = np.zeros((max_entries, dimensions), dtype=np.float32)
+            self._slot_namespaces = np.full(max_entries, -1, dtype=np.int32)
+            self._slot_keys: List[Optional[Tuple[str, str]]] = [None] * max_entries
+            self._free_slots = list(range(max_entries - 1, -1, -1))
+            self._namespace_ids: Dict[str, int] = {}
+
+    def get(self, namespace: str, text: str,
+            accept: Optional[Callable[[str, Any], bool]] = None) -> Optional[Any]:
+        """
+        Get the cached response of the same or a near-identical request.
+
+        Args:
+            namespace: Cache namespace
+            text: Request text
+            accept: Predicate called with the normalized text and the response of a cached request,
+                deciding whether the response may be served for this text
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        kind = namespace.partition(":")[0]
+        normalized = normalize_text(text)
+        now = time.time()
+
+        entry = self._entries.get((namespace, normalized))
+        if entry is not None and entry.expires_at <= now:
+            self._remove((namespace, normalized))
+            entry = None
+        if entry is not None and (accept is None or accept(entry.text, entry.value)):
+            self._entries.move_to_end((namespace, normalized))
+            self.hits += 1
+            SEMANTIC_CACHE_REQUESTS.inc(kind=kind, result="hit")
+            return entry.value
+
+        for score, entry in self._similar(namespace, text_vector(normalized, self.dimensions)):
+            if entry.expires_at <= now:
+                self._remove((entry.namespace, entry.text))
+                continue
+            if accept is None or accept(entry.text, entry.value):
+                self._entries.move_to_end((entry.namespace, entry.text))
+                self.similar_hits += 1
+                SEMANTIC_CACHE_REQUESTS.inc(kind=kind, result="similar")
+                logger.debug("Semantic cache served %r for %r (similarity %.3f)", entry.text, normalized, score)
+                return entry.value
+
+        self.misses += 1
+        SEMANTIC_CACHE_REQUESTS.inc(kind=kind, result="miss")
+        return None
+
+    def put(self, namespace: str, text: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Cache a response, evicting the least recently used one when full.
+
+        Args:
+            namespace: Cache namespace
+            text: Request text
+            value: JSON-serializable response
+            ttl: Seconds the response is served for, defaulting to the cache TTL
+        """
+        if self.max_entries <= 0:
+            return
+        normalized = normalize_text(text)
+        key = (namespace, normalized)
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.value = value
+            entry.expires_at = expires_at
+            self._entries.move_to_end(key)
+            return
+
+        while len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+        entry = _Entry(namespace, normalized, value, text_vector(normalized, self.dimensions), expires_at)
+        self._entries[key] = entry
+        if NUMPY_AVAILABLE:
+            entry.slot = self._free_slots.pop()
+            row = self._matrix[entry.slot]
+            row[:] = 0.0
+            row[list(entry.vector)] = list(entry.vector.values())
+            self._slot_namespaces[entry.slot] = self._namespace_id(namespace)
+            self._slot_keys[entry.slot] = key
+
+    def _namespace_id(self, namespace: str) -> int:
+        """Get the numeric ID of a namespace in the slot table."""
+        return self._namespace_ids.setdefault(namespace, len(self._namespace_ids))
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        """Remove an entry and free its matrix slot."""
+        entry = self._entries.pop(key, None)
+        if entry is not None and entry.slot is not None:
+            self._slot_namespaces[entry.slot] = -1
+            self._slot_keys[entry.slot] = None
+            self._free_slots.append(entry.slot)
+
+    def _similar(self, namespace: str, vector: Vector) -> Iterator[Tuple[float, _Entry]]:
+        """
+        Find the entries of a namespace at least `threshold` similar to a vector.
+
+        Args:
+            namespace: Cache namespace
+            vector: Unit-length request vector
+
+        Yields:
+            (similarity, entry) pairs, most similar first
+        """
+        if NUMPY_AVAILABLE:
+            if namespace not in self._namespace_ids or not self._entries:
+                return
+            query = np.zeros(self.dimensions, dtype=np.float32)
+            query[list(vector)] = list(vector.values())
+            scores = self._matrix @ query
+            scores[self._slot_namespaces != self._namespace_ids[namespace]] = -1.0
+            slots = np.flatnonzero(scores >= self.threshold)
+            ranked = [(float(scores[slot]), self._slot_keys[slot]) for slot in slots]
+        else:
+            ranked = [(_cosine(vector, entry.vector), key) for key, entry in self._entries.items()
+                      if entry.namespace == namespace]
+            ranked = [(score, key) for score, key in ranked if score >= self.threshold]
+
+        ranked.sort(key=lambda candidate: candidate[0], reverse=True)
+        for score, key in ranked:
+            entry = self._entries.get(key)
+            if entry is not None:
+                yield score, entry
+
+    def load(self) -> int:
+        """
+        Load unexpired responses saved by `save`.
+
+        Returns:
+            Number of responses loaded
+        """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not load semantic cache from %s: %s", self.path, e)
+            return 0
+        if data.get("version") != CACHE_FILE_VERSION:
+            return 0
+
+        now = time.time()
+        loaded = 0
+        for item in data.get("entries", []):
+            remaining = item["expires_at"] - now
+            if remaining > 0:
+                self.put(item["namespace"], item["text"], item["value"], ttl=remaining)
+                loaded += 1
+        logger.info("Loaded %d semantic cache entries from %s", loaded, self.path)
+        return loaded
+
+    def save(self) -> int:
+        """
+        Save the unexpired responses, least recently used first, replacing the file atomically.
+
+        Returns:
+            Number of responses saved
+        """
+        if not self.path:
+            return 0
+        now = time.time()
+        entries = [{"namespace": entry.namespace, "text": entry.text, "value": entry.value,
+                    "expires_at": entry.expires_at}
+                   for entry in self._entries.values() if entry.expires_at > now]
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_FILE_VERSION, "entries": entries}, f)
+            os.replace(temporary, self.path)
+        except OSError as e:
+            logger.error("Could not save semantic cache to %s: %s", self.path, e)
+            return 0
+        logger.info("Saved %d semantic cache entries to %s", len(entries), self.path)
+        return len(entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get semantic cache statistics.
+
+        Returns:
+            Entry count, exact and similar hits, misses, hit rate and evictions
+        """
+        lookups = self.hits + self.similar_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "index": "numpy" if NUMPY_AVAILABLE else "python",
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,194 @@
+"""
+Response templates for the MCP server.
+This module renders structured tool results as Markdown locally, without a Claude round trip.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_LIST_ITEMS = 50
+
+def _plural(count: int, singular: str, plural: Optional[str] = None) -> str:
+    """Format a count with the singular or plural form of a noun."""
+    return f"{count:,} {singular if count == 1 else (plural or singular + 's')}"
+
+def _more(items: List[Any]) -> str:
+    """Describe the items left out of a truncated list."""
+    remaining = len(items) - MAX_LIST_ITEMS
+    return f"\n\n…and {_plural(remaining, 'more', 'more')}." if remaining > 0 else ""
+
+def _cell(value: Any) -> str:
+    """Format a value for a Markdown table cell."""
+    if value is None or value == "":
+        return "—"
+    return str(value).replace("|", "\\|").replace("\n", " ")
+
+def _render_count_tags(result: Any) -> str:
+    """Render the number of tags."""
+    return f"You have **{_plural(int(result), 'tag')}** in your Kit.com account."
+
+def _render_count_subscribers(result: Any) -> str:
+    """Render the number of subscribers."""
+    return f"You have **{_plural(int(result), 'subscriber')}** in your Kit.com account."
+
+def _render_tags(result: Any) -> str:
+    """Render a list of tags."""
+    if not result:
+        return "You don't have any tags yet."
+    lines = [f"- **{_cell(tag.get('name'))}** (ID: {tag.get('id')})" for tag in result[:MAX_LIST_ITEMS]]
+    return f"You have {_plural(len(result), 'tag')}:\n\n" + "\n".join(lines) + _more(result)
+
+def _render_forms(result: Any) -> str:
+    """Render a list of forms."""
+    if not result:
+        return "You don't have any forms yet."
+    rows = [
+        f"| {_cell(form.get('name'))} | {form.get('id')} | {_cell(form.get('type'))} | {_cell(form.get('embed_url'))} |"
+        for form in result[:MAX_LIST_ITEMS]
+    ]
+    header = "| Name | ID | Type | Embed URL |\n|---|---|---|---|\n"
+    return f"You have {_plural(len(result), 'form')}:\n\n" + header + "\n".join(rows) + _more(result)
+
+def _render_subscribers(result: Any) -> str:
+    """Render a list of subscribers."""
+    if not result:
+        return "No subscribers found."
+    rows = [
+        f"| {_cell(subscriber.get('email_address'))} | {_cell(subscriber.get('first_name'))} | "
+        f"{_cell(subscriber.get('state'))} | {_cell(subscriber.get('created_at'))} | {subscriber.get('id')} |"
+        for subscriber in result[:MAX_LIST_ITEMS]
+    ]
+    header = "| Email | First name | State | Created | ID |\n|---|---|---|---|---|\n"
+    return f"Here {'is' if len(result) == 1 else 'are'} {_plural(len(result), 'subscriber')}:\n\n" + header + "\n".join(rows) + _more(result)
+
+def _render_subscriber_details(result: Any) -> str:
+    """Render the details of a single subscriber."""
+    if not result:
+        return "I couldn't find a subscriber with that email address."
+    lines = [
+        f"**{_cell(result.get('email_address'))}**",
+        "",
+        f"- **ID:** {result.get('id')}",
+        f"- **First name:** {_cell(result.get('first_name'))}",
+        f"- **State:** {_cell(result.get('state'))}",
+        f"- **Created:** {_cell(result.get('created_at'))}",
+    ]
+    fields = {key: value for key, value in (result.get("fields") or {}).items() if value not in (None, "")}
+    if fields:
+        lines.append("- **Custom fields:** " + ", ".join(f"{key}: {_cell(value)}" for key, value in fields.items()))
+    return "\n".join(lines)
+
+def _render_create_tag(result: Any) -> str:
+    """Render a created tag."""
+    if not result:
+        return "The tag could not be created."
+    return f"Tag **{_cell(result.get('name'))}** is ready (ID: {result.get('id')})."
+
+def _render_create_form(result: Any) -> str:
+    """Render a created form."""
+    if not result:
+        return "The form could not be created."
+    return f"Created form **{_cell(result.get('name'))}** (ID: {result.get('id')})."
+
+def _render_create_subscriber(result: Any) -> str:
+    """Render a created subscriber."""
+    if not result:
+        return "The subscriber could not be created."
+    name = f" ({result['first_name']})" if result.get("first_name") else ""
+    return f"Added subscriber **{_cell(result.get('email_address'))}**{name} (ID: {result.get('id')})."
+
+def _render_tag_subscriber(result: Any) -> str:
+    """Render a tagged subscriber."""
+    if not result:
+        return "The subscriber could not be tagged."
+    return f"Tagged **{_cell(result.get('email_address'))}** (subscriber ID: {result.get('id')})."
+
+def _render_bulk(action: str) -> Callable[[Any], str]:
+    """Build a renderer for a bulk operation summary."""
+    def render(result: Any) -> str:
+        lines = [f"{action} {_plural(result.get('succeeded', 0), 'subscriber')} "
+                 f"out of {result.get('requested', 0):,} requested."]
+        if result.get("enqueued"):
+            lines.append(f"{_plural(result['enqueued'], 'subscriber')} were queued for processing by Kit.com.")
+        if result.get("failed"):
+            lines.append(f"\n**{_plural(result['failed'], 'failure')}:**")
+            for failure in result.get("failures", []):
+                target = failure.get("email_address") or (failure.get("subscriber") or {}).get("email_address") \
+                    or failure.get("tagging") or failure.get("subscription") or "unknown"
+                lines.append(f"- {_cell(target)}: {', '.join(failure.get('errors', []))}")
+            if result["failed"] > len(result.get("failures", [])):
+                lines.append(f"- …and {result['failed'] - len(result['failures']):,} more")
+        if result.get("note"):
+            lines.append(f"\n_{result['note']}_")
+        return "\n".join(lines)
+    return render
+
+def _render_filter_by_tag(result: Any) -> str:
+    """Render which subscribers have a tag."""
+    tag = _cell(result.get("tag"))
+    lines = []
+    for key, label in (("with_tag", f"With **{tag}**"), ("without_tag", f"Without **{tag}**"),
+                       ("unknown", "Not found")):
+        emails = result.get(key) or []
+        if emails:
+            listed = ", ".join(_cell(email) for email in emails[:MAX_LIST_ITEMS])
+            more = " …" if len(emails) > MAX_LIST_ITEMS else ""
+            lines.append(f"- {label} ({len(emails):,}): {listed}{more}")
+    return "\n".join(lines) if lines else "No email addresses to check."
+
+def _render_segment(result: Any) -> str:
+    """Render the subscribers matching a tag segment."""
+    description = " and ".join(f"**{_cell(tag)}**" for tag in result.get("tags") or []) or "any tags"
+    if result.get("exclude_tags"):
+        description += " but not " + " or ".join(f"**{_cell(tag)}**" for tag in result["exclude_tags"])
+    header = f"{_plural(result.get('count', 0), 'active subscriber')} tagged {description}."
+    subscribers = result.get("subscribers") or []
+    if not subscribers:
+        return header
+    return header + "\n\n" + _render_subscribers(subscribers).split("\n\n", 1)[1]
+
+def _render_text(result: Any) -> str:
+    """Render a result that is already text."""
+    return str(result)
+
+RESPONSE_TEMPLATES: Dict[str, Callable[[Any], str]] = {
+    "count_tags": _render_count_tags,
+    "count_subscribers": _render_count_subscribers,
+    "get_tags": _render_tags,
+    "get_forms": _render_forms,
+    "get_subscribers": _render_subscribers,
+    "get_subscriber_details": _render_subscriber_details,
+    "create_tag": _render_create_tag,
+    "create_form": _render_create_form,
+    "create_subscriber": _render_create_subscriber,
+    "tag_subscriber": _render_tag_subscriber,
+    "bulk_create_subscribers": _render_bulk("Created or updated"),
+    "bulk_tag_subscribers": _render_bulk("Tagged"),
+    "bulk_add_subscribers_to_form": _render_bulk("Added"),
+    "filter_subscribers_by_tag": _render_filter_by_tag,
+    "segment_subscribers": _render_segment,
+    "explain_concept": _render_text,
+}
+
+def render_response(tool_name: str, result: Any) -> Optional[str]:
+    """
+    Render a tool result as Markdown using the template for the tool.
+
+    Args:
+        tool_name: Name of the tool that was executed
+        result: Result of the tool execution
+
+    Returns:
+        Rendered response, or None if the tool has no template or the result has an unexpected shape
+    """
+    template = RESPONSE_TEMPLATES.get(tool_name)
+    if template is None:
+        return None
+
+    try:
+        return template(result)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        logger.warning("Could not render %s result with template: %s", tool_name, e)
+        return None
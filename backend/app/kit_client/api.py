@@ -3,13 +3,31 @@ Kit.com API Client for interacting with the Kit.com V4 API.
 This module provides a client for making authenticated requests to the Kit.com API.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from urllib.parse import urlencode
 import os
+import asyncio
+import hashlib
 import logging
+import time
 import httpx
 from pydantic import BaseModel
 
-logging.basicConfig(level=logging.INFO)
+from .rate_limit import (
+    ACCESS_TOKEN_RATE_LIMIT,
+    API_KEY_RATE_LIMIT,
+    RATE_LIMIT_PERIOD,
+    RollingWindowRateLimiter,
+    backoff_delay,
+    parse_retry_after,
+)
+from .cache import ResponseCache
+from .mirror import FORM_EVENTS, SUBSCRIBER_STATE_EVENTS, TAG_EVENTS, AccountMirror
+from .tag_index import TagIndex
+from ..telemetry.metrics import KIT_RATE_LIMITED, KIT_REQUEST_SECONDS, KIT_RETRIES, endpoint_template
+from ..telemetry.tracing import span
+
 logger = logging.getLogger(__name__)
 
 class KitClientConfig(BaseModel):
@@ -17,39 +35,91 @@ class KitClientConfig(BaseModel):
     api_key: Optional[str] = None
     access_token: Optional[str] = None
     base_url: str = "https://api.kit.com/v4"
+    rate_limit: Optional[int] = None
+    max_retries: int = 4
+    retry_backoff_base: float = 0.5
+    retry_backoff_cap: float = 30.0
+    cache_ttls: Dict[str, float] = {}
+    cache_max_entries: int = 128
+
+RETRYABLE_STATUS_CODES = {413, 429, 500, 502, 503, 504}
+
+# A 429 means the request was rejected before it was processed, so any method can
+# be retried; after other errors the request may have been applied, so only
+# idempotent methods are sent again.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+DEFAULT_PER_PAGE = 500
+MAX_PER_PAGE = 1000
+
+BULK_SYNC_LIMIT = 100
+
+# Tag member listings an index sync runs at once, so that it leaves most of the
+# rate limit to interactive requests queued behind it.
+INDEX_SYNC_CONCURRENCY = 3
+
+def _discard(task: "asyncio.Future[Any]") -> None:
+    """Cancel a prefetch that is no longer needed without leaving its result unretrieved."""
+    task.cancel()
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
 
 class KitClient:
     """Client for interacting with the Kit.com V4 API."""
 
-    def __init__(self, config: KitClientConfig):
+    def __init__(self, config: KitClientConfig, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize the Kit.com API client.
 
         Args:
             config: Configuration for the client
+            client: Shared HTTP client; when omitted the client creates and owns its own
         """
         self.config = config
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(timeout=30.0)
+
+        rate_limit = config.rate_limit
+        if rate_limit is None:
+            rate_limit = API_KEY_RATE_LIMIT if config.api_key else ACCESS_TOKEN_RATE_LIMIT
+        self.rate_limiter = RollingWindowRateLimiter(rate_limit, RATE_LIMIT_PERIOD)
+        self.retries = 0
+        self.rate_limited = 0
+        self.tag_index = TagIndex(self)
+        self.cache = ResponseCache(config.cache_ttls, config.cache_max_entries)
+        self.mirror = AccountMirror()
+        self._mirror_webhooks: Optional[Tuple[str, str]] = None
+        self._index_sync: Optional[asyncio.Task] = None
 
         if not config.api_key and not config.access_token:
             logger.warning("No API key or access token provided. Authentication will fail.")
 
+        credential = f"api_key:{config.api_key}" if config.api_key else f"access_token:{config.access_token or ''}"
+        self.account_id = hashlib.sha256(credential.encode()).hexdigest()[:32]
+
         logger.info("KitClient initialized successfully")
 
     async def _make_request(self, method: str, endpoint: str,
                            params: Optional[Dict[str, Any]] = None,
-                           data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+                           data: Optional[Dict[str, Any]] = None,
+                           include_status: bool = False) -> Any:
         """
         Make an authenticated request to the Kit.com API.
 
+        Requests wait on the per-credential rate limiter. Responses with status 429
+        are retried with jittered exponential backoff, honoring the Retry-After
+        header when the API sends one; 413 and 5xx responses are retried the same
+        way for idempotent methods only. Latency per endpoint,
+        retries and 429 responses are recorded as metrics.
+
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
             endpoint: API endpoint (without base URL)
             params: Query parameters
             data: Request body data
+            include_status: Return the HTTP status code along with the response data
 
         Returns:
-            Response data as a dictionary
+            Response data as a dictionary, or a (status code, response data) tuple if include_status is set
         """
         url = f"{self.config.base_url}/{endpoint.lstrip('/')}"
         headers = {
@@ -62,29 +132,243 @@ class KitClient:
         elif self.config.access_token:
             headers["Authorization"] = f"Bearer {self.config.access_token}"
 
-        try:
-            response = await self.client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                headers=headers
-            )
-
-            response.raise_for_status()
-
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error: {e.response.status_code} - {e.response.text}")
+        template = endpoint_template(endpoint)
+        status = "error"
+        started = time.perf_counter()
+        with span("kit.request", {"http.method": method, "kit.endpoint": template}) as current:
             try:
-                error_data = e.response.json()
-                logger.error(f"Error details: {error_data}")
-            except Exception:
-                pass
-            raise
-        except Exception as e:
-            logger.error(f"Error making request to Kit.com API: {str(e)}")
-            raise
+                for attempt in range(self.config.max_retries + 1):
+                    await self.rate_limiter.acquire()
+                    response = await self.client.request(
+                        method=method,
+                        url=url,
+                        params=params,
+                        json=data,
+                        headers=headers
+                    )
+
+                    if response.status_code == 429:
+                        KIT_RATE_LIMITED.inc()
+                    retryable = response.status_code == 429 or (response.status_code in RETRYABLE_STATUS_CODES
+                                                                 and method.upper() in IDEMPOTENT_METHODS)
+                    if not retryable or attempt == self.config.max_retries:
+                        break
+
+                    delay = parse_retry_after(response.headers.get("Retry-After"))
+                    if delay is None:
+                        delay = backoff_delay(attempt, self.config.retry_backoff_base, self.config.retry_backoff_cap)
+
+                    self.retries += 1
+                    KIT_RETRIES.inc(status=response.status_code)
+                    logger.warning("Kit.com API returned %s for %s %s, retrying in %.2fs (attempt %d/%d)",
+                                   response.status_code, method, template, delay, attempt + 1,
+                                   self.config.max_retries,
+                                   extra={"status": response.status_code, "endpoint": template, "delay": delay})
+
+                    if response.status_code == 429:
+                        self.rate_limited += 1
+                        self.rate_limiter.defer(delay)
+                    else:
+                        await asyncio.sleep(delay)
+
+                status = str(response.status_code)
+                if current is not None:
+                    current.set_attribute("http.status_code", response.status_code)
+                response.raise_for_status()
+
+                if include_status:
+                    return response.status_code, response.json()
+                return response.json()
+            except httpx.HTTPStatusError as e:
+                # The body is cut off by the logging pipeline, so a large error page stays cheap.
+                logger.error("Kit.com API returned %s for %s %s: %s", e.response.status_code, method, template,
+                             e.response.text, extra={"status": e.response.status_code, "endpoint": template})
+                raise
+            except Exception as e:
+                logger.error("Error making request to Kit.com API: %s", e)
+                raise
+            finally:
+                KIT_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method, endpoint=template,
+                                            status=status)
+
+    async def _iter_pages(self, endpoint: str, key: str, params: Optional[Dict[str, Any]] = None,
+                          per_page: int = DEFAULT_PER_PAGE,
+                          limit: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream the pages of a cursor-paginated endpoint.
+
+        The next page is requested as soon as the current one arrives, so it is
+        fetched while the caller consumes the current page. At most two pages are
+        held in memory, and closing the iterator cancels the pending prefetch.
+
+        Args:
+            endpoint: API endpoint (without base URL)
+            key: Response key holding the list of objects
+            params: Additional query parameters
+            per_page: Number of objects per page (capped at the API maximum)
+            limit: Stop requesting pages once this many objects have been fetched
+
+        Yields:
+            Lists of objects, one per page
+        """
+        page_params = dict(params or {})
+        page_params["per_page"] = max(1, min(per_page, MAX_PER_PAGE))
+        fetched = 0
+        next_page = asyncio.ensure_future(self._make_request("GET", endpoint, params=dict(page_params)))
+
+        try:
+            while next_page is not None:
+                response = await next_page
+                next_page = None
+
+                page = response.get(key, [])
+                fetched += len(page)
+                pagination = response.get("pagination") or {}
+                cursor = pagination.get("end_cursor")
+
+                if pagination.get("has_next_page") and cursor and (limit is None or fetched < limit):
+                    page_params["after"] = cursor
+                    next_page = asyncio.ensure_future(self._make_request("GET", endpoint, params=dict(page_params)))
+
+                yield page
+        finally:
+            if next_page is not None:
+                _discard(next_page)
+
+    async def _iter_items(self, endpoint: str, key: str, params: Optional[Dict[str, Any]] = None,
+                          per_page: int = DEFAULT_PER_PAGE,
+                          limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the objects of a cursor-paginated endpoint one at a time.
+
+        Args:
+            endpoint: API endpoint (without base URL)
+            key: Response key holding the list of objects
+            params: Additional query parameters
+            per_page: Number of objects per page (capped at the API maximum)
+            limit: Maximum number of objects to yield
+
+        Yields:
+            Objects in API order
+        """
+        if limit is not None:
+            if limit <= 0:
+                return
+            per_page = min(per_page, limit)
+
+        count = 0
+        pages = self._iter_pages(endpoint, key, params=params, per_page=per_page, limit=limit)
+        try:
+            async for page in pages:
+                for item in page:
+                    yield item
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+        finally:
+            await pages.aclose()
+
+    def iter_tags(self, per_page: int = DEFAULT_PER_PAGE,
+                  limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every tag in the account.
+
+        Args:
+            per_page: Number of tags per page (maximum 1000)
+            limit: Maximum number of tags to yield
+
+        Returns:
+            Async iterator of tag objects
+        """
+        return self._iter_items("/tags", "tags", per_page=per_page, limit=limit)
+
+    def iter_forms(self, per_page: int = DEFAULT_PER_PAGE,
+                   limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every form in the account.
+
+        Args:
+            per_page: Number of forms per page (maximum 1000)
+            limit: Maximum number of forms to yield
+
+        Returns:
+            Async iterator of form objects
+        """
+        return self._iter_items("/forms", "forms", per_page=per_page, limit=limit)
+
+    def iter_broadcasts(self, per_page: int = DEFAULT_PER_PAGE,
+                        limit: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every broadcast in the account.
+
+        Args:
+            per_page: Number of broadcasts per page (maximum 1000)
+            limit: Maximum number of broadcasts to yield
+
+        Returns:
+            Async iterator of broadcast objects
+        """
+        return self._iter_items("/broadcasts", "broadcasts", per_page=per_page, limit=limit)
+
+    def iter_subscribers(self, per_page: int = DEFAULT_PER_PAGE, limit: Optional[int] = None,
+                         sort_by: Optional[str] = None, sort_order: Optional[str] = None,
+                         status: Optional[str] = None, created_after: Optional[str] = None,
+                         updated_after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every subscriber matching the filters.
+
+        Args:
+            per_page: Number of subscribers per page (maximum 1000)
+            limit: Maximum number of subscribers to yield
+            sort_by: Field to sort by (id, updated_at, cancelled_at)
+            sort_order: Sort order (asc or desc)
+            status: Subscriber status filter (active, inactive, bounced, complained, cancelled or all)
+            created_after: Only include subscribers created after this date
+            updated_after: Only include subscribers updated after this date
+
+        Returns:
+            Async iterator of subscriber objects
+        """
+        params = {}
+
+        if sort_by and sort_order:
+            params["sort_field"] = str(sort_by)
+            params["sort_order"] = str(sort_order)
+
+        if status:
+            params["status"] = status
+
+        if created_after:
+            params["created_after"] = created_after
+
+        if updated_after:
+            params["updated_after"] = updated_after
+
+        return self._iter_items("/subscribers", "subscribers", params=params, per_page=per_page, limit=limit)
+
+    def iter_tag_subscribers(self, tag_id: Any, per_page: int = DEFAULT_PER_PAGE, status: Optional[str] = None,
+                             tagged_after: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every subscriber with a tag.
+
+        Args:
+            tag_id: ID of the tag
+            per_page: Number of subscribers per page (maximum 1000)
+            status: Subscriber status filter (active, inactive, bounced, complained, cancelled or all)
+            tagged_after: Only include subscribers tagged after this date
+
+        Returns:
+            Async iterator of subscriber objects
+        """
+        params = {}
+
+        if status:
+            params["status"] = status
+
+        if tagged_after:
+            params["tagged_after"] = tagged_after
+
+        return self._iter_items(f"/tags/{tag_id}/subscribers", "subscribers", params=params, per_page=per_page)
 
 
     async def get_tags(self) -> List[Dict[str, Any]]:
@@ -94,8 +378,13 @@ class KitClient:
         Returns:
             List of tag objects
         """
-        response = await self._make_request("GET", "/tags")
-        return response.get("tags", [])
+        return await self.cache.get_or_load(("tags",), self._load_tags)
+
+    async def _load_tags(self) -> List[Dict[str, Any]]:
+        """Fetch every tag and refresh the tag index."""
+        tags = [tag async for tag in self.iter_tags(per_page=MAX_PER_PAGE)]
+        self.tag_index.replace(tags)
+        return tags
 
     async def create_tag(self, name: str) -> Dict[str, Any]:
         """
@@ -109,7 +398,24 @@ class KitClient:
         """
         data = {"name": name}
         response = await self._make_request("POST", "/tags", data=data)
-        return response.get("tag", {})
+        tag = response.get("tag", {})
+        self.tag_index.add(tag)
+        self.cache.invalidate("tags")
+        if self._mirror_webhooks is not None and tag.get("id"):
+            await self._register_tag_webhooks(tag["id"])
+        return tag
+
+    async def _register_tag_webhooks(self, tag_id: Any) -> None:
+        """Register the mirror's per-tag webhooks for a tag created after the mirror webhooks were registered."""
+        base_url, token = self._mirror_webhooks
+        try:
+            await asyncio.gather(*(
+                self.create_webhook(self._mirror_webhook_url(base_url, token, event, tag_id=tag_id), event,
+                                    tag_id=tag_id)
+                for event in TAG_EVENTS
+            ))
+        except Exception as e:
+            logger.warning("Could not register Kit.com webhooks for tag %s: %s", tag_id, e)
 
     async def tag_subscriber_by_email(self, email: str, tag_id: str) -> Dict[str, Any]:
         """
@@ -124,7 +430,10 @@ class KitClient:
         """
         data = {"email_address": email}
         response = await self._make_request("POST", f"/tags/{tag_id}/subscribers", data=data)
-        return response.get("subscriber", {})
+        subscriber = response.get("subscriber", {})
+        self.mirror.upsert_subscriber(subscriber)
+        self.mirror.add_tag_member(tag_id, subscriber.get("id"))
+        return subscriber
 
 
     async def get_subscribers(self, limit: int = 10, sort_by: str = "created_at",
@@ -140,16 +449,9 @@ class KitClient:
         Returns:
             List of subscriber objects
         """
-        params = {
-            "per_page": str(limit)
-        }
-
-        if sort_by and sort_order:
-            params["sort_field"] = str(sort_by)
-            params["sort_order"] = str(sort_order)
-
-        response = await self._make_request("GET", "/subscribers", params=params)
-        return response.get("subscribers", [])
+        limit = int(limit)
+        subscribers = self.iter_subscribers(per_page=limit, limit=limit, sort_by=sort_by, sort_order=sort_order)
+        return [subscriber async for subscriber in subscribers]
 
     async def count_subscribers(self) -> int:
         """
@@ -158,56 +460,41 @@ class KitClient:
         Returns:
             Number of subscribers
         """
+        count = self.mirror.count_subscribers()
+        if count is not None:
+            return count
+
+        count = await self.cache.get_or_load(("subscriber_count",), self._count_subscribers)
+        self.mirror.seed_count(count)
+        return count
+
+    async def _count_subscribers(self) -> int:
+        """
+        Fetch the number of active subscribers from the API.
+
+        Asks for the total count alongside a single-item page. If the response
+        carries no total, every page is streamed at the maximum page size and
+        only the number of subscribers on each page is kept.
+        """
         params = {
             "per_page": 1,
             "include_total_count": "true"
         }
+        response = await self._make_request("GET", "/subscribers", params=params)
+
+        total_count = (response.get("pagination") or {}).get("total_count")
+        if isinstance(total_count, int):
+            return total_count
 
+        logger.warning("Subscriber list response has no total count; counting pages")
+        count = 0
+        pages = self._iter_pages("/subscribers", "subscribers", per_page=MAX_PER_PAGE)
         try:
-            response = await self._make_request("GET", "/subscribers", params=params)
-            logger.info(f"Subscriber count raw response: {response}")
-            
-            if "total_count" in response:
-                return response.get("total_count", 0)
-            
-            if "meta" in response and "total_count" in response["meta"]:
-                return response["meta"]["total_count"]
-            
-            if "total_subscribers" in response:
-                return response["total_subscribers"]
-            
-            if "count" in response:
-                return response["count"]
-            
-            if "subscribers" in response and isinstance(response["subscribers"], list):
-                if len(response["subscribers"]) > 0:
-                    if "pagination" in response and "total" in response["pagination"]:
-                        return response["pagination"]["total"]
-                    else:
-                        large_params = {
-                            "per_page": 100,
-                            "include_total_count": "true"
-                        }
-                        large_response = await self._make_request("GET", "/subscribers", params=large_params)
-                        logger.info(f"Large subscriber count response: {large_response}")
-                        
-                        if "total_count" in large_response:
-                            return large_response["total_count"]
-                        elif "meta" in large_response and "total_count" in large_response["meta"]:
-                            return large_response["meta"]["total_count"]
-                        elif "pagination" in large_response and "total" in large_response["pagination"]:
-                            return large_response["pagination"]["total"]
-                        else:
-                            return len(large_response.get("subscribers", []))
-                
-                return len(response["subscribers"])
-            
-            logger.warning(f"Could not determine subscriber count from response: {response}")
-            return 0
-            
-        except Exception as e:
-            logger.error(f"Error counting subscribers: {str(e)}")
-            raise
+            async for page in pages:
+                count += len(page)
+        finally:
+            await pages.aclose()
+        return count
 
     async def get_subscriber_by_email(self, email: str) -> Dict[str, Any]:
         """
@@ -219,11 +506,16 @@ class KitClient:
         Returns:
             Subscriber object
         """
+        subscriber = self.mirror.lookup_email(email)
+        if subscriber is not None:
+            return subscriber
+
         params = {"email_address": email}
         response = await self._make_request("GET", "/subscribers", params=params)
         subscribers = response.get("subscribers", [])
 
         if subscribers:
+            self.mirror.upsert_subscriber(subscribers[0])
             return subscribers[0]
         else:
             return {}
@@ -249,18 +541,125 @@ class KitClient:
         if fields:
             for field_key, field_value in fields.items():
                 data[field_key] = field_value
-            
-        logger.info(f"Creating subscriber with data: {data}")
-        
+
         try:
-            response = await self._make_request("POST", "/subscribers", data=data)
-            logger.info(f"Subscriber creation response: {response}")
-            return response.get("subscriber", {})
+            status_code, response = await self._make_request("POST", "/subscribers", data=data, include_status=True)
+            # Kit.com answers 201 for a new subscriber and 200 when an existing one was updated.
+            subscriber = response.get("subscriber", {})
+            if status_code == 201:
+                self.cache.update(("subscriber_count",), lambda count: count + 1)
+                self.mirror.adjust_count(1)
+            self.mirror.upsert_subscriber(subscriber)
+            return subscriber
         except Exception as e:
-            logger.error(f"Error creating subscriber: {str(e)}")
+            logger.error("Error creating subscriber: %s", e)
             raise
 
 
+    @property
+    def supports_bulk(self) -> bool:
+        """Whether the bulk endpoints are available, which requires an OAuth access token."""
+        return bool(self.config.access_token) and not self.config.api_key
+
+    async def _bulk_request(self, endpoint: str, key: str, items: List[Dict[str, Any]],
+                            result_key: str, callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Send items to a bulk endpoint.
+
+        Batches of at most BULK_SYNC_LIMIT items are processed synchronously by
+        Kit.com, so larger inputs are split into chunks of that size and sent
+        concurrently under the rate limiter. If a callback URL is given and the
+        input is larger than one chunk, the whole batch is instead enqueued for
+        asynchronous processing and Kit.com POSTs the results to the callback URL.
+
+        Args:
+            endpoint: Bulk API endpoint (without base URL)
+            key: Request body key holding the items
+            items: Items to process
+            result_key: Response key holding the processed objects
+            callback_url: URL Kit.com should POST to when asynchronous processing completes
+
+        Returns:
+            Merged processed objects and failures, plus the number of enqueued items
+        """
+        if callback_url and len(items) > BULK_SYNC_LIMIT:
+            await self._make_request("POST", endpoint, data={key: items, "callback_url": callback_url})
+            return {result_key: [], "failures": [], "enqueued": len(items)}
+
+        chunks = [items[i:i + BULK_SYNC_LIMIT] for i in range(0, len(items), BULK_SYNC_LIMIT)]
+        responses = await asyncio.gather(*(
+            self._make_request("POST", endpoint, data={key: chunk}) for chunk in chunks
+        ))
+
+        result = {result_key: [], "failures": [], "enqueued": 0}
+        for response in responses:
+            result[result_key].extend(response.get(result_key, []))
+            result["failures"].extend(response.get("failures", []))
+        return result
+
+    async def bulk_create_subscribers(self, subscribers: List[Dict[str, Any]],
+                                      callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create or update subscribers in bulk. Requires an OAuth access token.
+
+        Args:
+            subscribers: Subscriber objects with email_address and optional first_name and state
+            callback_url: URL to notify when asynchronous processing completes
+
+        Returns:
+            Created subscribers and failures
+        """
+        result = await self._bulk_request("/bulk/subscribers", "subscribers", subscribers,
+                                           "subscribers", callback_url)
+        self.cache.invalidate("subscriber_count")
+        return result
+
+    async def bulk_tag_subscribers(self, taggings: List[Dict[str, Any]],
+                                   callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Tag subscribers in bulk. Requires an OAuth access token.
+
+        Args:
+            taggings: Objects with tag_id and subscriber_id
+            callback_url: URL to notify when asynchronous processing completes
+
+        Returns:
+            Tagged subscribers and failures
+        """
+        return await self._bulk_request("/bulk/tags/subscribers", "taggings", taggings,
+                                         "subscribers", callback_url)
+
+    async def bulk_add_subscribers_to_forms(self, additions: List[Dict[str, Any]],
+                                            callback_url: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Add subscribers to forms in bulk. Requires an OAuth access token.
+
+        Args:
+            additions: Objects with form_id, subscriber_id and optional referrer
+            callback_url: URL to notify when asynchronous processing completes
+
+        Returns:
+            Added subscribers and failures
+        """
+        return await self._bulk_request("/bulk/forms/subscribers", "additions", additions,
+                                         "subscribers", callback_url)
+
+    async def add_subscriber_to_form_by_email(self, email: str, form_id: str) -> Dict[str, Any]:
+        """
+        Add a subscriber to a form by email address.
+
+        Args:
+            email: Email address of the subscriber
+            form_id: ID of the form
+
+        Returns:
+            Subscriber object
+        """
+        data = {"email_address": email}
+        response = await self._make_request("POST", f"/forms/{form_id}/subscribers", data=data)
+        return response.get("subscriber", {})
+
+
     async def get_forms(self) -> List[Dict[str, Any]]:
         """
         Get all forms from the account.
@@ -268,8 +667,11 @@ class KitClient:
         Returns:
             List of form objects
         """
-        response = await self._make_request("GET", "/forms")
-        return response.get("forms", [])
+        return await self.cache.get_or_load(("forms",), self._load_forms)
+
+    async def _load_forms(self) -> List[Dict[str, Any]]:
+        """Fetch every form."""
+        return [form async for form in self.iter_forms(per_page=MAX_PER_PAGE)]
 
     async def create_form(self, name: str, redirect_url: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -288,6 +690,7 @@ class KitClient:
             data["redirect_url"] = redirect_url
 
         response = await self._make_request("POST", "/forms", data=data)
+        self.cache.invalidate("forms")
         return response.get("form", {})
 
 
@@ -298,8 +701,7 @@ class KitClient:
         Returns:
             Account information
         """
-        response = await self._make_request("GET", "/account")
-        return response
+        return await self.cache.get_or_load(("account",), lambda: self._make_request("GET", "/account"))
 
 
     async def get_broadcasts(self, limit: int = 10) -> List[Dict[str, Any]]:
@@ -312,9 +714,12 @@ class KitClient:
         Returns:
             List of broadcast objects
         """
-        params = {"per_page": limit}
-        response = await self._make_request("GET", "/broadcasts", params=params)
-        return response.get("broadcasts", [])
+        limit = int(limit)
+
+        async def load() -> List[Dict[str, Any]]:
+            return [broadcast async for broadcast in self.iter_broadcasts(per_page=limit, limit=limit)]
+
+        return await self.cache.get_or_load(("broadcasts", limit), load)
 
     async def create_broadcast(self, subject: str, content: str,
                               email_template_id: Optional[str] = None) -> Dict[str, Any]:
@@ -338,9 +743,198 @@ class KitClient:
             data["email_template_id"] = email_template_id
 
         response = await self._make_request("POST", "/broadcasts", data=data)
+        self.cache.invalidate("broadcasts")
         return response.get("broadcast", {})
 
 
+    async def create_webhook(self, target_url: str, event: str, **event_params: Any) -> Dict[str, Any]:
+        """
+        Register a webhook.
+
+        Args:
+            target_url: URL Kit.com posts events to
+            event: Event name, e.g. "subscriber.subscriber_activate"
+            **event_params: Event parameters, e.g. tag_id for tag events
+
+        Returns:
+            Created webhook object
+        """
+        data = {"target_url": target_url, "event": {"name": event, **event_params}}
+        response = await self._make_request("POST", "/webhooks", data=data)
+        return response.get("webhook", {})
+
+    async def list_webhooks(self) -> List[Dict[str, Any]]:
+        """
+        Get every webhook registered for the account.
+
+        Returns:
+            List of webhook objects
+        """
+        return [webhook async for webhook in self._iter_items("/webhooks", "webhooks", per_page=MAX_PER_PAGE)]
+
+    async def delete_webhook(self, webhook_id: str) -> None:
+        """
+        Delete a webhook.
+
+        Args:
+            webhook_id: ID of the webhook
+        """
+        await self._make_request("DELETE", f"/webhooks/{webhook_id}")
+
+    def _mirror_webhook_url(self, base_url: str, token: str, event: str, **event_params: Any) -> str:
+        """Get the URL a mirror webhook event is delivered to."""
+        query = urlencode({"token": token, **event_params})
+        return f"{base_url.rstrip('/')}/{self.account_id}/{event}?{query}"
+
+    async def register_mirror_webhooks(self, base_url: str, token: str) -> List[Dict[str, Any]]:
+        """
+        Register the webhooks that keep the account mirror up to date.
+
+        Each event is delivered to its own URL,
+        `{base_url}/{account_id}/{event}?token=...`, with the tag or form ID
+        added for per-tag and per-form events. Webhooks whose URL is already
+        registered are skipped. Tags created through this client afterwards
+        get their webhooks registered by `create_tag`.
+
+        Args:
+            base_url: Public URL of the webhook receiver, without the account and event
+            token: Shared secret the receiver checks
+
+        Returns:
+            Newly created webhook objects
+        """
+        existing = {webhook.get("target_url") for webhook in await self.list_webhooks()}
+        tags, forms = await asyncio.gather(self.get_tags(), self.get_forms())
+
+        def target(event: str, **event_params: Any) -> str:
+            return self._mirror_webhook_url(base_url, token, event, **event_params)
+
+        wanted = [(target(event), event, {}) for event in SUBSCRIBER_STATE_EVENTS]
+        wanted += [(target(event, tag_id=tag["id"]), event, {"tag_id": tag["id"]}) for tag in tags for event in TAG_EVENTS]
+        wanted += [(target(event, form_id=form["id"]), event, {"form_id": form["id"]}) for form in forms for event in FORM_EVENTS]
+
+        created = await asyncio.gather(*(
+            self.create_webhook(url, event, **event_params)
+            for url, event, event_params in wanted if url not in existing
+        ))
+        self.mirror.live = True
+        self._mirror_webhooks = (base_url, token)
+        logger.info("Registered %d Kit.com webhooks (%d already registered)", len(created), len(wanted) - len(created))
+        return list(created)
+
+    async def _load_tag_members(self, tag_id: Any, tagged_after: Optional[str],
+                                semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+        """Fetch the subscribers with a tag, optionally only those tagged after a date."""
+        async with semaphore:
+            return [
+                subscriber async for subscriber in
+                self.iter_tag_subscribers(tag_id, per_page=MAX_PER_PAGE, status="all", tagged_after=tagged_after)
+            ]
+
+    async def sync_subscriber_index(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Sync the local subscriber index in the account mirror.
+
+        The first sync (or a full one) streams every subscriber and the
+        subscribers of every tag; later syncs only fetch subscribers updated
+        and tag memberships added since the previous sync started. Tag removals
+        reach the index through webhooks or the next full sync. At most
+        INDEX_SYNC_CONCURRENCY tags are listed at once.
+
+        Args:
+            full: Reload the whole account even if the index is already synced
+
+        Returns:
+            Number of subscribers fetched and whether the sync was full
+        """
+        started = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        since = None if full or not self.mirror.indexed else self.mirror.synced_at
+
+        subscribers = [
+            subscriber async for subscriber in
+            self.iter_subscribers(per_page=MAX_PER_PAGE, status="all", updated_after=since)
+        ]
+        tags = await self.get_tags()
+        semaphore = asyncio.Semaphore(INDEX_SYNC_CONCURRENCY)
+        memberships = await asyncio.gather(*(self._load_tag_members(tag["id"], since, semaphore) for tag in tags))
+
+        if since is None:
+            tag_members = {
+                int(tag["id"]): {int(subscriber["id"]) for subscriber in members}
+                for tag, members in zip(tags, memberships)
+            }
+            self.mirror.replace_index(subscribers, tag_members, started)
+        else:
+            for subscriber in subscribers:
+                self.mirror.upsert_subscriber(subscriber)
+            for tag, members in zip(tags, memberships):
+                for subscriber in members:
+                    self.mirror.add_tag_member(tag["id"], subscriber["id"])
+            self.mirror.synced_at = started
+
+        logger.info("Synced subscriber index (%s): %d subscribers, %d tags", "full" if since is None else "incremental",
+                    len(subscribers), len(tags))
+        return {"full": since is None, "subscribers": len(subscribers)}
+
+    async def _sync_index_forever(self, interval: float, full_interval: float) -> None:
+        """Keep the subscriber index synced, reloading it fully every `full_interval` seconds."""
+        last_full = 0.0
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                full = loop.time() - last_full >= full_interval
+                await self.sync_subscriber_index(full=full)
+                if full:
+                    last_full = loop.time()
+            except Exception as e:
+                logger.error("Error syncing subscriber index: %s", e)
+            await asyncio.sleep(interval)
+
+    def start_index_sync(self, interval: float = 300.0, full_interval: float = 86400.0) -> None:
+        """
+        Start syncing the subscriber index in the background.
+
+        Args:
+            interval: Seconds between incremental syncs
+            full_interval: Seconds between full reloads
+        """
+        if self._index_sync is None:
+            self._index_sync = asyncio.ensure_future(self._sync_index_forever(interval, full_interval))
+
+    @property
+    def index_syncing(self) -> bool:
+        """Whether the subscriber index is being kept synced in the background."""
+        return self._index_sync is not None
+
+    @property
+    def mirroring(self) -> bool:
+        """Whether webhooks registered through this client feed its account mirror."""
+        return self._mirror_webhooks is not None
+
+    def stop_index_sync(self) -> None:
+        """Stop syncing the subscriber index."""
+        if self._index_sync is not None:
+            self._index_sync.cancel()
+            self._index_sync = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get request statistics for this client.
+
+        Returns:
+            Rate limiter statistics plus retry, 429 and response cache counts
+        """
+        cache_stats = self.cache.stats()
+        return {
+            **self.rate_limiter.stats(),
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "cache_hits": cache_stats["hits"],
+            "cache_misses": cache_stats["misses"]
+        }
+
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Stop the subscriber index sync and close the HTTP client if this client owns it."""
+        self.stop_index_sync()
+        if self._owns_client:
+            await self.client.aclose()
@@ -0,0 +1,180 @@
+"""
+Response cache for the Kit.com API client.
+This module provides a per-account cache for read-only API calls.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import asyncio
+import logging
+import time
+
+from ..telemetry.metrics import KIT_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# Seconds each cached endpoint is trusted; 0 disables caching for the endpoint.
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    "account": 600.0,
+    "tags": 60.0,
+    "forms": 300.0,
+    "broadcasts": 60.0,
+    "subscriber_count": 30.0,
+}
+
+class ResponseCache:
+    """
+    LRU cache of API results keyed by endpoint and arguments.
+
+    Keys are tuples whose first element names the endpoint, so writes can
+    invalidate every cached variant of an endpoint at once. Concurrent misses
+    for the same key share a single request.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = 128):
+        """
+        Initialize the response cache.
+
+        Args:
+            ttls: Seconds each endpoint is cached, merged over DEFAULT_CACHE_TTLS
+            max_entries: Maximum number of cached results
+        """
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[Any, float]]" = OrderedDict()
+        # In-flight loads with the endpoint generation they started in.
+        self._pending: Dict[Tuple[Hashable, ...], Tuple["asyncio.Task[Any]", int]] = {}
+        self._generations: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def peek(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """
+        Get a cached result without loading it or counting a hit.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached result, or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> None:
+        """
+        Store a result, e.g. one updated locally after a write.
+
+        Args:
+            key: Cache key
+            value: Result to store
+        """
+        ttl = self.ttls.get(str(key[0]), 0.0)
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update(self, key: Tuple[Hashable, ...], function: Callable[[Any], Any]) -> None:
+        """
+        Apply a local change to a cached result, keeping its expiry.
+
+        Results being loaded concurrently are not cached, since they may not
+        include the change.
+
+        Args:
+            key: Cache key
+            function: Function returning the updated result from the cached one
+        """
+        endpoint = str(key[0])
+        self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries[key] = (function(entry[0]), entry[1])
+
+    async def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Get a cached result, loading it if it is missing or expired.
+
+        Args:
+            key: Cache key; the first element names the endpoint
+            loader: Coroutine function making the request
+
+        Returns:
+            Result of the request
+        """
+        endpoint = str(key[0])
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self.hits += 1
+            KIT_CACHE_REQUESTS.inc(endpoint=endpoint, result="hit")
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        generation = self._generations.get(endpoint, 0)
+        pending, started_in = self._pending.get(key, (None, generation))
+        # A load started before a write may miss it, so callers arriving after
+        # the write start a fresh load instead of joining it.
+        if pending is not None and started_in == generation:
+            self.coalesced += 1
+            KIT_CACHE_REQUESTS.inc(endpoint=endpoint, result="coalesced")
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        KIT_CACHE_REQUESTS.inc(endpoint=endpoint, result="miss")
+        # The request runs in its own task, so cancelling the caller that
+        # started it (e.g. a closed WebSocket) does not fail the others.
+        pending = asyncio.create_task(self._load(key, loader, generation))
+        self._pending[key] = (pending, generation)
+        pending.add_done_callback(lambda task: self._loaded(key, task))
+        return await asyncio.shield(pending)
+
+    async def _load(self, key: Tuple[Hashable, ...], loader: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        """Make a request and cache its result unless a write made it stale meanwhile."""
+        value = await loader()
+        if self._generations.get(str(key[0]), 0) == generation:
+            self.put(key, value)
+        return value
+
+    def _loaded(self, key: Tuple[Hashable, ...], task: "asyncio.Task[Any]") -> None:
+        """Forget a finished request, retrieving its error in case every caller was cancelled."""
+        if self._pending.get(key, (None, 0))[0] is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()
+
+    def invalidate(self, *endpoints: str) -> None:
+        """
+        Drop every cached result of the given endpoints.
+
+        Args:
+            *endpoints: Endpoint names
+        """
+        for endpoint in endpoints:
+            self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+        stale = [key for key in self._entries if key[0] in endpoints]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Number of cached results, hits, misses, requests shared with a concurrent miss and invalidations
+        """
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,300 @@
+"""
+Account mirror for the Kit.com API client.
+This module keeps a local copy of an account's subscribers, tag memberships and
+subscriber count, fed by webhook events and by the client's own reads and writes.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Subscriber events that can be registered without an extra parameter, mapped to
+# the state they leave the subscriber in.
+SUBSCRIBER_STATE_EVENTS = {
+    "subscriber.subscriber_activate": "active",
+    "subscriber.subscriber_unsubscribe": "cancelled",
+    "subscriber.subscriber_bounce": "bounced",
+    "subscriber.subscriber_complain": "complained",
+}
+
+# Events registered once per tag or per form, with the parameter naming it.
+TAG_EVENTS = ("subscriber.tag_add", "subscriber.tag_remove")
+
+FORM_EVENTS = ("subscriber.form_subscribe",)
+
+class AccountMirror:
+    """
+    Local copy of part of a Kit.com account.
+
+    Kit.com webhook payloads carry the subscriber but not the event name, so
+    each event is delivered to its own URL and passed in by the receiver.
+    The subscriber count is seeded from the API and adjusted by state events;
+    it is trusted for `count_ttl` seconds before it is fetched again, and a
+    subscriber looked up by email for `lookup_ttl` seconds after it was last
+    mirrored. Reads are only answered once the mirror is live, i.e. webhooks
+    feed it.
+
+    The mirror lives in the memory of one process, and webhooks reach only the
+    worker they are delivered to, so it must only go live in a single-worker
+    deployment (see app/api/webhooks.py).
+
+    When the subscriber index is synced (see KitClient.sync_subscriber_index)
+    the mirror holds every subscriber and tag membership of the account, and
+    counts and segment queries are answered from the indexes. Lookups of the
+    synced index are not subject to `lookup_ttl`, since the sync refreshes it.
+    """
+
+    def __init__(self, count_ttl: float = 600.0, max_subscribers: Optional[int] = 100_000,
+                 lookup_ttl: float = 600.0):
+        """
+        Initialize the account mirror.
+
+        Args:
+            count_ttl: Number of seconds a seeded subscriber count is trusted
+            max_subscribers: Maximum number of subscribers kept for lookups until the index is synced
+            lookup_ttl: Number of seconds a mirrored subscriber is served by email lookups
+        """
+        self.count_ttl = count_ttl
+        self.lookup_ttl = lookup_ttl
+        self.max_subscribers = max_subscribers
+        self.subscribers: Dict[int, Dict[str, Any]] = {}
+        self.emails: Dict[str, int] = {}
+        self.mirrored_at: Dict[int, float] = {}
+        self.tag_members: Dict[int, Set[int]] = {}
+        self.form_members: Dict[int, Set[int]] = {}
+        self.active_ids: Set[int] = set()
+        self.synced_at: Optional[str] = None
+        self.active_count: Optional[int] = None
+        self._count_seeded_at = 0.0
+        self.live = False
+        self.events = 0
+        self.hits = 0
+
+    def upsert_subscriber(self, subscriber: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add or update a subscriber.
+
+        Args:
+            subscriber: Subscriber object with at least id and email_address
+
+        Returns:
+            The previously stored subscriber, if any
+        """
+        subscriber_id = subscriber.get("id")
+        email = str(subscriber.get("email_address") or "").lower()
+        if not subscriber_id or not email:
+            return None
+
+        previous = self.subscribers.get(subscriber_id)
+        if previous is not None:
+            previous_email = str(previous.get("email_address") or "").lower()
+            if previous_email != email:
+                self.emails.pop(previous_email, None)
+            subscriber = {**previous, **subscriber}
+        elif self.synced_at is None and self.max_subscribers is not None and len(self.subscribers) >= self.max_subscribers:
+            # Dicts keep insertion order, so this drops the oldest entry.
+            oldest_id = next(iter(self.subscribers))
+            self.emails.pop(str(self.subscribers.pop(oldest_id).get("email_address") or "").lower(), None)
+            self.mirrored_at.pop(oldest_id, None)
+            self.active_ids.discard(oldest_id)
+
+        self.subscribers[subscriber_id] = subscriber
+        self.mirrored_at[subscriber_id] = time.monotonic()
+        self.emails[email] = subscriber_id
+        if subscriber.get("state") == "active":
+            self.active_ids.add(subscriber_id)
+        elif "state" in subscriber:
+            self.active_ids.discard(subscriber_id)
+        return previous
+
+    def replace_index(self, subscribers: Iterable[Dict[str, Any]], tag_members: Dict[int, Set[int]],
+                      synced_at: str) -> None:
+        """
+        Replace the mirror with a full load of the account.
+
+        Args:
+            subscribers: Every subscriber in the account
+            tag_members: Subscriber IDs of each tag
+            synced_at: Time the load started, in ISO format
+        """
+        self.subscribers = {}
+        self.emails = {}
+        self.mirrored_at = {}
+        self.active_ids = set()
+        self.synced_at = synced_at
+        for subscriber in subscribers:
+            self.upsert_subscriber(subscriber)
+        self.tag_members = tag_members
+
+    @property
+    def indexed(self) -> bool:
+        """Whether the mirror holds every subscriber of the account."""
+        return self.synced_at is not None
+
+    def lookup_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a subscriber by email address without making any requests.
+
+        Args:
+            email: Email address
+
+        Returns:
+            Subscriber object, or None if the mirror is not live or the subscriber is not mirrored or stale
+        """
+        if not self.live and not self.indexed:
+            return None
+        subscriber_id = self.emails.get(str(email).strip().lower())
+        if subscriber_id is None:
+            return None
+        if not self.indexed and time.monotonic() - self.mirrored_at.get(subscriber_id, 0.0) > self.lookup_ttl:
+            return None
+        self.hits += 1
+        return self.subscribers.get(subscriber_id)
+
+    def seed_count(self, count: int) -> None:
+        """
+        Set the number of active subscribers fetched from the API.
+
+        Args:
+            count: Number of active subscribers
+        """
+        self.active_count = count
+        self._count_seeded_at = time.monotonic()
+
+    def count_subscribers(self) -> Optional[int]:
+        """
+        Get the number of active subscribers without making any requests.
+
+        Returns:
+            Number of active subscribers, or None if the mirror is not live or the count is unknown or stale
+        """
+        if self.indexed:
+            self.hits += 1
+            return len(self.active_ids)
+        if not self.live or self.active_count is None or time.monotonic() - self._count_seeded_at > self.count_ttl:
+            return None
+        self.hits += 1
+        return self.active_count
+
+    def adjust_count(self, delta: int) -> None:
+        """
+        Adjust the mirrored subscriber count after a local or remote change.
+
+        Args:
+            delta: Change in the number of active subscribers
+        """
+        if self.active_count is not None:
+            self.active_count = max(0, self.active_count + delta)
+
+    def add_tag_member(self, tag_id: Any, subscriber_id: Any) -> None:
+        """
+        Record that a subscriber has a tag.
+
+        Args:
+            tag_id: ID of the tag
+            subscriber_id: ID of the subscriber
+        """
+        if tag_id and subscriber_id:
+            self.tag_members.setdefault(int(tag_id), set()).add(int(subscriber_id))
+
+    def tagged(self, subscriber_ids: Iterable[int], tag_id: Any) -> Set[int]:
+        """
+        Get which of some subscribers have a tag.
+
+        Args:
+            subscriber_ids: IDs of the subscribers
+            tag_id: ID of the tag
+
+        Returns:
+            IDs of the subscribers that have the tag
+        """
+        self.hits += 1
+        return self.tag_members.get(int(tag_id), set()).intersection(subscriber_ids)
+
+    def segment(self, tag_ids: List[Any], exclude_tag_ids: List[Any], active_only: bool = True) -> Set[int]:
+        """
+        Get the subscribers that have every tag in one list and none in another.
+
+        Args:
+            tag_ids: IDs of tags the subscribers must have
+            exclude_tag_ids: IDs of tags the subscribers must not have
+            active_only: Only include active subscribers
+
+        Returns:
+            IDs of the matching subscribers
+        """
+        self.hits += 1
+        include = sorted((self.tag_members.get(int(tag_id), set()) for tag_id in tag_ids), key=len)
+        if include:
+            matches = set(include[0]).intersection(*include[1:])
+        else:
+            matches = set(self.active_ids if active_only else self.subscribers)
+        if active_only:
+            matches &= self.active_ids
+        for tag_id in exclude_tag_ids:
+            matches -= self.tag_members.get(int(tag_id), set())
+        return matches
+
+    def apply_event(self, event: str, payload: Dict[str, Any], tag_id: Optional[int] = None,
+                    form_id: Optional[int] = None) -> bool:
+        """
+        Apply a webhook event.
+
+        Args:
+            event: Event name, e.g. "subscriber.tag_add"
+            payload: Webhook payload holding the subscriber
+            tag_id: ID of the tag for tag events
+            form_id: ID of the form for form events
+
+        Returns:
+            True if the event was applied, False if it was not understood
+        """
+        self.live = True
+        subscriber = payload.get("subscriber") or {}
+        subscriber_id = subscriber.get("id")
+        if not subscriber_id:
+            logger.warning("Ignoring %s webhook without a subscriber", event)
+            return False
+
+        if event in SUBSCRIBER_STATE_EVENTS:
+            state = SUBSCRIBER_STATE_EVENTS[event]
+            previous = self.upsert_subscriber({**subscriber, "state": state})
+            was_active = previous is not None and previous.get("state") == "active"
+            if state == "active" and not was_active:
+                self.adjust_count(1)
+            elif state != "active" and (was_active or previous is None):
+                self.adjust_count(-1)
+        elif event == "subscriber.tag_add" and tag_id is not None:
+            self.upsert_subscriber(subscriber)
+            self.add_tag_member(tag_id, subscriber_id)
+        elif event == "subscriber.tag_remove" and tag_id is not None:
+            self.upsert_subscriber(subscriber)
+            self.tag_members.get(int(tag_id), set()).discard(int(subscriber_id))
+        elif event == "subscriber.form_subscribe" and form_id is not None:
+            self.upsert_subscriber(subscriber)
+            self.form_members.setdefault(int(form_id), set()).add(int(subscriber_id))
+        else:
+            logger.warning("Ignoring unsupported webhook event: %s", event)
+            return False
+
+        self.events += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get mirror statistics.
+
+        Returns:
+            Number of mirrored subscribers and tag memberships, the mirrored count, events applied and lookups served
+        """
+        return {
+            "live": self.live,
+            "synced_at": self.synced_at,
+            "subscribers": len(self.subscribers),
+            "tag_memberships": sum(len(members) for members in self.tag_members.values()),
+            "active_count": self.active_count,
+            "events": self.events,
+            "hits": self.hits
+        }
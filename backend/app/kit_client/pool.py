@@ -0,0 +1,314 @@
+"""
+Kit.com API client registry for the MCP server.
+This module provides a registry of long-lived Kit.com API clients keyed by credential,
+so that requests reuse keep-alive connections instead of opening a new client per message.
+"""
+
+from typing import AsyncIterator, Dict, Optional, Tuple
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import time
+import httpx
+from pydantic import BaseModel
+
+from .api import KitClient, KitClientConfig
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+class KitClientPoolConfig(BaseModel):
+    """Configuration for the Kit.com API client registry."""
+    base_url: str = "https://api.kit.com/v4"
+    timeout: float = 30.0
+    http2: bool = True
+    max_clients: int = 256
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    idle_timeout: float = 600.0
+    sweep_interval: float = 60.0
+    subscriber_index: bool = False
+    index_sync_interval: float = 300.0
+
+# Per-client counters that stats() keeps summing after the client is evicted.
+CLIENT_COUNTERS = ("throttled", "retries", "rate_limited", "cache_hits", "cache_misses")
+
+def _client_counters(client: KitClient) -> Dict[str, int]:
+    """Get the running totals of a client, keyed as in CLIENT_COUNTERS."""
+    return {
+        "throttled": client.rate_limiter.throttled,
+        "retries": client.retries,
+        "rate_limited": client.rate_limited,
+        "cache_hits": client.cache.hits,
+        "cache_misses": client.cache.misses
+    }
+
+class _PooledClient:
+    """A registry entry holding a shared client and its usage bookkeeping."""
+
+    __slots__ = ("client", "http_client", "leases", "last_used")
+
+    def __init__(self, client: KitClient, http_client: httpx.AsyncClient):
+        self.client = client
+        self.http_client = http_client
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+    async def close(self) -> None:
+        """Stop the client's background work and close its HTTP client."""
+        await self.client.close()
+        await self.http_client.aclose()
+
+class KitClientRegistry:
+    """Registry of long-lived Kit.com API clients keyed by API key or access token."""
+
+    def __init__(self, config: Optional[KitClientPoolConfig] = None):
+        """
+        Initialize the Kit.com API client registry.
+
+        Args:
+            config: Configuration for the registry
+        """
+        self.config = config or KitClientPoolConfig()
+        self._clients: "OrderedDict[str, _PooledClient]" = OrderedDict()
+        self._sweeper: Optional[asyncio.Task] = None
+        self._closed = False
+        self.evictions = 0
+        # Totals of clients that have left the registry, so stats() never goes backwards.
+        self._retired: Dict[str, int] = dict.fromkeys(CLIENT_COUNTERS, 0)
+
+        if self.config.http2 and not HTTP2_AVAILABLE:
+            logger.info("HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1")
+
+        logger.info("KitClientRegistry initialized with max_clients=%s", self.config.max_clients)
+
+    @staticmethod
+    def _credential_key(api_key: Optional[str], access_token: Optional[str]) -> str:
+        """
+        Build the registry key for a credential without keeping the raw secret as a key.
+
+        Args:
+            api_key: Kit.com API key
+            access_token: Kit.com OAuth access token
+
+        Returns:
+            Registry key
+        """
+        if api_key:
+            kind, secret = "api_key", api_key
+        else:
+            kind, secret = "access_token", access_token or ""
+        return f"{kind}:{hashlib.sha256(secret.encode()).hexdigest()}"
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """
+        Build an HTTP client with a bounded keep-alive connection pool.
+
+        Returns:
+            HTTP client
+        """
+        limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry
+        )
+        return httpx.AsyncClient(
+            timeout=self.config.timeout,
+            limits=limits,
+            http2=self.config.http2 and HTTP2_AVAILABLE
+        )
+
+    def get(self, api_key: Optional[str] = None, access_token: Optional[str] = None) -> KitClient:
+        """
+        Get the shared client for a credential, creating it if needed.
+
+        Callers that hold the client across awaits should prefer `lease`, which
+        protects the client from idle eviction while it is in use.
+
+        Args:
+            api_key: Kit.com API key
+            access_token: Kit.com OAuth access token
+
+        Returns:
+            Shared Kit.com API client
+        """
+        if self._closed:
+            raise RuntimeError("KitClientRegistry is closed")
+
+        key = self._credential_key(api_key, access_token)
+        entry = self._clients.get(key)
+
+        if entry is None:
+            config = KitClientConfig(api_key=api_key, access_token=access_token, base_url=self.config.base_url)
+            http_client = self._build_http_client()
+            entry = _PooledClient(KitClient(config, client=http_client), http_client)
+            if self.config.subscriber_index:
+                entry.client.start_index_sync(self.config.index_sync_interval)
+            self._clients[key] = entry
+            self._evict_overflow(keep=key)
+        else:
+            self._clients.move_to_end(key)
+
+        entry.last_used = time.monotonic()
+        return entry.client
+
+    @asynccontextmanager
+    async def lease(self, api_key: Optional[str] = None,
+                    access_token: Optional[str] = None) -> AsyncIterator[KitClient]:
+        """
+        Lease the shared client for a credential for the duration of a block.
+
+        Args:
+            api_key: Kit.com API key
+            access_token: Kit.com OAuth access token
+
+        Yields:
+            Shared Kit.com API client
+        """
+        client = self.get(api_key=api_key, access_token=access_token)
+        entry = self._clients[self._credential_key(api_key, access_token)]
+        entry.leases += 1
+        try:
+            yield client
+        finally:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+
+    def _retire(self, key: str) -> _PooledClient:
+        """
+        Remove a client from the registry, keeping its counters in the registry totals.
+
+        Args:
+            key: Registry key of the client
+
+        Returns:
+            Removed entry, still to be closed by the caller
+        """
+        entry = self._clients.pop(key)
+        for name, value in _client_counters(entry.client).items():
+            self._retired[name] += value
+        return entry
+
+    def _evict_overflow(self, keep: str) -> None:
+        """
+        Evict least recently used idle clients while the registry is over capacity.
+
+        Args:
+            keep: Registry key that must not be evicted
+        """
+        if len(self._clients) <= self.config.max_clients:
+            return
+
+        for key in list(self._clients.keys()):
+            if len(self._clients) <= self.config.max_clients:
+                break
+            entry = self._clients[key]
+            if entry.leases == 0 and key != keep and not entry.client.mirroring:
+                self._retire(key)
+                self.evictions += 1
+                asyncio.ensure_future(entry.close())
+
+        if len(self._clients) > self.config.max_clients:
+            logger.warning("KitClientRegistry over capacity with %s clients in use", len(self._clients))
+
+    async def evict_idle(self) -> int:
+        """
+        Close clients that have not been used within the idle timeout.
+
+        Clients that keep a subscriber index synced are kept, since rebuilding
+        the index after the next request would relist the whole account; they
+        only leave the registry through overflow eviction or `close`. Clients
+        whose account mirror is fed by webhooks are never evicted: webhook
+        events are routed to them by account ID, and a new client would start
+        with an empty mirror that no longer receives events.
+
+        Returns:
+            Number of clients evicted
+        """
+        cutoff = time.monotonic() - self.config.idle_timeout
+        expired: Tuple[Tuple[str, _PooledClient], ...] = tuple(
+            (key, entry) for key, entry in self._clients.items()
+            if entry.leases == 0 and entry.last_used < cutoff
+            and not entry.client.index_syncing and not entry.client.mirroring
+        )
+
+        for key, entry in expired:
+            self._retire(key)
+            await entry.close()
+
+        if expired:
+            self.evictions += len(expired)
+            logger.info("Evicted %s idle Kit.com API clients", len(expired))
+        return len(expired)
+
+    async def _sweep(self) -> None:
+        """Periodically evict idle clients."""
+        while True:
+            await asyncio.sleep(self.config.sweep_interval)
+            try:
+                await self.evict_idle()
+            except Exception as e:
+                logger.error("Error evicting idle Kit.com API clients: %s", e)
+
+    def start(self) -> None:
+        """Start the background idle-eviction task."""
+        if self._sweeper is None:
+            self._closed = False
+            self._sweeper = asyncio.create_task(self._sweep())
+
+    async def close(self) -> None:
+        """Stop the idle-eviction task and close every client."""
+        self._closed = True
+
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+        entries = [self._retire(key) for key in list(self._clients)]
+        await asyncio.gather(*(entry.close() for entry in entries), return_exceptions=True)
+        logger.info("KitClientRegistry closed %s clients", len(entries))
+
+    def find(self, account_id: str) -> Optional[KitClient]:
+        """
+        Find a live client by account ID without creating one.
+
+        Args:
+            account_id: Account ID of the client, see KitClient.account_id
+
+        Returns:
+            Shared Kit.com API client, or None if no live client has that account ID
+        """
+        for entry in self._clients.values():
+            if entry.client.account_id == account_id:
+                return entry.client
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get registry statistics.
+
+        Returns:
+            Number of live clients, leased clients, evictions and current queue depth, plus throttling,
+            retry and response cache totals that include evicted clients
+        """
+        entries = list(self._clients.values())
+        totals = dict(self._retired)
+        for entry in entries:
+            for name, value in _client_counters(entry.client).items():
+                totals[name] += value
+        return {
+            "clients": len(entries),
+            "leased": sum(1 for entry in entries if entry.leases),
+            "evictions": self.evictions,
+            "queue_depth": sum(entry.client.rate_limiter.queue_depth for entry in entries),
+            **totals
+        }
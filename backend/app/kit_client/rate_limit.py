@@ -0,0 +1,130 @@
+"""
+Rate limiting for the Kit.com API client.
+This module provides a rolling-window rate limiter shared by every coroutine using a credential.
+"""
+
+from typing import Deque, Dict, Optional
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+API_KEY_RATE_LIMIT = 120
+ACCESS_TOKEN_RATE_LIMIT = 600
+RATE_LIMIT_PERIOD = 60.0
+
+class RollingWindowRateLimiter:
+    """Rate limiter allowing at most `max_requests` over any rolling `period` seconds."""
+
+    def __init__(self, max_requests: int, period: float = RATE_LIMIT_PERIOD):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            max_requests: Maximum number of requests in the rolling window
+            period: Length of the rolling window in seconds
+        """
+        self.max_requests = max_requests
+        self.period = period
+        self._sent: Deque[float] = deque()
+        self._lock = asyncio.Lock()
+        self._blocked_until = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.requests = 0
+        self.throttled = 0
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent without exceeding the limit, then record it."""
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    while self._sent and now - self._sent[0] >= self.period:
+                        self._sent.popleft()
+
+                    wait = self._blocked_until - now
+                    if len(self._sent) >= self.max_requests:
+                        wait = max(wait, self._sent[0] + self.period - now)
+
+                    if wait <= 0:
+                        break
+
+                    self.throttled += 1
+                    await asyncio.sleep(wait)
+
+                self._sent.append(now)
+                self.requests += 1
+        finally:
+            self.queue_depth -= 1
+
+    def defer(self, seconds: float) -> None:
+        """
+        Hold back every caller for a period, e.g. after the API returns Retry-After.
+
+        Args:
+            seconds: Number of seconds to wait before sending the next request
+        """
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get rate limiter statistics.
+
+        Returns:
+            Current and peak queue depth, requests sent and number of throttling waits
+        """
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "throttled": self.throttled
+        }
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Number of seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """
+    Compute a jittered exponential backoff delay.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base: Delay of the first retry in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Number of seconds to wait
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
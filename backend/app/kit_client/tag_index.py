@@ -0,0 +1,143 @@
+"""
+Tag index for the Kit.com API client.
+This module provides a per-account cache mapping tag names to tag IDs.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+if TYPE_CHECKING:
+    from .api import KitClient
+
+logger = logging.getLogger(__name__)
+
+def normalize_tag_name(name: str) -> str:
+    """
+    Normalize a tag name for lookups.
+
+    Args:
+        name: Tag name
+
+    Returns:
+        Case-folded tag name with surrounding and repeated whitespace removed
+    """
+    return " ".join(str(name).split()).casefold()
+
+class TagIndex:
+    """Per-account index of tag names to tag IDs."""
+
+    def __init__(self, kit_client: "KitClient", ttl: float = 300.0):
+        """
+        Initialize the tag index.
+
+        Args:
+            kit_client: Kit.com API client for the account
+            ttl: Number of seconds an entry is trusted before it is re-resolved
+        """
+        self.kit_client = kit_client
+        self.ttl = ttl
+        self._tags: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        self._pending: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a tag by name without making any requests.
+
+        Args:
+            name: Tag name
+
+        Returns:
+            Tag object, or None if the tag is unknown or its entry has expired
+        """
+        entry = self._tags.get(normalize_tag_name(name))
+        if entry is None or time.monotonic() - entry[1] > self.ttl:
+            return None
+        return entry[0]
+
+    def add(self, tag: Dict[str, Any]) -> None:
+        """
+        Add or refresh a single tag in the index.
+
+        Args:
+            tag: Tag object with id and name
+        """
+        if tag.get("id") and tag.get("name"):
+            self._tags[normalize_tag_name(tag["name"])] = (tag, time.monotonic())
+
+    def replace(self, tags: List[Dict[str, Any]]) -> None:
+        """
+        Replace the index with a complete tag list.
+
+        Args:
+            tags: Every tag in the account
+        """
+        now = time.monotonic()
+        self._tags = {
+            normalize_tag_name(tag["name"]): (tag, now)
+            for tag in tags if tag.get("id") and tag.get("name")
+        }
+
+    def discard(self, name: str) -> None:
+        """
+        Forget a tag, e.g. after the API reports it no longer exists.
+
+        Args:
+            name: Tag name
+        """
+        self._tags.pop(normalize_tag_name(name), None)
+
+    async def resolve(self, name: str) -> Dict[str, Any]:
+        """
+        Get a tag by name, creating it if it does not exist.
+
+        Kit.com returns the existing tag when creating a tag whose name is
+        already taken, so a miss costs a single request. Concurrent misses for
+        the same name share that request.
+
+        Args:
+            name: Tag name
+
+        Returns:
+            Tag object
+        """
+        tag = self.lookup(name)
+        if tag is not None:
+            self.hits += 1
+            return tag
+
+        self.misses += 1
+        key = normalize_tag_name(name)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        # The request runs in its own task, so cancelling the caller that
+        # started it does not fail the others waiting for the same tag.
+        pending = asyncio.create_task(self.kit_client.create_tag(name))
+        self._pending[key] = pending
+        pending.add_done_callback(lambda task: self._created(key, task))
+        return await asyncio.shield(pending)
+
+    def _created(self, key: str, task: "asyncio.Task[Dict[str, Any]]") -> None:
+        """Forget a finished tag creation, retrieving its error in case every caller was cancelled."""
+        if self._pending.get(key) is task:
+            del self._pending[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get tag index statistics.
+
+        Returns:
+            Number of indexed tags, hits and misses
+        """
+        return {
+            "tags": len(self._tags),
+            "hits": self.hits,
+            "misses": self.misses
+        }
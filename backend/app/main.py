@@ -6,23 +6,104 @@ This module provides the main FastAPI application with API endpoints and WebSock
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from collections import deque
 import os
 import logging
 import json
 import uuid
-from typing import Dict, Any, List, Optional
+import asyncio
+from typing import Deque, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
-from .kit_client.api import KitClient, KitClientConfig
-from .intent_service.claude import ClaudeIntentService
+from .kit_client.pool import KitClientPoolConfig, KitClientRegistry
+from .intent_service.claude import ClaudeIntentService, PromptCacheStats
+from .intent_service.pool import ClaudeClientRegistry
+from .intent_service.router import LocalIntentRouter
+from .intent_service.semantic_cache import SemanticCache
 from .conversation.manager import ConversationManager
+from .conversation.storage import create_conversation_store
 from .mcp_server.server import KitMCPServer
-from .api import status
+from .api import metrics, status, webhooks
+from .api.credentials import kit_credentials, kit_credentials_from_headers
+from .telemetry.logs import configure_logging, parse_sample_rates
+from .telemetry.tracing import configure_tracing, shutdown_tracing
 
-logging.basicConfig(level=logging.INFO)
+configure_logging(
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    json_format=os.getenv("LOG_FORMAT", "json").lower() == "json",
+    sample_rates=parse_sample_rates(os.getenv("LOG_SAMPLE_RATES")),
+    max_length=int(os.getenv("LOG_MAX_LENGTH", "2000"))
+)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Kit.com MCP Server")
+conversation_manager = ConversationManager(
+    store=create_conversation_store(
+        os.getenv("CONVERSATION_STORE_URL"),
+        max_conversations=int(os.getenv("CONVERSATION_MAX_COUNT", "10000")) or None,
+        max_bytes=int(os.getenv("CONVERSATION_MAX_BYTES", str(256 * 1024 * 1024))) or None
+    ),
+    ttl=float(os.getenv("CONVERSATION_TTL", "3600"))
+)
+
+kit_client_registry = KitClientRegistry(KitClientPoolConfig(
+    base_url=os.getenv("KIT_API_BASE_URL", "https://api.kit.com/v4"),
+    subscriber_index=os.getenv("SUBSCRIBER_INDEX", "").lower() in ("1", "true", "yes"),
+    index_sync_interval=float(os.getenv("SUBSCRIBER_INDEX_SYNC_INTERVAL", "300"))
+))
+
+claude_client_registry = ClaudeClientRegistry()
+
+intent_router = LocalIntentRouter()
+
+prompt_cache_stats = PromptCacheStats()
+
+semantic_cache = SemanticCache(
+    max_entries=int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "2048")),
+    ttl=float(os.getenv("SEMANTIC_CACHE_TTL", "86400")),
+    threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85")),
+    path=os.getenv("SEMANTIC_CACHE_PATH") or None
+) if os.getenv("SEMANTIC_CACHE", "true").lower() in ("1", "true", "yes") else None
+
+llm_formatting = os.getenv("LLM_RESPONSE_FORMATTING", "").lower() in ("1", "true", "yes")
+
+intent_tool_use = os.getenv("INTENT_TOOL_USE", "true").lower() in ("1", "true", "yes")
+
+context_token_budget = int(os.getenv("PROMPT_CONTEXT_TOKENS", "1000"))
+
+ws_max_concurrency = int(os.getenv("WS_MAX_CONCURRENCY", "4"))
+
+ws_max_pending = int(os.getenv("WS_MAX_PENDING", "16"))
+
+# Results Kit.com posted for enqueued bulk requests, oldest first.
+bulk_results: Deque[Dict[str, Any]] = deque(maxlen=100)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop shared resources with the application."""
+    app.state.kit_client_registry = kit_client_registry
+    app.state.claude_client_registry = claude_client_registry
+    app.state.intent_router = intent_router
+    app.state.prompt_cache_stats = prompt_cache_stats
+    app.state.semantic_cache = semantic_cache
+    app.state.conversation_manager = conversation_manager
+    app.state.bulk_results = bulk_results
+    configure_tracing(os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"))
+    await conversation_manager.open()
+    if semantic_cache is not None:
+        await asyncio.to_thread(semantic_cache.load)
+    kit_client_registry.start()
+    try:
+        yield
+    finally:
+        await kit_client_registry.close()
+        await claude_client_registry.close()
+        await conversation_manager.close()
+        if semantic_cache is not None:
+            await asyncio.to_thread(semantic_cache.save)
+        shutdown_tracing()
+
+app = FastAPI(title="Kit.com MCP Server", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -33,8 +114,8 @@ app.add_middleware(
 )
 
 app.include_router(status.router)
-
-conversation_manager = ConversationManager()
+app.include_router(webhooks.router)
+app.include_router(metrics.router)
 
 websocket_connections = {}
 
@@ -53,87 +134,139 @@ async def chat(request: Request):
         message = data.get("message", "")
         conversation_id = data.get("conversation_id")
         
-        kit_api_key = request.headers.get("X-Kit-API-Key") or os.getenv("KIT_API_KEY", "")
+        kit_credential = kit_credentials_from_headers(request.headers)
         claude_api_key = request.headers.get("X-Claude-API-Key") or os.getenv("CLAUDE_API_KEY", "")
         
-        if not kit_api_key:
-            raise HTTPException(status_code=400, detail="Kit.com API key is required")
+        if not any(kit_credential.values()):
+            raise HTTPException(status_code=400, detail="Kit.com API key or access token is required")
         
         if not claude_api_key:
             raise HTTPException(status_code=400, detail="Claude API key is required")
         
-        kit_client = KitClient(KitClientConfig(api_key=kit_api_key))
-        intent_service = ClaudeIntentService(api_key=claude_api_key)
-        mcp_server = KitMCPServer(kit_client, intent_service, conversation_manager)
-        
-        result = await mcp_server.process_message(message, conversation_id)
-        
-        await kit_client.close()
+        async with claude_client_registry.lease(claude_api_key) as claude_client, \
+                kit_client_registry.lease(**kit_credential) as kit_client:
+            intent_service = ClaudeIntentService(api_key=claude_api_key, client=claude_client,
+                                                  router=intent_router, llm_formatting=llm_formatting,
+                                                  context_token_budget=context_token_budget,
+                                                  cache_stats=prompt_cache_stats, tool_use=intent_tool_use,
+                                                  response_cache=semantic_cache)
+            mcp_server = KitMCPServer(kit_client, intent_service, conversation_manager)
+            result = await mcp_server.process_message(message, conversation_id)
         
         return result
     except Exception as e:
-        logger.error(f"Error processing chat message: {str(e)}")
+        logger.error("Error processing chat message: %s", e)
         raise HTTPException(status_code=500, detail=f"Error processing message: {str(e)}")
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """
     WebSocket endpoint for real-time chat.
+
+    Each incoming frame is processed as its own task, up to WS_MAX_CONCURRENCY at a
+    time per connection; frames for the same conversation are processed in order.
+    Once WS_MAX_PENDING frames are in flight the socket is not read until one
+    finishes. Every frame sent back echoes the "request_id" of the message it
+    answers (one is generated if the client did not send it).
+
+    Messages carry a Kit.com "kit_api_key" or, for the bulk endpoints, an OAuth
+    "kit_access_token", plus a "claude_api_key".
+
+    Unless a message sets "stream" to false, progress events (intent, tool_started,
+    tool_finished) and response text deltas are sent as they happen, followed by
+    a final frame of type "complete" carrying the full response.
     """
     await websocket.accept()
     connection_id = str(uuid.uuid4())
     websocket_connections[connection_id] = websocket
     
+    send_lock = asyncio.Lock()
+    running = asyncio.Semaphore(ws_max_concurrency)
+    pending = asyncio.Semaphore(ws_max_pending)
+    conversation_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+    tasks: Set[asyncio.Task] = set()
+    
+    async def send(frame: Dict[str, Any], request_id: Optional[str]) -> None:
+        frame["request_id"] = request_id
+        frame["timestamp"] = datetime.now().isoformat()
+        async with send_lock:
+            await websocket.send_json(frame)
+    
+    async def process(message_data: Dict[str, Any], request_id: str) -> None:
+        message = message_data.get("message", "")
+        conversation_id = message_data.get("conversation_id")
+        kit_credential = kit_credentials(message_data.get("kit_api_key"), message_data.get("kit_access_token"),
+                                         environment=False)
+        claude_api_key = message_data.get("claude_api_key", "")
+        
+        if not any(kit_credential.values()):
+            await send({"error": "Kit.com API key or access token is required"}, request_id)
+            return
+        
+        if not claude_api_key:
+            await send({"error": "Claude API key is required"}, request_id)
+            return
+        
+        async def send_event(event: Dict[str, Any]) -> None:
+            await send(event, request_id)
+        
+        lock_key = conversation_id or request_id
+        conversation_lock, users = conversation_locks.get(lock_key) or (asyncio.Lock(), 0)
+        conversation_locks[lock_key] = (conversation_lock, users + 1)
+        
+        try:
+            async with conversation_lock, running:
+                async with claude_client_registry.lease(claude_api_key) as claude_client, \
+                        kit_client_registry.lease(**kit_credential) as kit_client:
+                    intent_service = ClaudeIntentService(api_key=claude_api_key, client=claude_client,
+                                                          router=intent_router, llm_formatting=llm_formatting,
+                                                          context_token_budget=context_token_budget,
+                                                          cache_stats=prompt_cache_stats, tool_use=intent_tool_use,
+                                                          response_cache=semantic_cache)
+                    mcp_server = KitMCPServer(kit_client, intent_service, conversation_manager)
+                    on_event = send_event if message_data.get("stream", True) else None
+                    result = await mcp_server.process_message(message, conversation_id, on_event=on_event)
+        finally:
+            conversation_lock, users = conversation_locks[lock_key]
+            if users == 1:
+                del conversation_locks[lock_key]
+            else:
+                conversation_locks[lock_key] = (conversation_lock, users - 1)
+        
+        result["type"] = "complete"
+        await send(result, request_id)
+    
+    async def handle(data: str) -> None:
+        request_id = None
+        try:
+            message_data = json.loads(data)
+            request_id = str(message_data.get("request_id") or uuid.uuid4())
+            await process(message_data, request_id)
+        except json.JSONDecodeError:
+            await send({"error": "Invalid JSON"}, request_id)
+        except Exception as e:
+            logger.error("Error processing WebSocket message: %s", e)
+            await send({"error": f"Error processing message: {str(e)}"}, request_id)
+        finally:
+            pending.release()
+    
     try:
         while True:
-            data = await websocket.receive_text()
+            await pending.acquire()
             try:
-                message_data = json.loads(data)
-                message = message_data.get("message", "")
-                conversation_id = message_data.get("conversation_id")
-                kit_api_key = message_data.get("kit_api_key", "")
-                claude_api_key = message_data.get("claude_api_key", "")
-                
-                if not kit_api_key:
-                    await websocket.send_json({
-                        "error": "Kit.com API key is required",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    continue
-                
-                if not claude_api_key:
-                    await websocket.send_json({
-                        "error": "Claude API key is required",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    continue
-                
-                kit_client = KitClient(KitClientConfig(api_key=kit_api_key))
-                intent_service = ClaudeIntentService(api_key=claude_api_key)
-                mcp_server = KitMCPServer(kit_client, intent_service, conversation_manager)
-                
-                result = await mcp_server.process_message(message, conversation_id)
-                
-                await kit_client.close()
-                
-                result["timestamp"] = datetime.now().isoformat()
-                
-                await websocket.send_json(result)
-            except json.JSONDecodeError:
-                await websocket.send_json({
-                    "error": "Invalid JSON",
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.error(f"Error processing WebSocket message: {str(e)}")
-                await websocket.send_json({
-                    "error": f"Error processing message: {str(e)}",
-                    "timestamp": datetime.now().isoformat()
-                })
+                data = await websocket.receive_text()
+            except BaseException:
+                pending.release()
+                raise
+            task = asyncio.create_task(handle(data))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
     except WebSocketDisconnect:
-        if connection_id in websocket_connections:
-            del websocket_connections[connection_id]
+        pass
     except Exception as e:
-        logger.error(f"WebSocket error: {str(e)}")
-        if connection_id in websocket_connections:
-            del websocket_connections[connection_id]
+        logger.error("WebSocket error: %s", e)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        websocket_connections.pop(connection_id, None)
@@ -0,0 +1,149 @@
+"""
+Multi-step tool plans for the MCP server.
+This module turns the tool calls of an intent into a dependency graph and runs independent steps concurrently.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+MAX_PLAN_STEPS = 10
+
+# Tools that change the account. Steps without explicit dependencies are
+# ordered after earlier writes, and writes after earlier steps of other tools.
+WRITE_TOOLS = {
+    "create_tag",
+    "tag_subscriber",
+    "create_subscriber",
+    "create_form",
+    "bulk_create_subscribers",
+    "bulk_tag_subscribers",
+    "bulk_add_subscribers_to_form",
+}
+
+StepRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+def _infer_dependencies(step: Dict[str, Any], earlier: List[Dict[str, Any]]) -> List[str]:
+    """
+    Infer the dependencies of a step from the order the steps were given in.
+
+    Reads wait for earlier writes so they see their effect. Writes also wait
+    for earlier reads and writes of other tools, but not for calls of the same
+    tool, which are independent of each other (e.g. tagging several people).
+
+    Args:
+        step: Step to infer dependencies for
+        earlier: Steps given before it
+
+    Returns:
+        IDs of the steps it depends on
+    """
+    if step["tool"] in WRITE_TOOLS:
+        return [other["id"] for other in earlier if other["tool"] != step["tool"]]
+    return [other["id"] for other in earlier if other["tool"] in WRITE_TOOLS]
+
+def build_plan(intent_result: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the steps of a plan from intent information.
+
+    Intents either name a single tool or list steps, each with an id, a tool,
+    parameters and optionally the ids of the steps it depends on. Steps may
+    only depend on steps listed before them, which keeps the graph acyclic;
+    a step naming any other dependency gets an error and is not run.
+
+    Args:
+        intent_result: Intent information
+
+    Returns:
+        Steps with unique id, tool, parameters and depends_on (and error if rejected), in the order given
+    """
+    raw_steps = intent_result.get("steps")
+    if not isinstance(raw_steps, list) or not raw_steps:
+        tool = intent_result.get("tool")
+        if not tool:
+            return []
+        return [{"id": "1", "tool": tool, "parameters": intent_result.get("parameters") or {}, "depends_on": []}]
+
+    if len(raw_steps) > MAX_PLAN_STEPS:
+        logger.warning("Plan has %s steps, running the first %s", len(raw_steps), MAX_PLAN_STEPS)
+
+    raw_steps = [raw_step for raw_step in raw_steps[:MAX_PLAN_STEPS]
+                 if isinstance(raw_step, dict) and raw_step.get("tool")]
+    raw_ids = {str(raw_step["id"]) for raw_step in raw_steps if raw_step.get("id")}
+
+    steps: List[Dict[str, Any]] = []
+    # Step IDs as given by Claude, mapped to the unique IDs of the earlier steps;
+    # a duplicated ID refers to the first step that used it.
+    known: Dict[str, str] = {}
+    used = set()
+    fallback = 1
+    for index, raw_step in enumerate(raw_steps):
+        raw_id = str(raw_step.get("id") or index + 1)
+        step_id = raw_id
+        while step_id in used:
+            while str(fallback) in used or str(fallback) in raw_ids:
+                fallback += 1
+            step_id = str(fallback)
+        used.add(step_id)
+        step = {
+            "id": step_id,
+            "tool": raw_step["tool"],
+            "parameters": raw_step.get("parameters") or {},
+        }
+
+        depends_on = raw_step.get("depends_on")
+        if isinstance(depends_on, list):
+            step["depends_on"] = [known[str(dependency)] for dependency in depends_on if str(dependency) in known]
+            unknown = [str(dependency) for dependency in depends_on if str(dependency) not in known]
+            if unknown:
+                step["error"] = f"depends on unknown step {', '.join(unknown)}"
+        else:
+            step["depends_on"] = _infer_dependencies(step, steps)
+        steps.append(step)
+        known.setdefault(raw_id, step_id)
+
+    return steps
+
+async def run_plan(steps: List[Dict[str, Any]], run_step: StepRunner, max_concurrency: int = 4) -> List[Dict[str, Any]]:
+    """
+    Run the steps of a plan, each as soon as the steps it depends on have finished.
+
+    A step rejected by build_plan, or whose dependency failed, is skipped rather than run.
+
+    Args:
+        steps: Steps from build_plan
+        run_step: Coroutine function running one step and returning its result
+        max_concurrency: Maximum number of steps running at once
+
+    Returns:
+        Outcome of each step in plan order: id, tool, parameters and either result or error
+        (with skipped set if the step did not run)
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    tasks: Dict[str, "asyncio.Task[Dict[str, Any]]"] = {}
+
+    async def run(step: Dict[str, Any]) -> Dict[str, Any]:
+        outcome = {"id": step["id"], "tool": step["tool"], "parameters": step["parameters"]}
+        if "error" in step:
+            outcome["error"] = step["error"]
+            outcome["skipped"] = True
+            return outcome
+        for dependency in step["depends_on"]:
+            if "result" not in await tasks[dependency]:
+                outcome["error"] = f"step {dependency} did not complete"
+                outcome["skipped"] = True
+                return outcome
+
+        async with semaphore:
+            try:
+                outcome["result"] = await run_step(step)
+            except Exception as e:
+                outcome["error"] = str(e)
+        return outcome
+
+    for step in steps:
+        tasks[step["id"]] = asyncio.create_task(run(step))
+
+    return list(await asyncio.gather(*tasks.values()))
@@ -0,0 +1,131 @@
+"""
+Tool schemas for the MCP server.
+This module generates Claude tool-use schemas from the signatures and docstrings of tool handlers.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Union, get_args, get_origin, get_type_hints
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Handler parameters supplied by the server rather than by the user.
+INTERNAL_PARAMETERS = {"self", "on_delta"}
+
+JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+}
+
+def _parse_docstring(docstring: Optional[str]) -> Dict[str, Any]:
+    """
+    Parse a Google-style docstring into a summary and argument descriptions.
+
+    Args:
+        docstring: Docstring to parse
+
+    Returns:
+        Summary under "summary" and a mapping of argument name to description under "args"
+    """
+    lines = inspect.cleandoc(docstring or "").splitlines()
+    summary = []
+    args: Dict[str, str] = {}
+    section = "summary"
+
+    for line in lines:
+        stripped = line.strip()
+        if stripped.endswith(":") and stripped[:-1] in ("Args", "Returns", "Raises", "Yields"):
+            section = stripped[:-1]
+            continue
+        if section == "summary":
+            if not stripped and summary:
+                section = "description"
+            elif stripped:
+                summary.append(stripped)
+        elif section == "Args" and stripped:
+            name, _, description = stripped.partition(":")
+            if description and line.startswith("    ") and not line.startswith("        "):
+                args[name.strip()] = description.strip()
+            elif args:
+                last = next(reversed(args))
+                args[last] = f"{args[last]} {stripped}"
+
+    return {"summary": " ".join(summary), "args": args}
+
+def _json_schema(annotation: Any) -> Dict[str, Any]:
+    """
+    Convert a type annotation to a JSON schema.
+
+    Args:
+        annotation: Type annotation
+
+    Returns:
+        JSON schema; unions prefer their list member so lists of values are typed as arrays
+    """
+    origin = get_origin(annotation)
+
+    if origin is Union:
+        members = [member for member in get_args(annotation) if member is not type(None)]
+        lists = [member for member in members if get_origin(member) in (list, List)]
+        return _json_schema(lists[0] if lists else members[0])
+
+    if origin in (list, List):
+        items = get_args(annotation)
+        return {"type": "array", "items": _json_schema(items[0]) if items else {}}
+
+    if origin in (dict, Dict) or annotation is dict:
+        return {"type": "object"}
+
+    if annotation in JSON_TYPES:
+        return {"type": JSON_TYPES[annotation]}
+
+    return {}
+
+def build_tool_schema(name: str, handler: Callable[..., Any]) -> Dict[str, Any]:
+    """
+    Build the tool-use schema of a tool handler.
+
+    Args:
+        name: Tool name
+        handler: Coroutine function implementing the tool
+
+    Returns:
+        Tool definition with name, description and input_schema
+    """
+    docstring = _parse_docstring(inspect.getdoc(handler))
+    hints = get_type_hints(handler)
+    properties: Dict[str, Any] = {}
+    required = []
+
+    for parameter in inspect.signature(handler).parameters.values():
+        if parameter.name in INTERNAL_PARAMETERS or parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+            continue
+
+        schema = _json_schema(hints.get(parameter.name, Any))
+        if parameter.name in docstring["args"]:
+            schema["description"] = docstring["args"][parameter.name]
+        if parameter.default is parameter.empty:
+            required.append(parameter.name)
+        elif parameter.default is not None:
+            schema["default"] = parameter.default
+        properties[parameter.name] = schema
+
+    return {
+        "name": name,
+        "description": docstring["summary"] or name.replace("_", " "),
+        "input_schema": {"type": "object", "properties": properties, "required": required}
+    }
+
+def build_tool_schemas(tool_map: Dict[str, Callable[..., Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the tool-use schemas of every tool handler.
+
+    Args:
+        tool_map: Mapping of tool name to handler
+
+    Returns:
+        Tool definitions in tool_map order
+    """
+    return [build_tool_schema(name, handler) for name, handler in tool_map.items()]
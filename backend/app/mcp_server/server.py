@@ -3,22 +3,77 @@ Kit.com MCP Server for integrating Kit.com API with Claude API.
 This module provides a server for handling MCP requests and responses.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
+import asyncio
 import logging
 import json
 import os
+import re
+import time
+import httpx
 from fastapi import HTTPException
 
 from ..kit_client.api import KitClient
+from ..kit_client.tag_index import normalize_tag_name
 from ..intent_service.claude import ClaudeIntentService
 from ..conversation.manager import ConversationManager
+from .plan import build_plan, run_plan
+from .schemas import build_tool_schemas
+from ..telemetry.metrics import STAGE_SECONDS
+from ..telemetry.tracing import span
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+BULK_FAILURE_SAMPLE = 20
+
+EventCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Tools whose result is generated text that is streamed as it is produced.
+STREAMING_TOOLS = {"explain_concept"}
+
+def _parse_emails(emails: Union[str, List[str]]) -> List[str]:
+    """
+    Normalize a list of email addresses, accepting comma or whitespace separated strings.
+
+    Args:
+        emails: Email addresses
+
+    Returns:
+        Unique, lowercased email addresses in input order
+    """
+    if isinstance(emails, str):
+        emails = re.split(r"[\s,;]+", emails)
+
+    parsed = []
+    seen = set()
+    for email in emails:
+        email = str(email).strip().lower()
+        if "@" in email and email not in seen:
+            seen.add(email)
+            parsed.append(email)
+    return parsed
+
+def _parse_names(names: Union[str, List[str], None]) -> List[str]:
+    """
+    Normalize a list of names, accepting a comma separated string.
+
+    Args:
+        names: Names
+
+    Returns:
+        Non-empty names with surrounding whitespace removed
+    """
+    if not names:
+        return []
+    if isinstance(names, str):
+        names = names.split(",")
+    return [str(name).strip() for name in names if str(name).strip()]
+
 class KitMCPServer:
     """Server for handling MCP requests and responses."""
 
+    _tool_schemas: Optional[List[Dict[str, Any]]] = None
+
     def __init__(self, kit_client: KitClient, intent_service: ClaudeIntentService, 
                 conversation_manager: ConversationManager):
         """
@@ -32,43 +87,89 @@ class KitMCPServer:
         self.kit_client = kit_client
         self.intent_service = intent_service
         self.conversation_manager = conversation_manager
-        logger.info("KitMCPServer initialized successfully")
+        self.bulk_callback_url = os.getenv("KIT_BULK_CALLBACK_URL") or None
+        self.plan_concurrency = int(os.getenv("PLAN_MAX_CONCURRENCY", "4"))
+        logger.debug("KitMCPServer initialized successfully")
 
-    async def process_message(self, message: str, conversation_id: Optional[str] = None) -> Dict[str, Any]:
+    async def process_message(self, message: str, conversation_id: Optional[str] = None,
+                              on_event: Optional[EventCallback] = None) -> Dict[str, Any]:
         """
         Process a message and return a response.
 
         Args:
             message: User's message
             conversation_id: Conversation ID
+            on_event: Coroutine function called with progress events (intent, tool_started,
+                tool_finished) and response text deltas while the message is processed
+
+        Messages asking for several things are answered with a plan of tool
+        calls; independent steps run concurrently and the results are
+        formatted as one response. The time spent in each stage is recorded
+        in the mcp_stage_duration_seconds histogram.
 
         Returns:
             Response information
         """
-        if not conversation_id:
-            conversation_id = self.conversation_manager.create_conversation()
-
-        context = self.conversation_manager.get_context(conversation_id)
-
-        intent_result = await self.intent_service.determine_intent(message, context)
-        self.conversation_manager.update_context(conversation_id, message, intent_result)
-
-        if intent_result.get("needs_clarification"):
-            response = intent_result.get("clarification_question")
-        else:
-            tool_name = intent_result.get("tool")
-            tool_params = intent_result.get("parameters", {})
-
-            response = await self._execute_tool(tool_name, tool_params, context)
-
-        self.conversation_manager.add_response(conversation_id, response)
+        started = time.perf_counter()
+        tool_label = ""
+        with span("mcp.process_message") as current:
+            try:
+                with STAGE_SECONDS.time(stage="conversation", tool=""):
+                    if not conversation_id:
+                        conversation_id = await self.conversation_manager.create_conversation()
+                    context = await self.conversation_manager.get_context(conversation_id)
+
+                with STAGE_SECONDS.time(stage="intent", tool=""), span("mcp.intent"):
+                    intent_result = await self.intent_service.determine_intent(message, context,
+                                                                               tools=self.tool_schemas())
+                with STAGE_SECONDS.time(stage="conversation", tool=""):
+                    await self.conversation_manager.update_context(conversation_id, message, intent_result)
+                plan = [] if intent_result.get("needs_clarification") else build_plan(intent_result)
+
+                if on_event is not None:
+                    event = {
+                        "type": "intent",
+                        "conversation_id": conversation_id,
+                        "tool": intent_result.get("tool"),
+                        "parameters": intent_result.get("parameters", {}),
+                        "needs_clarification": bool(intent_result.get("needs_clarification")),
+                        "source": intent_result.get("source", "claude")
+                    }
+                    if len(plan) > 1:
+                        event["steps"] = plan
+                    await on_event(event)
+
+                if intent_result.get("needs_clarification"):
+                    tool_label = "clarification"
+                    response = intent_result.get("clarification_question")
+                    if on_event is not None:
+                        await on_event({"type": "delta", "text": response})
+                elif len(plan) > 1:
+                    tool_label = "plan"
+                    response = await self._execute_plan(plan, context, on_event)
+                else:
+                    tool_name = plan[0]["tool"] if plan else intent_result.get("tool")
+                    tool_params = plan[0]["parameters"] if plan else intent_result.get("parameters", {})
+                    # The name comes from the model, so only known tools get their own metric label.
+                    tool_label = tool_name if tool_name in self._tool_map() else "unknown"
+
+                    response = await self._execute_tool(tool_name, tool_params, context, on_event)
+
+                with STAGE_SECONDS.time(stage="conversation", tool=""):
+                    await self.conversation_manager.add_response(conversation_id, response)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - started, stage="total", tool=tool_label)
+                if current is not None:
+                    current.set_attribute("mcp.tool", tool_label)
 
         return {
             "response": response,
-            "conversation_id": conversation_id
+            "conversation_id": conversation_id,
+            "needs_clarification": bool(intent_result.get("needs_clarification"))
         }
 
-    async def _execute_tool(self, tool_name: str, tool_params: Dict[str, Any], context: Dict[str, Any]) -> str:
+    async def _execute_tool(self, tool_name: str, tool_params: Dict[str, Any], context: Dict[str, Any],
+                            on_event: Optional[EventCallback] = None) -> str:
         """
         Execute a tool and return a response.
 
@@ -76,11 +177,115 @@ class KitMCPServer:
             tool_name: Name of the tool to execute
             tool_params: Parameters for the tool
             context: Conversation context
+            on_event: Coroutine function called with tool progress events and response text deltas
 
         Returns:
             Response from the tool
         """
-        tool_map = {
+        on_delta = None
+        if on_event is not None:
+            async def on_delta(text: str) -> None:
+                await on_event({"type": "delta", "text": text})
+
+        tool_map = self._tool_map()
+
+        if tool_name not in tool_map:
+            with STAGE_SECONDS.time(stage="format", tool="unknown"):
+                return await self.intent_service.generate_response(
+                    f"I don't know how to {str(tool_name).replace('_', ' ')}.", context, on_delta=on_delta
+                )
+
+        if on_event is not None:
+            await on_event({"type": "tool_started", "tool": tool_name})
+        started = time.perf_counter()
+
+        try:
+            with STAGE_SECONDS.time(stage="tool", tool=tool_name), span("mcp.tool", {"mcp.tool": tool_name}):
+                if tool_name in STREAMING_TOOLS:
+                    result = await tool_map[tool_name](**tool_params, on_delta=on_delta)
+                else:
+                    result = await tool_map[tool_name](**tool_params)
+        except Exception as e:
+            logger.error("Error executing tool %s: %s", tool_name, e)
+            response = f"I'm sorry, I encountered an error while trying to {tool_name.replace('_', ' ')}. Error: {str(e)}"
+            if on_event is not None:
+                await on_event({"type": "tool_finished", "tool": tool_name, "error": str(e),
+                                "duration_ms": round((time.perf_counter() - started) * 1000, 1)})
+                await on_event({"type": "delta", "text": response})
+            return response
+
+        if on_event is not None:
+            await on_event({"type": "tool_finished", "tool": tool_name,
+                            "duration_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+        if tool_name in STREAMING_TOOLS:
+            return result
+
+        with STAGE_SECONDS.time(stage="format", tool=tool_name), span("mcp.format", {"mcp.tool": tool_name}):
+            return await self.intent_service.format_response(tool_name, result, context, on_delta=on_delta)
+
+    async def _execute_plan(self, plan: List[Dict[str, Any]], context: Dict[str, Any],
+                            on_event: Optional[EventCallback] = None) -> str:
+        """
+        Execute the steps of a plan and return one response for all of them.
+
+        Kit.com requests made by concurrent steps share the client's rate limiter.
+
+        Args:
+            plan: Steps from build_plan
+            context: Conversation context
+            on_event: Coroutine function called with tool progress events and response text deltas
+
+        Returns:
+            Response covering every step
+        """
+        tool_map = self._tool_map()
+
+        async def run_step(step: Dict[str, Any]) -> Any:
+            tool_name = step["tool"]
+            if tool_name not in tool_map:
+                raise ValueError(f"I don't know how to {str(tool_name).replace('_', ' ')}")
+
+            if on_event is not None:
+                await on_event({"type": "tool_started", "tool": tool_name, "step": step["id"]})
+            started = time.perf_counter()
+            try:
+                with STAGE_SECONDS.time(stage="tool", tool=tool_name), span("mcp.tool", {"mcp.tool": tool_name}):
+                    result = await tool_map[tool_name](**step["parameters"])
+            except Exception as e:
+                logger.error("Error executing tool %s in plan step %s: %s", tool_name, step["id"], e)
+                if on_event is not None:
+                    await on_event({"type": "tool_finished", "tool": tool_name, "step": step["id"], "error": str(e),
+                                    "duration_ms": round((time.perf_counter() - started) * 1000, 1)})
+                raise
+
+            if on_event is not None:
+                await on_event({"type": "tool_finished", "tool": tool_name, "step": step["id"],
+                                "duration_ms": round((time.perf_counter() - started) * 1000, 1)})
+            return result
+
+        started = time.perf_counter()
+        outcomes = await run_plan(plan, run_step, self.plan_concurrency)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info("Executed plan of %s steps in %.1f ms", len(plan), elapsed_ms,
+                    extra={"steps": len(plan), "duration_ms": round(elapsed_ms, 1)})
+
+        on_delta = None
+        if on_event is not None:
+            async def on_delta(text: str) -> None:
+                await on_event({"type": "delta", "text": text})
+
+        with STAGE_SECONDS.time(stage="format", tool="plan"), span("mcp.format", {"mcp.tool": "plan"}):
+            return await self.intent_service.format_plan_response(outcomes, context, on_delta=on_delta)
+
+    def _tool_map(self) -> Dict[str, Callable[..., Awaitable[Any]]]:
+        """
+        Map tool names to their handlers.
+
+        Returns:
+            Mapping of tool name to coroutine function
+        """
+        return {
             "get_tags": self.kit_client.get_tags,
             "count_tags": self._count_tags,
             "create_tag": self.kit_client.create_tag,
@@ -91,20 +296,24 @@ class KitMCPServer:
             "create_subscriber": self._create_subscriber,
             "get_forms": self.kit_client.get_forms,
             "create_form": self.kit_client.create_form,
+            "bulk_create_subscribers": self._bulk_create_subscribers,
+            "bulk_tag_subscribers": self._bulk_tag_subscribers,
+            "bulk_add_subscribers_to_form": self._bulk_add_subscribers_to_form,
+            "filter_subscribers_by_tag": self._filter_subscribers_by_tag,
+            "segment_subscribers": self._segment_subscribers,
             "explain_concept": self._explain_concept
         }
 
-        if tool_name not in tool_map:
-            return await self.intent_service.generate_response(
-                f"I don't know how to {tool_name.replace('_', ' ')}.", context
-            )
+    def tool_schemas(self) -> List[Dict[str, Any]]:
+        """
+        Get the tool-use schemas of every tool, generated from the handler signatures.
 
-        try:
-            result = await tool_map[tool_name](**tool_params)
-            return await self.intent_service.format_response(tool_name, result, context)
-        except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {str(e)}")
-            return f"I'm sorry, I encountered an error while trying to {tool_name.replace('_', ' ')}. Error: {str(e)}"
+        Returns:
+            Tool definitions for the Claude API
+        """
+        if KitMCPServer._tool_schemas is None:
+            KitMCPServer._tool_schemas = build_tool_schemas(self._tool_map())
+        return KitMCPServer._tool_schemas
 
     async def _count_tags(self) -> int:
         """
@@ -127,22 +336,356 @@ class KitMCPServer:
         Returns:
             Result of the tagging operation
         """
-        tags = await self.kit_client.get_tags()
-        tag_id = None
+        tag_id = await self._resolve_tag_id(tag_name)
 
-        for tag in tags:
-            if tag.get("name") == tag_name:
-                tag_id = tag.get("id")
-                break
+        try:
+            return await self.kit_client.tag_subscriber_by_email(email, tag_id)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 404:
+                raise
+            # The indexed tag may have been deleted in Kit.com since it was cached.
+            self.kit_client.tag_index.discard(tag_name)
+            tag_id = await self._resolve_tag_id(tag_name)
+            return await self.kit_client.tag_subscriber_by_email(email, tag_id)
+
+    async def _resolve_tag_id(self, tag_name: str) -> str:
+        """
+        Find the ID of a tag by name, creating the tag if it does not exist.
 
-        if not tag_id:
-            new_tag = await self.kit_client.create_tag(tag_name)
-            tag_id = new_tag.get("id")
+        Args:
+            tag_name: Name of the tag
+
+        Returns:
+            ID of the tag
+        """
+        tag = await self.kit_client.tag_index.resolve(tag_name)
+        tag_id = tag.get("id")
 
         if not tag_id:
             raise HTTPException(status_code=404, detail=f"Tag '{tag_name}' not found and could not be created")
 
-        return await self.kit_client.tag_subscriber_by_email(email, tag_id)
+        return tag_id
+
+    async def _resolve_form_id(self, form_name: str) -> str:
+        """
+        Find the ID of a form by name or ID.
+
+        Args:
+            form_name: Name or ID of the form
+
+        Returns:
+            ID of the form
+        """
+        forms = await self.kit_client.get_forms()
+
+        for form in forms:
+            if form.get("name") == form_name or str(form.get("id")) == str(form_name):
+                return form.get("id")
+
+        raise HTTPException(status_code=404, detail=f"Form '{form_name}' not found")
+
+    async def _upsert_subscriber_ids(self, emails: List[str]) -> Dict[str, Any]:
+        """
+        Create or update subscribers in bulk and map their email addresses to IDs.
+
+        Args:
+            emails: Email addresses
+
+        Returns:
+            Mapping of email address to subscriber ID under "ids", plus failures
+        """
+        result = await self.kit_client.bulk_create_subscribers([{"email_address": email} for email in emails])
+        ids = {
+            subscriber.get("email_address", "").lower(): subscriber.get("id")
+            for subscriber in result["subscribers"]
+        }
+        return {"ids": ids, "failures": result["failures"]}
+
+    async def _existing_subscriber_ids(self, emails: List[str]) -> Dict[str, Any]:
+        """
+        Look up existing subscribers and map their email addresses to IDs, without creating any.
+
+        Args:
+            emails: Email addresses
+
+        Returns:
+            Mapping of email address to subscriber ID under "ids", plus failures for unknown addresses
+        """
+        subscribers = await asyncio.gather(*(self.kit_client.get_subscriber_by_email(email) for email in emails),
+                                           return_exceptions=True)
+        ids = {}
+        failures = []
+        for email, subscriber in zip(emails, subscribers):
+            if isinstance(subscriber, Exception):
+                failures.append({"email_address": email, "errors": [str(subscriber)]})
+            elif subscriber.get("id"):
+                ids[email.lower()] = subscriber["id"]
+            else:
+                failures.append({"email_address": email, "errors": ["No subscriber with this email address"]})
+        return {"ids": ids, "failures": failures}
+
+    async def _fan_out(self, operation: Callable[[str], Awaitable[Any]], emails: List[str]) -> Dict[str, Any]:
+        """
+        Run a per-subscriber operation for each email address concurrently.
+
+        Used when the bulk endpoints are unavailable; the Kit.com rate limiter
+        queues the individual requests.
+
+        Args:
+            operation: Coroutine function taking an email address
+            emails: Email addresses
+
+        Returns:
+            Processed subscribers and failures in the bulk endpoint response shape
+        """
+        results = await asyncio.gather(*(operation(email) for email in emails), return_exceptions=True)
+        result = {"subscribers": [], "failures": [], "enqueued": 0}
+
+        for email, outcome in zip(emails, results):
+            if isinstance(outcome, Exception):
+                result["failures"].append({"email_address": email, "errors": [str(outcome)]})
+            else:
+                result["subscribers"].append(outcome)
+        return result
+
+    def _summarize_bulk(self, requested: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Summarize a bulk operation without echoing every processed subscriber.
+
+        Args:
+            requested: Number of subscribers requested
+            result: Merged bulk operation result
+
+        Returns:
+            Counts, a sample of failures, and a note on how the operation was processed
+        """
+        failures = result.get("failures", [])
+        summary = {
+            "requested": requested,
+            "succeeded": len(result.get("subscribers", [])),
+            "enqueued": result.get("enqueued", 0),
+            "failed": len(failures),
+            "failures": failures[:BULK_FAILURE_SAMPLE]
+        }
+        if not self.kit_client.supports_bulk:
+            summary["note"] = ("Kit.com bulk endpoints require an OAuth access token, "
+                               "so each subscriber was sent as its own request.")
+        elif summary["enqueued"]:
+            summary["note"] = ("Kit.com posts the results of queued subscribers to KIT_BULK_CALLBACK_URL; "
+                               "they are listed at /api/status/kit-bulk.")
+        return summary
+
+    async def _bulk_create_subscribers(self, emails: Union[str, List[str]]) -> Dict[str, Any]:
+        """
+        Create many subscribers at once.
+
+        Args:
+            emails: Email addresses of the subscribers
+
+        Returns:
+            Summary of the bulk operation
+        """
+        emails = _parse_emails(emails)
+
+        if self.kit_client.supports_bulk:
+            result = await self.kit_client.bulk_create_subscribers(
+                [{"email_address": email} for email in emails], callback_url=self.bulk_callback_url
+            )
+        else:
+            result = await self._fan_out(self.kit_client.create_subscriber, emails)
+
+        return self._summarize_bulk(len(emails), result)
+
+    async def _bulk_tag_subscribers(self, emails: Union[str, List[str]], tag_name: str,
+                                    create_missing: bool = False) -> Dict[str, Any]:
+        """
+        Tag many subscribers with a specific tag at once.
+
+        Args:
+            emails: Email addresses of the subscribers
+            tag_name: Name of the tag
+            create_missing: Create subscribers for addresses that are not subscribed yet; only set when
+                the user asks for it, otherwise unknown addresses are reported as failures
+
+        Returns:
+            Summary of the bulk operation
+        """
+        emails = _parse_emails(emails)
+        tag_id = await self._resolve_tag_id(tag_name)
+
+        if not self.kit_client.supports_bulk:
+            async def tag(email: str) -> Dict[str, Any]:
+                if create_missing:
+                    await self.kit_client.create_subscriber(email)
+                return await self.kit_client.tag_subscriber_by_email(email, tag_id)
+
+            result = await self._fan_out(tag, emails)
+            return self._summarize_bulk(len(emails), result)
+
+        if create_missing:
+            upserted = await self._upsert_subscriber_ids(emails)
+        else:
+            upserted = await self._existing_subscriber_ids(emails)
+        taggings = [
+            {"tag_id": tag_id, "subscriber_id": subscriber_id}
+            for subscriber_id in upserted["ids"].values()
+        ]
+        result = await self.kit_client.bulk_tag_subscribers(taggings, callback_url=self.bulk_callback_url)
+        result["failures"] = upserted["failures"] + result["failures"]
+        return self._summarize_bulk(len(emails), result)
+
+    async def _bulk_add_subscribers_to_form(self, emails: Union[str, List[str]], form_name: str,
+                                            create_missing: bool = False) -> Dict[str, Any]:
+        """
+        Add many subscribers to a form at once.
+
+        Args:
+            emails: Email addresses of the subscribers
+            form_name: Name or ID of the form
+            create_missing: Create subscribers for addresses that are not subscribed yet; only set when
+                the user asks for it, otherwise unknown addresses are reported as failures
+
+        Returns:
+            Summary of the bulk operation
+        """
+        emails = _parse_emails(emails)
+        form_id = await self._resolve_form_id(form_name)
+
+        if not self.kit_client.supports_bulk:
+            async def add(email: str) -> Dict[str, Any]:
+                if create_missing:
+                    await self.kit_client.create_subscriber(email)
+                return await self.kit_client.add_subscriber_to_form_by_email(email, form_id)
+
+            result = await self._fan_out(add, emails)
+            return self._summarize_bulk(len(emails), result)
+
+        if create_missing:
+            upserted = await self._upsert_subscriber_ids(emails)
+        else:
+            upserted = await self._existing_subscriber_ids(emails)
+        additions = [
+            {"form_id": form_id, "subscriber_id": subscriber_id}
+            for subscriber_id in upserted["ids"].values()
+        ]
+        result = await self.kit_client.bulk_add_subscribers_to_forms(additions, callback_url=self.bulk_callback_url)
+        result["failures"] = upserted["failures"] + result["failures"]
+        return self._summarize_bulk(len(emails), result)
+
+    async def _find_tag_id(self, tag_name: str) -> int:
+        """
+        Find the ID of an existing tag by name, without creating it.
+
+        Args:
+            tag_name: Name of the tag
+
+        Returns:
+            ID of the tag
+        """
+        tag = self.kit_client.tag_index.lookup(tag_name)
+        if tag is None:
+            key = normalize_tag_name(tag_name)
+            tag = next((tag for tag in await self.kit_client.get_tags() if normalize_tag_name(tag["name"]) == key), None)
+
+        if tag is None:
+            raise HTTPException(status_code=404, detail=f"Tag '{tag_name}' not found")
+        return int(tag["id"])
+
+    async def _tag_member_ids(self, tag_id: int) -> Set[int]:
+        """Get the IDs of every subscriber with a tag from the API."""
+        return {int(subscriber["id"]) async for subscriber in self.kit_client.iter_tag_subscribers(tag_id, status="all")}
+
+    async def _filter_subscribers_by_tag(self, emails: Union[str, List[str]], tag_name: str) -> Dict[str, Any]:
+        """
+        Check which of the given subscribers have a specific tag.
+
+        Args:
+            emails: Email addresses of the subscribers
+            tag_name: Name of the tag
+
+        Returns:
+            Email addresses with the tag, without it, and not found in the subscriber index
+        """
+        emails = _parse_emails(emails)
+        tag_id = await self._find_tag_id(tag_name)
+        mirror = self.kit_client.mirror
+
+        if mirror.indexed:
+            ids = {email: mirror.emails.get(email) for email in emails}
+            tagged = mirror.tagged([subscriber_id for subscriber_id in ids.values() if subscriber_id], tag_id)
+            return {
+                "tag": tag_name,
+                "with_tag": [email for email, subscriber_id in ids.items() if subscriber_id in tagged],
+                "without_tag": [email for email, subscriber_id in ids.items() if subscriber_id and subscriber_id not in tagged],
+                "unknown": [email for email, subscriber_id in ids.items() if not subscriber_id],
+                "source": "index"
+            }
+
+        wanted = set(emails)
+        tagged_emails = set()
+        async for subscriber in self.kit_client.iter_tag_subscribers(tag_id, per_page=1000, status="all"):
+            email = str(subscriber.get("email_address") or "").lower()
+            if email in wanted:
+                tagged_emails.add(email)
+                if len(tagged_emails) == len(wanted):
+                    break
+
+        return {
+            "tag": tag_name,
+            "with_tag": [email for email in emails if email in tagged_emails],
+            "without_tag": [email for email in emails if email not in tagged_emails],
+            "unknown": [],
+            "source": "api"
+        }
+
+    async def _segment_subscribers(self, tag_names: Union[str, List[str]],
+                                   exclude_tag_names: Optional[Union[str, List[str]]] = None,
+                                   limit: int = 10) -> Dict[str, Any]:
+        """
+        Find the active subscribers that have every one of some tags and none of others.
+
+        Args:
+            tag_names: Names of the tags subscribers must have
+            exclude_tag_names: Names of the tags subscribers must not have
+            limit: Maximum number of matching subscribers to list
+
+        Returns:
+            Number of matching subscribers and up to `limit` of them
+        """
+        tag_names = _parse_names(tag_names)
+        exclude_tag_names = _parse_names(exclude_tag_names)
+        tag_ids = list(await asyncio.gather(*(self._find_tag_id(name) for name in tag_names)))
+        exclude_tag_ids = list(await asyncio.gather(*(self._find_tag_id(name) for name in exclude_tag_names)))
+        mirror = self.kit_client.mirror
+        limit = int(limit)
+
+        if mirror.indexed:
+            matches = mirror.segment(tag_ids, exclude_tag_ids)
+            subscribers = [mirror.subscribers[subscriber_id] for subscriber_id in sorted(matches, reverse=True)[:limit]]
+            source = "index"
+        else:
+            if not tag_ids:
+                raise HTTPException(status_code=400, detail="At least one tag is required unless the subscriber index is enabled")
+
+            required = await asyncio.gather(*(self._tag_member_ids(tag_id) for tag_id in tag_ids[1:]))
+            excluded = await asyncio.gather(*(self._tag_member_ids(tag_id) for tag_id in exclude_tag_ids))
+            matching = []
+            async for subscriber in self.kit_client.iter_tag_subscribers(tag_ids[0], per_page=1000, status="active"):
+                subscriber_id = int(subscriber["id"])
+                if all(subscriber_id in members for members in required) and \
+                        not any(subscriber_id in members for members in excluded):
+                    matching.append(subscriber)
+            matches = matching
+            subscribers = matching[:limit]
+            source = "api"
+
+        return {
+            "tags": tag_names,
+            "exclude_tags": exclude_tag_names,
+            "count": len(matches),
+            "subscribers": subscribers,
+            "source": source
+        }
 
     async def _count_subscribers(self) -> int:
         """
@@ -153,10 +696,10 @@ class KitMCPServer:
         """
         try:
             count = await self.kit_client.count_subscribers()
-            logger.info(f"Subscriber count: {count}")
+            logger.debug("Subscriber count: %s", count)
             return count
         except Exception as e:
-            logger.error(f"Error counting subscribers: {str(e)}")
+            logger.error("Error counting subscribers: %s", e)
             raise
 
     async def _create_subscriber(self, email: str, first_name: Optional[str] = None) -> Dict[str, Any]:
@@ -171,20 +714,20 @@ class KitMCPServer:
             Created subscriber object
         """
         try:
-            logger.info(f"Creating subscriber with email: {email}, first_name: {first_name}")
             result = await self.kit_client.create_subscriber(email, first_name)
-            logger.info(f"Subscriber creation result: {result}")
+            logger.info("Created subscriber %s", result.get("id"))
             return result
         except Exception as e:
-            logger.error(f"Error creating subscriber: {str(e)}")
+            logger.error("Error creating subscriber: %s", e)
             raise
 
-    async def _explain_concept(self, concept: str) -> str:
+    async def _explain_concept(self, concept: str, on_delta: Optional[Callable[[str], Awaitable[None]]] = None) -> str:
         """
         Explain a Kit.com concept.
 
         Args:
             concept: Concept to explain
+            on_delta: Coroutine function called with each text delta as it is generated
 
         Returns:
             Explanation of the concept
@@ -203,4 +746,4 @@ class KitMCPServer:
         They can be scheduled or sent immediately.
         """
 
-        return await self.intent_service.explain_concept(concept, documentation)
+        return await self.intent_service.explain_concept(concept, documentation, on_delta=on_delta)
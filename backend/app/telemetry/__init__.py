@@ -0,0 +1,3 @@
+"""
+Telemetry package for the MCP server.
+"""
@@ -0,0 +1,218 @@
+"""
+Logging for the MCP server.
+This module hands log records to a background thread through a queue and writes them as JSON lines.
+"""
+
+from typing import Dict, Optional, TextIO
+from datetime import datetime, timezone
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+
+logger = logging.getLogger(__name__)
+
+# Longest message (and string field) written, in characters; the rest is cut off.
+DEFAULT_MAX_LENGTH = 2000
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+# Attributes every LogRecord has; anything else on a record was passed through `extra`.
+RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def truncate(text: str, max_length: int) -> str:
+    """
+    Cut off a string that is longer than max_length characters.
+
+    Args:
+        text: String to truncate
+        max_length: Maximum length kept
+
+    Returns:
+        The string, or its first max_length characters followed by the number of characters left out
+    """
+    if max_length <= 0 or len(text) <= max_length:
+        return text
+    return f"{text[:max_length]}... [{len(text) - max_length} more chars]"
+
+def parse_sample_rates(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parse per-logger sample rates.
+
+    Args:
+        value: Comma-separated logger=rate pairs, e.g. "app.conversation.manager=0.1,app.kit_client=0.5"
+
+    Returns:
+        Sample rate between 0 and 1 by logger name
+    """
+    rates = {}
+    for pair in (value or "").split(","):
+        name, _, rate = pair.partition("=")
+        if not name.strip() or not rate.strip():
+            continue
+        try:
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+        except ValueError:
+            logger.warning("Ignoring invalid log sample rate %r", pair)
+    return rates
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records of high-volume loggers.
+
+    A rate applies to the named logger and its children. Records at or above
+    `level` are always kept, so warnings and errors are never sampled away.
+    Kept records of a sampled logger carry their `sample_rate`.
+    """
+
+    def __init__(self, rates: Dict[str, float], level: int = logging.WARNING):
+        """
+        Initialize the filter.
+
+        Args:
+            rates: Sample rate between 0 and 1 by logger name
+            level: Records at or above this level are always kept
+        """
+        super().__init__()
+        self.rates = dict(rates)
+        self.level = level
+        self._resolved: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        """Get the sample rate of a logger, inherited from the closest configured ancestor."""
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.level:
+            return True
+        rate = self._rate(record.name)
+        if rate >= 1.0:
+            return True
+        if random.random() >= rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format a record as one JSON object with its `extra` fields.
+
+    Messages are truncated by the queue handler; long string fields are truncated here.
+    """
+
+    def __init__(self, max_length: int = DEFAULT_MAX_LENGTH):
+        """
+        Initialize the formatter.
+
+        Args:
+            max_length: Longest string field written
+        """
+        super().__init__()
+        self.max_length = max_length
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = truncate(value, self.max_length) if isinstance(value, str) else value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting and encoding to the listener thread."""
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_length: int):
+        super().__init__(log_queue)
+        self.max_length = max_length
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments into the message now, while they still hold their
+        # values at call time, but unlike the stdlib handler skip the formatter
+        # and the copy: timestamps, JSON and tracebacks are rendered by the
+        # listener thread, and the merged message reads the same to any other
+        # handler of the record.
+        record.msg = truncate(record.getMessage(), self.max_length)
+        record.args = None
+        return record
+
+def configure_logging(level: str = "INFO", json_format: bool = True, sample_rates: Optional[Dict[str, float]] = None,
+                      max_length: int = DEFAULT_MAX_LENGTH,
+                      stream: Optional[TextIO] = None) -> logging.handlers.QueueListener:
+    """
+    Route every log record through a queue to a background writer thread.
+
+    Logging a record on the event loop only builds the message and puts it on
+    the queue; formatting and the write to the stream happen on the listener
+    thread. Use %-style arguments (logger.info("x=%s", x)) rather than
+    f-strings so that disabled and sampled-out records are never formatted.
+    Replaces any handlers already on the root logger; safe to call again.
+
+    Args:
+        level: Root log level, e.g. "INFO"
+        json_format: Write JSON lines rather than plain text
+        sample_rates: Sample rate between 0 and 1 by logger name, for records below WARNING
+        max_length: Longest message written, in characters (0 for no limit)
+        stream: Stream written to, defaulting to stderr
+
+    Returns:
+        The started queue listener
+    """
+    global _listener
+
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter(max_length) if json_format else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue, max_length)
+    if sample_rates:
+        handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    # Neither format writes processName, so skip looking it up for every record.
+    logging.logMultiprocessing = False
+
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+    return _listener
+
+def shutdown_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,305 @@
+"""
+Metrics for the MCP server.
+This module provides counters, gauges and histograms rendered in the Prometheus text exposition format.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+import logging
+import math
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from a cache hit to a slow Claude completion.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Replace the IDs in an API path with a placeholder, keeping label cardinality bounded.
+
+    Args:
+        endpoint: API endpoint, e.g. /tags/123/subscribers
+
+    Returns:
+        Endpoint template, e.g. /tags/{id}/subscribers
+    """
+    return NUMERIC_SEGMENT.sub("/{id}", "/" + endpoint.lstrip("/"))
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Format label names and values as {name="value",...}."""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+def _format_value(value: float) -> str:
+    """Format a sample value."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    """Base class of labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        """Get the label values of a sample in labelnames order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self) -> Iterator[str]:
+        """Yield the sample lines of the metric."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """
+        Increase the count of a label set.
+
+        Args:
+            amount: Non-negative amount to add
+            **labels: Label values
+        """
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        """Get the count of a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        if not self.labelnames and not self._values:
+            yield f"{self.name} 0"
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Gauge(_Metric):
+    """Current value per label set, which can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        """
+        Set the value of a label set.
+
+        Args:
+            value: Current value
+            **labels: Label values
+        """
+        self._values[self._key(labels)] = float(value)
+
+    def value(self, **labels: object) -> float:
+        """Get the value of a label set."""
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        if not self.labelnames and not self._values:
+            yield f"{self.name} 0"
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+class Histogram(_Metric):
+    """Distribution of observed values per label set, in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """
+        Record an observation.
+
+        Args:
+            value: Observed value, e.g. a duration in seconds
+            **labels: Label values
+        """
+        key = self._key(labels)
+        # One count per bucket (non-cumulative), then the sum.
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0.0] * (len(self.buckets) + 1)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[index] += 1
+                break
+        state[-1] += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """
+        Observe the duration of a block in seconds, whether or not it raises.
+
+        Args:
+            **labels: Label values
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        """Get the number of observations of a label set."""
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state is not None else 0
+
+    def _samples(self) -> Iterator[str]:
+        for key, state in sorted(self._values.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(state[-1])}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together at /metrics.
+
+    Metrics are only updated from the event loop, so no locking is needed.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        """Register a metric, returning the existing one if the name is taken by the same kind."""
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} is already registered with a different definition")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format (version 0.0.4).
+
+        Returns:
+            Exposition text ending with a newline
+        """
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "mcp_stage_duration_seconds",
+    "Time spent in each stage of processing a chat message.",
+    ["stage", "tool"]
+)
+
+KIT_REQUEST_SECONDS = registry.histogram(
+    "kit_api_request_duration_seconds",
+    "Kit.com API request latency including retries, by endpoint template and final status.",
+    ["method", "endpoint", "status"]
+)
+
+KIT_RETRIES = registry.counter(
+    "kit_api_retries_total",
+    "Kit.com API requests retried, by the status that caused the retry.",
+    ["status"]
+)
+
+KIT_RATE_LIMITED = registry.counter(
+    "kit_api_rate_limited_total",
+    "Kit.com API responses with status 429."
+)
+
+KIT_CLIENTS = registry.gauge(
+    "kit_clients",
+    "Kit.com API clients currently pooled, one per API key or OAuth token."
+)
+
+KIT_QUEUE_DEPTH = registry.gauge(
+    "kit_api_queue_depth",
+    "Kit.com API requests waiting for the rate limiter, summed over pooled clients."
+)
+
+KIT_THROTTLED = registry.gauge(
+    "kit_api_throttled",
+    "Kit.com API requests the rate limiter held back, summed over pooled clients including evicted ones."
+)
+
+KIT_CLIENT_RETRIES = registry.gauge(
+    "kit_api_client_retries",
+    "Kit.com API requests retried, summed over pooled clients including evicted ones."
+)
+
+KIT_CACHE_REQUESTS = registry.counter(
+    "kit_cache_requests_total",
+    "Kit.com response cache lookups, by endpoint and result (hit, miss or coalesced).",
+    ["endpoint", "result"]
+)
+
+LLM_REQUEST_SECONDS = registry.histogram(
+    "llm_request_duration_seconds",
+    "Claude API request latency, by intent service operation and outcome.",
+    ["operation", "status"]
+)
+
+LLM_TOKENS = registry.counter(
+    "llm_tokens_total",
+    "Claude API tokens, by operation and type (input, output, cache_read or cache_write).",
+    ["operation", "type"]
+)
+
+SEMANTIC_CACHE_REQUESTS = registry.counter(
+    "semantic_cache_requests_total",
+    "Semantic response cache lookups, by kind (intent or explain) and result (hit, similar or miss).",
+    ["kind", "result"]
+)
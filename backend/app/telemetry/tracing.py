@@ -0,0 +1,90 @@
+"""
+Tracing for the MCP server.
+This module exports spans to an OpenTelemetry collector when the OpenTelemetry SDK is installed and configured.
+"""
+
+from typing import Any, Dict, Iterator, Optional
+from contextlib import contextmanager
+import importlib.util
+import logging
+
+logger = logging.getLogger(__name__)
+
+OTEL_AVAILABLE = (importlib.util.find_spec("opentelemetry") is not None
+                  and importlib.util.find_spec("opentelemetry.sdk") is not None)
+
+_tracer: Optional[Any] = None
+
+def configure_tracing(endpoint: Optional[str], service_name: str = "kit-mcp-server") -> bool:
+    """
+    Export spans over OTLP/HTTP to a collector.
+
+    Tracing stays disabled (and costs nothing) without an endpoint or when the
+    opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http packages are
+    not installed.
+
+    Args:
+        endpoint: OTLP/HTTP traces endpoint, e.g. http://localhost:4318/v1/traces
+        service_name: Service name reported with every span
+
+    Returns:
+        True if spans are exported
+    """
+    global _tracer
+
+    if not endpoint:
+        return False
+    if not OTEL_AVAILABLE:
+        logger.warning("OpenTelemetry endpoint configured but the 'opentelemetry-sdk' package is not installed; "
+                       "tracing is disabled")
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        logger.warning("OpenTelemetry OTLP exporter is not available, tracing is disabled: %s", e)
+        return False
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer(__name__)
+    logger.info("Exporting OpenTelemetry spans to %s", endpoint)
+    return True
+
+def shutdown_tracing() -> None:
+    """Flush and stop span export."""
+    global _tracer
+
+    if _tracer is None:
+        return
+    from opentelemetry import trace
+
+    provider = trace.get_tracer_provider()
+    if hasattr(provider, "shutdown"):
+        provider.shutdown()
+    _tracer = None
+
+@contextmanager
+def span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Any]]:
+    """
+    Record a span around a block, nested under the current span.
+
+    Args:
+        name: Span name, e.g. "kit.request"
+        attributes: Span attributes; None values are dropped
+
+    Yields:
+        The span, or None when tracing is disabled
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    attributes = {key: value for key, value in (attributes or {}).items() if value is not None}
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
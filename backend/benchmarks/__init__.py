@@ -0,0 +1,6 @@
+"""
+Load-test benchmarks for the MCP server.
+This package provides a local stand-in for the Kit.com v4 API, a stub Claude API and a load generator
+for /api/chat and /ws, so throughput can be measured without calling api.kit.com or Claude.
+Run `python -m benchmarks --help` from the backend directory.
+"""
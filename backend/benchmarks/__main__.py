@@ -0,0 +1,207 @@
+"""
+Command line entry point for the MCP server benchmarks.
+This module starts the stand-ins and the server, runs the load and prints the report.
+
+Usage, from the backend directory:
+
+    python -m benchmarks --transport http ws --concurrency 32 --requests 2000
+
+Without --url, the fake Kit.com API, the stub Claude API and the server are
+started as subprocesses on free local ports, with the server pointed at the
+stand-ins through KIT_API_BASE_URL and ANTHROPIC_BASE_URL. With --url, an
+already running server is driven instead.
+"""
+
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import time
+import httpx
+
+from app.telemetry.logs import configure_logging
+
+from .load import DEFAULT_MESSAGES, needs_claude, run_chat_load, run_ws_load
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+REPORT_COLUMNS = ["transport", "concurrency", "completed", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+
+def _free_port() -> int:
+    """Get a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def _wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    """Poll a URL until it answers, raising RuntimeError after timeout seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} did not start within {timeout:.0f}s")
+
+def start_servers(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Start the stand-ins and the server as subprocesses.
+
+    Args:
+        args: Parsed command line
+
+    Returns:
+        Server URL, stand-in stats URLs and the subprocesses
+    """
+    kit_port, claude_port, server_port = _free_port(), _free_port(), _free_port()
+    output = open(args.server_log, "a") if args.server_log else subprocess.DEVNULL
+
+    fakes = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.fakes",
+        "--kit-port", str(kit_port), "--claude-port", str(claude_port),
+        "--kit-latency", str(args.kit_latency), "--kit-429-rate", str(args.kit_429_rate),
+        "--claude-latency", str(args.claude_latency), "--subscribers", str(args.subscribers),
+        *(["--kit-rate-limit", str(args.kit_rate_limit)] if args.kit_rate_limit else []),
+    ], cwd=BACKEND_DIR, stdout=output, stderr=output)
+
+    env = {
+        **os.environ,
+        "KIT_API_BASE_URL": f"http://127.0.0.1:{kit_port}/v4",
+        "ANTHROPIC_BASE_URL": f"http://127.0.0.1:{claude_port}",
+        "CONVERSATION_STORE_URL": os.getenv("CONVERSATION_STORE_URL", "memory"),
+    }
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(server_port), "--log-level", "warning", "--no-access-log",
+    ], cwd=BACKEND_DIR, env=env, stdout=output, stderr=output)
+
+    processes = [fakes, server]
+    try:
+        _wait_until_ready(f"http://127.0.0.1:{kit_port}/_stats")
+        _wait_until_ready(f"http://127.0.0.1:{claude_port}/_stats")
+        _wait_until_ready(f"http://127.0.0.1:{server_port}/healthz")
+    except Exception:
+        stop_servers(processes)
+        raise
+
+    return {
+        "url": f"http://127.0.0.1:{server_port}",
+        "kit_stats": f"http://127.0.0.1:{kit_port}/_stats",
+        "claude_stats": f"http://127.0.0.1:{claude_port}/_stats",
+        "processes": processes
+    }
+
+def stop_servers(processes: List[subprocess.Popen]) -> None:
+    """Terminate the subprocesses started by start_servers."""
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def _print_table(reports: List[Dict[str, Any]]) -> None:
+    """Print the reports as an aligned table."""
+    rows = [REPORT_COLUMNS] + [[str(report.get(column, "")) for column in REPORT_COLUMNS] for report in reports]
+    widths = [max(len(row[index]) for row in rows) for index in range(len(REPORT_COLUMNS))]
+    for row in rows:
+        print("  ".join(value.rjust(width) for value, width in zip(row, widths)))
+    for report in reports:
+        if "first_event_p50_ms" in report:
+            print(f"{report['transport']}: first event p50 {report['first_event_p50_ms']} ms, "
+                  f"p95 {report['first_event_p95_ms']} ms")
+        for sample in report.get("error_samples", []):
+            print(f"{report['transport']} error: {sample}")
+
+async def run(args: argparse.Namespace, url: str) -> List[Dict[str, Any]]:
+    """
+    Run the load for every requested transport, one after the other.
+
+    Args:
+        args: Parsed command line
+        url: Base URL of the server
+
+    Returns:
+        One report per transport
+    """
+    messages = args.message or DEFAULT_MESSAGES
+    reports = []
+    for transport in args.transport:
+        options = {"requests": args.requests, "concurrency": args.concurrency, "messages": messages,
+                   "accounts": args.accounts or args.concurrency, "warmup": args.warmup, "timeout": args.timeout}
+        if transport == "http":
+            reports.append(await run_chat_load(url, **options))
+        else:
+            reports.append(await run_ws_load(url, stream=not args.no_stream, **options))
+    return reports
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse the command line, run the benchmark and print the report.
+
+    Args:
+        argv: Command line arguments, defaulting to sys.argv
+
+    Returns:
+        Exit status: 0 on success, 1 if any request failed or Claude was needed but never called
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Load-test /api/chat and /ws.")
+    parser.add_argument("--url", help="Drive an already running server instead of starting one")
+    parser.add_argument("--transport", nargs="+", choices=["http", "ws"], default=["http", "ws"])
+    parser.add_argument("--requests", type=int, default=500, help="Measured requests per transport")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent workers (connections for ws)")
+    parser.add_argument("--warmup", type=int, default=50, help="Unmeasured requests sent first")
+    parser.add_argument("--accounts", type=int, default=None,
+                        help="Distinct Kit.com API keys (default: one per worker)")
+    parser.add_argument("--message", action="append", help="Message to send (repeatable; default: a built-in mix)")
+    parser.add_argument("--no-stream", action="store_true", help="Ask /ws for the final frame only")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a request fails")
+    parser.add_argument("--kit-latency", type=float, default=0.05, help="Seconds every fake Kit.com request takes")
+    parser.add_argument("--kit-429-rate", type=float, default=0.0, help="Fraction of Kit.com requests answered with 429")
+    parser.add_argument("--kit-rate-limit", type=int, default=None, help="Fake Kit.com requests per key per minute")
+    parser.add_argument("--claude-latency", type=float, default=0.3, help="Seconds every stub Claude request takes")
+    parser.add_argument("--subscribers", type=int, default=2000, help="Subscribers generated per fake account")
+    parser.add_argument("--server-log", help="Append the output of the started servers to this file")
+    parser.add_argument("--json", dest="json_path", help="Also write the reports to this JSON file")
+    args = parser.parse_args(argv)
+    configure_logging(json_format=False)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app.intent_service.router").setLevel(logging.WARNING)
+
+    started = None if args.url else start_servers(args)
+    upstream: Dict[str, Any] = {}
+    try:
+        reports = asyncio.run(run(args, args.url or started["url"]))
+        if started is not None:
+            upstream = {name: httpx.get(started[f"{name}_stats"], timeout=5.0).json() for name in ("kit", "claude")}
+    finally:
+        if started is not None:
+            stop_servers(started["processes"])
+
+    _print_table(reports)
+    failed = any(report["errors"] for report in reports)
+    if upstream:
+        claude_requests = sum(upstream['claude'].values())
+        print(f"Kit.com requests: {upstream['kit'].get('requests', 0)} "
+              f"(429: {upstream['kit'].get('rate_limited', 0)}), "
+              f"Claude requests: {claude_requests}")
+        if claude_requests == 0 and needs_claude(args.message or DEFAULT_MESSAGES):
+            print("error: the stub Claude API received no requests although the messages need Claude")
+            failed = True
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"reports": reports, "upstream": upstream}, f, indent=2)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,382 @@
+"""
+Fake Kit.com v4 API for benchmarks.
+This module provides an in-memory stand-in for the Kit.com endpoints KitClient uses, with configurable
+latency, rate limiting and cursor pagination.
+"""
+
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+import asyncio
+import base64
+import logging
+import random
+import time
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+MAX_PER_PAGE = 1000
+
+DEFAULT_PER_PAGE = 500
+
+TAG_NAMES = ["VIP", "Churned", "Newsletter", "Customers", "Leads", "Webinar", "Beta", "Partners"]
+
+FORM_NAMES = ["Newsletter signup", "Lead magnet", "Webinar registration"]
+
+class FakeKitConfig(BaseModel):
+    """Configuration for the fake Kit.com API."""
+    latency: float = 0.05
+    jitter: float = 0.02
+    rate_limit: Optional[int] = None
+    rate_limit_period: float = 60.0
+    rate_limit_probability: float = 0.0
+    retry_after: int = 1
+    subscribers: int = 2000
+    tags: int = 20
+    forms: int = 3
+    seed: int = 42
+
+def _timestamp(value: datetime) -> str:
+    """Format a time the way Kit.com does."""
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _encode_cursor(offset: int) -> str:
+    """Encode a list offset as an opaque cursor."""
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    """Decode a cursor produced by _encode_cursor."""
+    if not cursor:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+def paginate(items: List[Dict[str, Any]], key: str, params: Dict[str, str],
+             total_count: bool = False) -> Dict[str, Any]:
+    """
+    Return one page of a list in the Kit.com cursor pagination format.
+
+    Args:
+        items: Every matching object
+        key: Response key holding the page
+        params: Query parameters with per_page and after
+        total_count: Include the total number of matching objects
+
+    Returns:
+        Response body with the page and pagination metadata
+    """
+    per_page = max(1, min(int(params.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE))
+    start = _decode_cursor(params.get("after"))
+    page = items[start:start + per_page]
+    end = start + len(page)
+    pagination: Dict[str, Any] = {
+        "has_previous_page": start > 0,
+        "has_next_page": end < len(items),
+        "start_cursor": _encode_cursor(start) if page else None,
+        "end_cursor": _encode_cursor(end) if page else None,
+        "per_page": per_page
+    }
+    if total_count:
+        pagination["total_count"] = len(items)
+    return {key: page, "pagination": pagination}
+
+class FakeKitAccount:
+    """In-memory Kit.com account with generated subscribers, tags and forms."""
+
+    def __init__(self, config: FakeKitConfig):
+        """
+        Generate the account.
+
+        Args:
+            config: Configuration for the fake API
+        """
+        generator = random.Random(config.seed)
+        now = datetime.now(timezone.utc)
+        self.subscribers: List[Dict[str, Any]] = []
+        self.emails: Dict[str, Dict[str, Any]] = {}
+        self.tags: List[Dict[str, Any]] = []
+        self.tag_members: Dict[int, Dict[int, str]] = {}
+        self.forms: List[Dict[str, Any]] = []
+        self.webhooks: List[Dict[str, Any]] = []
+        self._next_id = 1
+
+        for index in range(config.tags):
+            name = TAG_NAMES[index] if index < len(TAG_NAMES) else f"Tag {index + 1}"
+            self.create_tag(name)
+        for index in range(config.forms):
+            name = FORM_NAMES[index] if index < len(FORM_NAMES) else f"Form {index + 1}"
+            self.create_form(name)
+
+        for index in range(config.subscribers):
+            created_at = _timestamp(now - timedelta(minutes=config.subscribers - index))
+            subscriber = self.upsert_subscriber(f"user{index + 1}@example.com", created_at=created_at)[1]
+            if generator.random() < 0.1:
+                subscriber["state"] = "cancelled"
+            for tag in self.tags:
+                if generator.random() < 0.2:
+                    self.tag_members[tag["id"]][subscriber["id"]] = created_at
+
+    def new_id(self) -> int:
+        """Allocate an object ID."""
+        self._next_id += 1
+        return self._next_id
+
+    def create_tag(self, name: str) -> Dict[str, Any]:
+        """Create a tag, or return the existing one with the same name."""
+        for tag in self.tags:
+            if tag["name"].lower() == name.lower():
+                return tag
+        tag = {"id": self.new_id(), "name": name, "created_at": _timestamp(datetime.now(timezone.utc))}
+        self.tags.append(tag)
+        self.tag_members[tag["id"]] = {}
+        return tag
+
+    def create_form(self, name: str) -> Dict[str, Any]:
+        """Create a form."""
+        form = {"id": self.new_id(), "name": name, "type": "embed", "format": "inline",
+                "created_at": _timestamp(datetime.now(timezone.utc)), "archived": False}
+        self.forms.append(form)
+        return form
+
+    def upsert_subscriber(self, email: str, first_name: Optional[str] = None,
+                          created_at: Optional[str] = None) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Create or update a subscriber.
+
+        Returns:
+            Whether the subscriber was created, and the subscriber
+        """
+        email = email.strip().lower()
+        subscriber = self.emails.get(email)
+        if subscriber is not None:
+            if first_name:
+                subscriber["first_name"] = first_name
+            subscriber["updated_at"] = _timestamp(datetime.now(timezone.utc))
+            return False, subscriber
+
+        created_at = created_at or _timestamp(datetime.now(timezone.utc))
+        subscriber = {"id": self.new_id(), "first_name": first_name, "email_address": email, "state": "active",
+                      "created_at": created_at, "updated_at": created_at, "fields": {}}
+        self.subscribers.append(subscriber)
+        self.emails[email] = subscriber
+        return True, subscriber
+
+    def tag(self, tag_id: int, email: str) -> Dict[str, Any]:
+        """Tag a subscriber by email, creating the subscriber if needed."""
+        if tag_id not in self.tag_members:
+            raise HTTPException(status_code=404, detail="Tag not found")
+        subscriber = self.upsert_subscriber(email)[1]
+        tagged_at = _timestamp(datetime.now(timezone.utc))
+        self.tag_members[tag_id].setdefault(subscriber["id"], tagged_at)
+        return {**subscriber, "tagged_at": self.tag_members[tag_id][subscriber["id"]]}
+
+    def filter_subscribers(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Filter and sort subscribers by the query parameters of GET /subscribers."""
+        status = params.get("status", "active")
+        email = (params.get("email_address") or "").strip().lower()
+        if email:
+            subscriber = self.emails.get(email)
+            items = [subscriber] if subscriber is not None else []
+        else:
+            items = self.subscribers
+        if status != "all":
+            items = [subscriber for subscriber in items if subscriber["state"] == status]
+        for bound, field in (("created_after", "created_at"), ("updated_after", "updated_at")):
+            if params.get(bound):
+                items = [subscriber for subscriber in items if subscriber[field] > params[bound]]
+        if params.get("sort_order", "desc") == "desc":
+            items = list(reversed(items))
+        return items
+
+class _RateLimiter:
+    """Rolling-window request limit per credential, like the real API's."""
+
+    def __init__(self, limit: Optional[int], period: float):
+        self.limit = limit
+        self.period = period
+        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
+
+    def allow(self, credential: str) -> bool:
+        """Record a request and return whether it is within the limit."""
+        if self.limit is None:
+            return True
+        now = time.monotonic()
+        requests = self._requests[credential]
+        while requests and requests[0] <= now - self.period:
+            requests.popleft()
+        if len(requests) >= self.limit:
+            return False
+        requests.append(now)
+        return True
+
+def create_fake_kit_app(config: Optional[FakeKitConfig] = None) -> FastAPI:
+    """
+    Create the fake Kit.com v4 API.
+
+    Each API key or access token gets its own account, generated from the same
+    seed. Every request waits for the configured latency and may be answered
+    with 429 and a Retry-After header, either at random or once the rolling
+    window limit is used up. GET /_stats reports request and 429 counts.
+
+    Args:
+        config: Configuration for the fake API
+
+    Returns:
+        FastAPI application serving the API under /v4
+    """
+    config = config or FakeKitConfig()
+    app = FastAPI(title="Fake Kit.com API")
+    accounts: Dict[str, FakeKitAccount] = {}
+    limiter = _RateLimiter(config.rate_limit, config.rate_limit_period)
+    generator = random.Random(config.seed)
+    counters: Dict[str, int] = defaultdict(int)
+
+    @app.middleware("http")
+    async def simulate_network(request: Request, call_next):
+        if request.url.path.startswith("/_"):
+            return await call_next(request)
+
+        credential = request.headers.get("X-Kit-Api-Key") or request.headers.get("Authorization") or ""
+        if not credential:
+            return JSONResponse({"errors": ["API Key not valid"]}, status_code=401)
+
+        counters["requests"] += 1
+        delay = config.latency + generator.uniform(0, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if not limiter.allow(credential) or generator.random() < config.rate_limit_probability:
+            counters["rate_limited"] += 1
+            return JSONResponse({"errors": ["Rate limit exceeded"]}, status_code=429,
+                                headers={"Retry-After": str(config.retry_after)})
+
+        request.state.account = accounts.get(credential)
+        if request.state.account is None:
+            request.state.account = accounts[credential] = FakeKitAccount(config)
+        return await call_next(request)
+
+    @app.get("/_stats")
+    async def stats():
+        return {**counters, "accounts": len(accounts)}
+
+    @app.get("/v4/account")
+    async def get_account():
+        return {"user": {"email": "owner@example.com"},
+                "account": {"id": 1, "name": "Benchmark account", "plan_type": "creator", "primary_email_address": "owner@example.com"}}
+
+    @app.get("/v4/tags")
+    async def list_tags(request: Request):
+        return paginate(request.state.account.tags, "tags", dict(request.query_params))
+
+    @app.post("/v4/tags")
+    async def create_tag(request: Request):
+        body = await request.json()
+        return JSONResponse({"tag": request.state.account.create_tag(body["name"])}, status_code=201)
+
+    @app.get("/v4/tags/{tag_id}/subscribers")
+    async def list_tag_subscribers(tag_id: int, request: Request):
+        account: FakeKitAccount = request.state.account
+        if tag_id not in account.tag_members:
+            raise HTTPException(status_code=404, detail="Tag not found")
+        params = dict(request.query_params)
+        status = params.get("status", "active")
+        items = []
+        for subscriber in account.subscribers:
+            tagged_at = account.tag_members[tag_id].get(subscriber["id"])
+            if tagged_at is None or (status != "all" and subscriber["state"] != status):
+                continue
+            if params.get("tagged_after") and tagged_at <= params["tagged_after"]:
+                continue
+            items.append({**subscriber, "tagged_at": tagged_at})
+        return paginate(items, "subscribers", params)
+
+    @app.post("/v4/tags/{tag_id}/subscribers")
+    async def tag_subscriber(tag_id: int, request: Request):
+        body = await request.json()
+        return {"subscriber": request.state.account.tag(tag_id, body["email_address"])}
+
+    @app.get("/v4/subscribers")
+    async def list_subscribers(request: Request):
+        params = dict(request.query_params)
+        items = request.state.account.filter_subscribers(params)
+        return paginate(items, "subscribers", params, total_count=params.get("include_total_count") == "true")
+
+    @app.post("/v4/subscribers")
+    async def create_subscriber(request: Request):
+        body = await request.json()
+        email = body.get("email_address") or body.get("email")
+        if not email:
+            return JSONResponse({"errors": ["Email address is required"]}, status_code=422)
+        created, subscriber = request.state.account.upsert_subscriber(email, body.get("first_name"))
+        return JSONResponse({"subscriber": subscriber}, status_code=201 if created else 200)
+
+    @app.get("/v4/forms")
+    async def list_forms(request: Request):
+        return paginate(request.state.account.forms, "forms", dict(request.query_params))
+
+    @app.post("/v4/forms")
+    async def create_form(request: Request):
+        body = await request.json()
+        return JSONResponse({"form": request.state.account.create_form(body["name"])}, status_code=201)
+
+    @app.post("/v4/forms/{form_id}/subscribers")
+    async def add_form_subscriber(form_id: int, request: Request):
+        body = await request.json()
+        return {"subscriber": request.state.account.upsert_subscriber(body["email_address"])[1]}
+
+    @app.get("/v4/broadcasts")
+    async def list_broadcasts(request: Request):
+        return paginate([], "broadcasts", dict(request.query_params))
+
+    @app.post("/v4/bulk/subscribers")
+    async def bulk_create_subscribers(request: Request):
+        body = await request.json()
+        account: FakeKitAccount = request.state.account
+        subscribers = [account.upsert_subscriber(item["email_address"], item.get("first_name"))[1]
+                       for item in body.get("subscribers", [])]
+        return {"subscribers": subscribers, "failures": []}
+
+    @app.post("/v4/bulk/tags/subscribers")
+    async def bulk_tag_subscribers(request: Request):
+        body = await request.json()
+        account: FakeKitAccount = request.state.account
+        subscribers = []
+        failures = []
+        for tagging in body.get("taggings", []):
+            try:
+                subscribers.append(account.tag(int(tagging["tag_id"]), tagging["email_address"]))
+            except HTTPException as e:
+                failures.append({"tagging": tagging, "errors": [e.detail]})
+        return {"subscribers": subscribers, "failures": failures}
+
+    @app.post("/v4/bulk/forms/subscribers")
+    async def bulk_add_form_subscribers(request: Request):
+        body = await request.json()
+        account: FakeKitAccount = request.state.account
+        subscribers = [account.upsert_subscriber(item["email_address"])[1] for item in body.get("additions", [])]
+        return {"subscribers": subscribers, "failures": []}
+
+    @app.get("/v4/webhooks")
+    async def list_webhooks(request: Request):
+        return paginate(request.state.account.webhooks, "webhooks", dict(request.query_params))
+
+    @app.post("/v4/webhooks")
+    async def create_webhook(request: Request):
+        body = await request.json()
+        account: FakeKitAccount = request.state.account
+        webhook = {"id": account.new_id(), "account_id": 1, "event": body.get("event"), "target_url": body.get("target_url")}
+        account.webhooks.append(webhook)
+        return JSONResponse({"webhook": webhook}, status_code=201)
+
+    @app.delete("/v4/webhooks/{webhook_id}")
+    async def delete_webhook(webhook_id: int, request: Request):
+        account: FakeKitAccount = request.state.account
+        account.webhooks = [webhook for webhook in account.webhooks if webhook["id"] != webhook_id]
+        return Response(status_code=204)
+
+    return app
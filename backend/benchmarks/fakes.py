@@ -0,0 +1,66 @@
+"""
+Runner for the benchmark stand-ins.
+This module serves the fake Kit.com API and the stub Claude API from one process.
+"""
+
+import argparse
+import asyncio
+import logging
+import uvicorn
+
+from app.telemetry.logs import configure_logging
+
+from .fake_kit import FakeKitConfig, create_fake_kit_app
+from .stub_claude import StubClaudeConfig, create_stub_claude_app
+
+logger = logging.getLogger(__name__)
+
+async def serve(host: str, kit_port: int, claude_port: int, kit_config: FakeKitConfig,
+                claude_config: StubClaudeConfig) -> None:
+    """
+    Serve both stand-ins until cancelled.
+
+    Args:
+        host: Interface to listen on
+        kit_port: Port of the fake Kit.com API
+        claude_port: Port of the stub Claude API
+        kit_config: Configuration for the fake Kit.com API
+        claude_config: Configuration for the stub Claude API
+    """
+    servers = [
+        uvicorn.Server(uvicorn.Config(create_fake_kit_app(kit_config), host=host, port=kit_port,
+                                      log_level="warning", access_log=False)),
+        uvicorn.Server(uvicorn.Config(create_stub_claude_app(claude_config), host=host, port=claude_port,
+                                      log_level="warning", access_log=False)),
+    ]
+    logger.info("Fake Kit.com API on http://%s:%s/v4, stub Claude API on http://%s:%s", host, kit_port, host, claude_port)
+    await asyncio.gather(*(server.serve() for server in servers))
+
+def main() -> None:
+    """Parse the command line and serve the stand-ins."""
+    parser = argparse.ArgumentParser(description="Serve the fake Kit.com API and the stub Claude API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--kit-port", type=int, default=8101)
+    parser.add_argument("--claude-port", type=int, default=8102)
+    parser.add_argument("--kit-latency", type=float, default=FakeKitConfig().latency,
+                        help="Seconds every Kit.com request takes")
+    parser.add_argument("--kit-jitter", type=float, default=FakeKitConfig().jitter,
+                        help="Maximum random seconds added to the Kit.com latency")
+    parser.add_argument("--kit-rate-limit", type=int, default=None,
+                        help="Requests per credential per minute before answering 429")
+    parser.add_argument("--kit-429-rate", type=float, default=0.0,
+                        help="Fraction of Kit.com requests answered with 429 at random")
+    parser.add_argument("--subscribers", type=int, default=FakeKitConfig().subscribers,
+                        help="Subscribers generated per account")
+    parser.add_argument("--claude-latency", type=float, default=StubClaudeConfig().latency,
+                        help="Seconds every Claude request takes before its first token")
+    args = parser.parse_args()
+    configure_logging(json_format=False)
+
+    kit_config = FakeKitConfig(latency=args.kit_latency, jitter=args.kit_jitter, rate_limit=args.kit_rate_limit,
+                               rate_limit_probability=args.kit_429_rate, subscribers=args.subscribers)
+    claude_config = StubClaudeConfig(latency=args.claude_latency)
+    asyncio.run(serve(args.host, args.kit_port, args.claude_port, kit_config, claude_config))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+Load generator for the MCP server.
+This module drives /api/chat and /ws at a fixed concurrency and summarizes latency and throughput.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import json
+import logging
+import math
+import time
+import uuid
+import httpx
+import websockets
+
+from app.intent_service.router import LocalIntentRouter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MESSAGES = [
+    "How many tags do I have?",
+    "How many subscribers do I have?",
+    "List my tags",
+    "Show me my forms",
+    "Which of user1@example.com, user2@example.com are tagged VIP?",
+    "Show subscribers tagged VIP but not Churned",
+    "Explain what tags are",
+    "Create tag VIP and tag user3@example.com, user4@example.com with it, then tell me my tag count",
+]
+
+# Responses the server sends when a stage failed instead of raising, e.g. when the
+# Claude API rejects the intent request or a tool call errors.
+FALLBACK_PREFIXES = ("I'm sorry", "I don't know how to")
+
+def failed_response(result: Dict[str, Any]) -> Optional[str]:
+    """
+    Describe a response that did not answer the message.
+
+    Args:
+        result: Body of a /api/chat response or a "complete" /ws frame
+
+    Returns:
+        Error description for clarification and fallback responses, or None for an answer
+    """
+    response = str(result.get("response") or "")
+    if result.get("needs_clarification"):
+        return f"Clarification: {response[:200]}"
+    if response.startswith(FALLBACK_PREFIXES):
+        return f"Fallback: {response[:200]}"
+    return None
+
+def needs_claude(messages: Sequence[str]) -> bool:
+    """Check whether any of the messages is deferred to Claude by the local intent router."""
+    router = LocalIntentRouter()
+    return any(router.route(message) is None for message in messages)
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Get a percentile with the nearest-rank method.
+
+    Args:
+        values: Sample values
+        percent: Percentile between 0 and 100
+
+    Returns:
+        The smallest value with at least percent of the samples at or below it, or 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def summarize(latencies: List[float], duration: float) -> Dict[str, float]:
+    """
+    Summarize request latencies.
+
+    Args:
+        latencies: Latency of each successful request, in seconds
+        duration: Wall-clock seconds the load ran for
+
+    Returns:
+        Requests per second and p50/p95/p99/mean/max latency in milliseconds
+    """
+    return {
+        "rps": round(len(latencies) / duration, 2) if duration else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+        "max_ms": round(max(latencies) * 1000, 1) if latencies else 0.0
+    }
+
+class _Workload:
+    """Shared request counter handing out messages to workers."""
+
+    def __init__(self, messages: Sequence[str], requests: int, warmup: int):
+        self.messages = list(messages)
+        self.requests = requests
+        self.warmup = warmup
+        self.issued = 0
+        self.latencies: List[float] = []
+        self.first_event_latencies: List[float] = []
+        self.errors = 0
+        self.error_samples: List[str] = []
+        self.started: Optional[float] = None
+
+    def next(self) -> Optional[Tuple[int, str]]:
+        """Get the index and message of the next request, or None when the workload is done."""
+        if self.issued >= self.warmup + self.requests:
+            return None
+        index = self.issued
+        self.issued += 1
+        if index == self.warmup:
+            self.started = time.perf_counter()
+        return index, self.messages[index % len(self.messages)]
+
+    def record(self, index: int, latency: Optional[float], first_event: Optional[float] = None,
+               error: Optional[str] = None) -> None:
+        """Record the outcome of a request, ignoring warmup requests."""
+        if index < self.warmup:
+            return
+        if error is not None:
+            self.errors += 1
+            if len(self.error_samples) < 5:
+                self.error_samples.append(error)
+            return
+        self.latencies.append(latency)
+        if first_event is not None:
+            self.first_event_latencies.append(first_event)
+
+    def report(self, transport: str, concurrency: int) -> Dict[str, Any]:
+        """Build the report of a finished workload."""
+        duration = time.perf_counter() - self.started if self.started is not None else 0.0
+        report = {
+            "transport": transport,
+            "concurrency": concurrency,
+            "requests": self.requests,
+            "completed": len(self.latencies),
+            "errors": self.errors,
+            "duration_s": round(duration, 2),
+            **summarize(self.latencies, duration)
+        }
+        if self.first_event_latencies:
+            report["first_event_p50_ms"] = round(percentile(self.first_event_latencies, 50) * 1000, 1)
+            report["first_event_p95_ms"] = round(percentile(self.first_event_latencies, 95) * 1000, 1)
+        if self.error_samples:
+            report["error_samples"] = self.error_samples
+        return report
+
+async def run_chat_load(base_url: str, requests: int, concurrency: int, messages: Sequence[str] = DEFAULT_MESSAGES,
+                        accounts: int = 1, warmup: int = 0, timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Drive POST /api/chat with a fixed number of concurrent workers.
+
+    Each worker keeps its own conversation and uses one of `accounts` Kit.com
+    API keys, so both per-conversation history and per-account client state
+    are exercised.
+
+    Args:
+        base_url: Base URL of the MCP server, e.g. http://127.0.0.1:8000
+        requests: Number of measured requests
+        concurrency: Number of concurrent workers
+        messages: Messages sent in rotation
+        accounts: Number of distinct Kit.com API keys
+        warmup: Number of unmeasured requests sent first
+        timeout: Seconds before a request fails
+
+    Returns:
+        Report with request and error counts, requests per second and latency percentiles
+    """
+    workload = _Workload(messages, requests, warmup)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        async def worker(number: int) -> None:
+            headers = {"X-Kit-API-Key": f"benchmark-key-{number % accounts}", "X-Claude-API-Key": "benchmark"}
+            conversation_id = None
+            while (item := workload.next()) is not None:
+                index, message = item
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/api/chat", headers=headers,
+                                                 json={"message": message, "conversation_id": conversation_id})
+                    response.raise_for_status()
+                    result = response.json()
+                    conversation_id = result.get("conversation_id")
+                except Exception as e:
+                    workload.record(index, None, error=f"{type(e).__name__}: {str(e)[:200]}")
+                    continue
+                workload.record(index, time.perf_counter() - started, error=failed_response(result))
+
+        await asyncio.gather(*(worker(number) for number in range(concurrency)))
+
+    return workload.report("http", concurrency)
+
+async def run_ws_load(base_url: str, requests: int, concurrency: int, messages: Sequence[str] = DEFAULT_MESSAGES,
+                      accounts: int = 1, warmup: int = 0, timeout: float = 60.0,
+                      stream: bool = True) -> Dict[str, Any]:
+    """
+    Drive /ws with one connection per worker, one message in flight per connection.
+
+    Latency is measured until the "complete" frame; with streaming, the time
+    to the first event frame is reported as well.
+
+    Args:
+        base_url: Base URL of the MCP server, e.g. http://127.0.0.1:8000
+        requests: Number of measured requests
+        concurrency: Number of concurrent connections
+        messages: Messages sent in rotation
+        accounts: Number of distinct Kit.com API keys
+        warmup: Number of unmeasured requests sent first
+        timeout: Seconds before a request fails
+        stream: Ask for progress events and response deltas
+
+    Returns:
+        Report with request and error counts, requests per second and latency percentiles
+    """
+    workload = _Workload(messages, requests, warmup)
+    ws_url = base_url.replace("http://", "ws://", 1).replace("https://", "wss://", 1).rstrip("/") + "/ws"
+
+    async def exchange(connection: Any, frame: Dict[str, Any]) -> Dict[str, Any]:
+        await connection.send(json.dumps(frame))
+        first_event = None
+        while True:
+            reply = json.loads(await connection.recv())
+            if reply.get("request_id") != frame["request_id"]:
+                continue
+            if "error" in reply and reply.get("type") != "tool_finished":
+                raise RuntimeError(reply["error"])
+            if first_event is None:
+                first_event = time.perf_counter()
+            if reply.get("type") == "complete":
+                reply["first_event"] = first_event
+                return reply
+
+    async def worker(number: int) -> None:
+        conversation_id = None
+        async with websockets.connect(ws_url, max_size=None) as connection:
+            while (item := workload.next()) is not None:
+                index, message = item
+                frame = {"request_id": str(uuid.uuid4()), "message": message, "conversation_id": conversation_id,
+                         "kit_api_key": f"benchmark-key-{number % accounts}", "claude_api_key": "benchmark",
+                         "stream": stream}
+                started = time.perf_counter()
+                try:
+                    reply = await asyncio.wait_for(exchange(connection, frame), timeout)
+                except Exception as e:
+                    workload.record(index, None, error=f"{type(e).__name__}: {str(e)[:200]}")
+                    if isinstance(e, (asyncio.TimeoutError, websockets.ConnectionClosed)):
+                        return
+                    continue
+                conversation_id = reply.get("conversation_id")
+                finished = time.perf_counter()
+                first_event = reply["first_event"] - started if stream else None
+                workload.record(index, finished - started, first_event, error=failed_response(reply))
+
+    await asyncio.gather(*(worker(number) for number in range(concurrency)))
+    return workload.report("ws", concurrency)
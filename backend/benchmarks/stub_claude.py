@@ -0,0 +1,194 @@
+"""
+Stub Claude API for benchmarks.
+This module provides a stand-in for the Claude messages endpoint that answers intent prompts with canned
+intents and every other prompt with canned text, after a configurable latency.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import uuid
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+EMAIL_PATTERN = re.compile(r"[\w.+'-]+@[\w-]+(?:\.[\w-]+)+")
+
+# Canned intents, tried in order against the user's message. "$emails" is
+# replaced with the email addresses found in the message.
+CANNED_INTENTS: List[Tuple[str, List[Tuple[str, Dict[str, Any]]]]] = [
+    (r"\bthen\b", [
+        ("create_tag", {"name": "VIP"}),
+        ("bulk_tag_subscribers", {"emails": "$emails", "tag_name": "VIP"}),
+        ("count_tags", {}),
+    ]),
+    (r"\bbut not\b|\bsegment", [
+        ("segment_subscribers", {"tag_names": ["VIP"], "exclude_tag_names": ["Churned"], "limit": 10}),
+    ]),
+    (r"\bwhich of\b", [
+        ("filter_subscribers_by_tag", {"emails": "$emails", "tag_name": "VIP"}),
+    ]),
+    (r"\bexplain\b|\bwhat (is|are)\b", [
+        ("explain_concept", {"concept": "tags"}),
+    ]),
+    (r"\bsubscribers?\b", [
+        ("count_subscribers", {}),
+    ]),
+    (r"\bforms?\b", [
+        ("get_forms", {}),
+    ]),
+]
+
+DEFAULT_INTENT = [("count_tags", {})]
+
+CANNED_TEXT = ("Tags are labels you apply to subscribers to segment your audience. "
+               "They help you organize subscribers by interest, behavior or any other criteria, "
+               "and can trigger automations when they are added.")
+
+class StubClaudeConfig(BaseModel):
+    """Configuration for the stub Claude API."""
+    latency: float = 0.3
+    stream_chunk_delay: float = 0.01
+    stream_chunk_chars: int = 16
+
+def canned_intent(message: str) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Get the canned tool calls for a user message.
+
+    Args:
+        message: User's message
+
+    Returns:
+        Tool name and parameters of each call
+    """
+    emails = EMAIL_PATTERN.findall(message) or ["user1@example.com"]
+    for pattern, calls in CANNED_INTENTS:
+        if re.search(pattern, message, re.IGNORECASE):
+            break
+    else:
+        calls = DEFAULT_INTENT
+    return [(tool, {key: emails if value == "$emails" else value for key, value in parameters.items()})
+            for tool, parameters in calls]
+
+def _system_text(system: Any) -> str:
+    """Get the text of a system prompt given as a string or a list of blocks."""
+    if isinstance(system, list):
+        return "".join(block.get("text", "") for block in system if isinstance(block, dict))
+    return str(system or "")
+
+def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+    """Get the text of the last user message."""
+    content = messages[-1].get("content", "") if messages else ""
+    if isinstance(content, list):
+        return "".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return str(content)
+
+def _content(request: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Build the content blocks answering a request.
+
+    Intent requests are recognized by their system prompt; they get tool_use
+    blocks when tools are sent and a JSON intent otherwise.
+    """
+    system = _system_text(request.get("system"))
+    if "determine user intent" not in system:
+        return [{"type": "text", "text": CANNED_TEXT}]
+
+    message = _prompt_text(request.get("messages", [])).split("\n\n", 1)[0]
+    calls = canned_intent(message)
+    if request.get("tools"):
+        return [{"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tool, "input": parameters}
+                for tool, parameters in calls]
+
+    if len(calls) == 1:
+        intent = {"tool": calls[0][0], "parameters": calls[0][1]}
+    else:
+        intent = {"steps": [{"id": str(index + 1), "tool": tool, "parameters": parameters}
+                            for index, (tool, parameters) in enumerate(calls)]}
+    intent.update({"needs_clarification": False, "clarification_question": None})
+    return [{"type": "text", "text": json.dumps(intent)}]
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def create_stub_claude_app(config: Optional[StubClaudeConfig] = None) -> FastAPI:
+    """
+    Create the stub Claude API.
+
+    Point the server at it with ANTHROPIC_BASE_URL. Usage reports a prompt cache
+    write the first time a system prompt is seen and a cache read afterwards.
+    GET /_stats reports the number of requests per kind.
+
+    Args:
+        config: Configuration for the stub API
+
+    Returns:
+        FastAPI application serving POST /v1/messages
+    """
+    config = config or StubClaudeConfig()
+    app = FastAPI(title="Stub Claude API")
+    cached_prefixes = set()
+    counters: Dict[str, int] = defaultdict(int)
+
+    def usage(request: Dict[str, Any], content: List[Dict[str, Any]]) -> Dict[str, int]:
+        system = _system_text(request.get("system"))
+        prefix = hashlib.sha256((system + json.dumps(request.get("tools"))).encode()).hexdigest()
+        report = {"input_tokens": len(_prompt_text(request.get("messages", []))) // 4,
+                  "output_tokens": len(json.dumps(content)) // 4,
+                  "cache_creation_input_tokens": 0,
+                  "cache_read_input_tokens": 0}
+        report["cache_read_input_tokens" if prefix in cached_prefixes else "cache_creation_input_tokens"] = len(system) // 4
+        cached_prefixes.add(prefix)
+        return report
+
+    @app.get("/_stats")
+    async def stats():
+        return dict(counters)
+
+    @app.post("/v1/messages")
+    async def create_message(request: Request):
+        body = await request.json()
+        content = _content(body)
+        counters["streamed" if body.get("stream") else "requests"] += 1
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "claude-stub"),
+            "content": content,
+            "stop_reason": "tool_use" if content[0]["type"] == "tool_use" else "end_turn",
+            "stop_sequence": None,
+            "usage": usage(body, content)
+        }
+
+        await asyncio.sleep(config.latency)
+        if not body.get("stream"):
+            return message
+
+        async def events():
+            yield _sse("message_start", {"type": "message_start",
+                                         "message": {**message, "content": [], "stop_reason": None}})
+            text = content[0].get("text", "")
+            yield _sse("content_block_start", {"type": "content_block_start", "index": 0,
+                                               "content_block": {"type": "text", "text": ""}})
+            for start in range(0, len(text), config.stream_chunk_chars):
+                await asyncio.sleep(config.stream_chunk_delay)
+                yield _sse("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                                   "delta": {"type": "text_delta",
+                                                             "text": text[start:start + config.stream_chunk_chars]}})
+            yield _sse("content_block_stop", {"type": "content_block_stop", "index": 0})
+            yield _sse("message_delta", {"type": "message_delta",
+                                         "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                         "usage": {"output_tokens": message["usage"]["output_tokens"]}})
+            yield _sse("message_stop", {"type": "message_stop"})
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
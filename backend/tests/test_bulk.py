@@ -0,0 +1,138 @@
+"""
+Tests for the bulk tools and the Kit.com credential that enables them.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from app.api.credentials import kit_credentials, kit_credentials_from_headers
+from app.kit_client.pool import KitClientPoolConfig, KitClientRegistry
+from app.mcp_server.server import KitMCPServer
+
+def test_access_token_wins_over_api_key(monkeypatch):
+    monkeypatch.delenv("KIT_API_KEY", raising=False)
+    monkeypatch.delenv("KIT_ACCESS_TOKEN", raising=False)
+
+    assert kit_credentials_from_headers({"X-Kit-API-Key": "key", "X-Kit-Access-Token": "token"}) == \
+        {"api_key": None, "access_token": "token"}
+    assert kit_credentials_from_headers({"X-Kit-API-Key": "key"}) == {"api_key": "key", "access_token": None}
+
+def test_environment_fallback_can_be_disabled(monkeypatch):
+    monkeypatch.setenv("KIT_ACCESS_TOKEN", "token")
+
+    assert kit_credentials() == {"api_key": None, "access_token": "token"}
+    assert kit_credentials(environment=False) == {"api_key": None, "access_token": None}
+
+def _bulk_server(transport):
+    """Build an MCP server whose Kit.com client is leased with an OAuth access token."""
+    registry = KitClientRegistry(KitClientPoolConfig(base_url="https://kit.test/v4"))
+    registry._build_http_client = lambda: httpx.AsyncClient(transport=transport)
+    kit_client = registry.get(**kit_credentials(access_token="token", environment=False))
+    return KitMCPServer(kit_client, None, None), registry
+
+def test_access_token_reaches_the_bulk_endpoint_in_chunks():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        subscribers = [{"id": index, "email_address": item["email_address"]}
+                       for index, item in enumerate(body["subscribers"])]
+        return httpx.Response(200, json={"subscribers": subscribers, "failures": []})
+
+    server, registry = _bulk_server(httpx.MockTransport(handler))
+    emails = [f"user{index}@example.com" for index in range(150)]
+
+    async def main():
+        try:
+            return await server._bulk_create_subscribers(emails)
+        finally:
+            await registry.close()
+
+    summary = asyncio.run(main())
+
+    assert server.kit_client.supports_bulk
+    assert [request.url.path for request in requests] == ["/v4/bulk/subscribers"] * 2
+    assert requests[0].headers["Authorization"] == "Bearer token"
+    assert summary["succeeded"] == 150
+    assert "note" not in summary
+
+def test_large_batches_are_enqueued_with_the_callback_url():
+    requests = []
+
+    def handler(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(202, json={})
+
+    server, registry = _bulk_server(httpx.MockTransport(handler))
+    server.bulk_callback_url = "https://mcp.test/api/webhooks/kit/bulk?token=secret"
+    emails = [f"user{index}@example.com" for index in range(150)]
+
+    async def main():
+        try:
+            return await server._bulk_create_subscribers(emails)
+        finally:
+            await registry.close()
+
+    summary = asyncio.run(main())
+
+    assert len(requests) == 1
+    assert requests[0]["callback_url"] == server.bulk_callback_url
+    assert summary["enqueued"] == 150
+    assert "KIT_BULK_CALLBACK_URL" in summary["note"]
+
+def _tagging_handler(requests, existing):
+    """Answer tag, subscriber lookup and bulk requests for a Kit.com account holding the given subscribers."""
+    def handler(request):
+        requests.append(request)
+        path = request.url.path
+        if path == "/v4/tags":
+            return httpx.Response(201, json={"tag": {"id": 7, "name": "VIP"}})
+        if path == "/v4/subscribers":
+            email = request.url.params["email_address"]
+            subscribers = [{"id": existing[email], "email_address": email}] if email in existing else []
+            return httpx.Response(200, json={"subscribers": subscribers})
+        body = json.loads(request.content)
+        if path == "/v4/bulk/subscribers":
+            subscribers = [{"id": 100 + index, "email_address": item["email_address"]}
+                           for index, item in enumerate(body["subscribers"])]
+            return httpx.Response(200, json={"subscribers": subscribers, "failures": []})
+        return httpx.Response(200, json={"subscribers": body["taggings"], "failures": []})
+    return handler
+
+def test_bulk_tagging_skips_unknown_addresses():
+    requests = []
+    server, registry = _bulk_server(httpx.MockTransport(_tagging_handler(requests, {"a@example.com": 1})))
+
+    async def main():
+        try:
+            return await server._bulk_tag_subscribers(["a@example.com", "new@example.com"], "VIP")
+        finally:
+            await registry.close()
+
+    summary = asyncio.run(main())
+
+    assert "/v4/bulk/subscribers" not in [request.url.path for request in requests]
+    tagging = json.loads(requests[-1].content)
+    assert requests[-1].url.path == "/v4/bulk/tags/subscribers"
+    assert tagging["taggings"] == [{"tag_id": 7, "subscriber_id": 1}]
+    assert summary["succeeded"] == 1
+    assert [failure["email_address"] for failure in summary["failures"]] == ["new@example.com"]
+
+def test_bulk_tagging_creates_subscribers_only_when_asked():
+    requests = []
+    server, registry = _bulk_server(httpx.MockTransport(_tagging_handler(requests, {})))
+
+    async def main():
+        try:
+            return await server._bulk_tag_subscribers(["new@example.com"], "VIP", create_missing=True)
+        finally:
+            await registry.close()
+
+    summary = asyncio.run(main())
+
+    assert [request.url.path for request in requests][-2:] == ["/v4/bulk/subscribers", "/v4/bulk/tags/subscribers"]
+    assert summary["succeeded"] == 1
+    assert summary["failures"] == []
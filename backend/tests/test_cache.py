@@ -0,0 +1,141 @@
+"""
+Tests for the Kit.com response cache and tag index single-flight loading.
+"""
+
+import asyncio
+
+import pytest
+
+from app.kit_client.cache import ResponseCache
+from app.kit_client.tag_index import TagIndex
+
+def test_concurrent_misses_share_one_request():
+    cache = ResponseCache({"tags": 60.0})
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["VIP"]
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load(("tags",), loader) for _ in range(5)))
+
+    assert asyncio.run(main()) == [["VIP"]] * 5
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 4
+
+def test_cancelling_the_first_caller_does_not_fail_the_others():
+    cache = ResponseCache({"tags": 60.0})
+    started = None
+
+    async def loader():
+        started.set()
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def main():
+        nonlocal started
+        started = asyncio.Event()
+        leader = asyncio.create_task(cache.get_or_load(("tags",), loader))
+        await started.wait()
+        follower = asyncio.create_task(cache.get_or_load(("tags",), loader))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == 42
+    assert cache._pending == {}
+    assert cache.peek(("tags",)) == 42
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    cache = ResponseCache({"tags": 60.0})
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_load(("tags",), loader) for _ in range(2)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache._pending == {}
+    assert cache.peek(("tags",)) is None
+
+def test_invalidation_during_a_load_keeps_the_stale_result_out():
+    cache = ResponseCache({"tags": 60.0})
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return ["old"]
+
+    async def main():
+        load = asyncio.create_task(cache.get_or_load(("tags",), loader))
+        await asyncio.sleep(0)
+        cache.invalidate("tags")
+        return await load
+
+    assert asyncio.run(main()) == ["old"]
+    assert cache.peek(("tags",)) is None
+
+def test_callers_after_an_invalidation_do_not_join_the_stale_load():
+    cache = ResponseCache({"tags": 60.0})
+    results = iter([["old"], ["new"]])
+
+    async def loader():
+        result = next(results)
+        await asyncio.sleep(0.01)
+        return result
+
+    async def main():
+        stale = asyncio.create_task(cache.get_or_load(("tags",), loader))
+        await asyncio.sleep(0)
+        cache.invalidate("tags")
+        fresh = await cache.get_or_load(("tags",), loader)
+        return await stale, fresh
+
+    assert asyncio.run(main()) == (["old"], ["new"])
+    assert cache.peek(("tags",)) == ["new"]
+    assert cache.stats()["coalesced"] == 0
+    assert cache._pending == {}
+
+def test_lru_eviction():
+    cache = ResponseCache({"tags": 60.0}, max_entries=2)
+    cache.put(("tags", 1), "a")
+    cache.put(("tags", 2), "b")
+    cache.put(("tags", 3), "c")
+
+    assert cache.peek(("tags", 1)) is None
+    assert cache.peek(("tags", 3)) == "c"
+
+class _SlowTagClient:
+    """Kit.com client stand-in whose tag creation takes a moment."""
+
+    def __init__(self):
+        self.created = 0
+
+    async def create_tag(self, name):
+        self.created += 1
+        await asyncio.sleep(0.01)
+        return {"id": 1, "name": name}
+
+def test_tag_creation_survives_the_first_caller_being_cancelled():
+    client = _SlowTagClient()
+    index = TagIndex(client)
+
+    async def main():
+        leader = asyncio.create_task(index.resolve("VIP"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(index.resolve("VIP"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main())["id"] == 1
+    assert client.created == 1
+    assert index._pending == {}
@@ -0,0 +1,104 @@
+"""
+Tests for multi-step tool plans.
+"""
+
+import asyncio
+
+from app.mcp_server.plan import MAX_PLAN_STEPS, build_plan, run_plan
+
+def test_single_tool_intent_is_one_step():
+    steps = build_plan({"tool": "count_tags", "parameters": {}})
+
+    assert steps == [{"id": "1", "tool": "count_tags", "parameters": {}, "depends_on": []}]
+
+def test_duplicate_ids_get_unique_ids_that_skip_later_ids():
+    steps = build_plan({"steps": [
+        {"id": "1", "tool": "create_tag", "parameters": {"name": "A"}, "depends_on": []},
+        {"id": "1", "tool": "create_tag", "parameters": {"name": "B"}, "depends_on": []},
+        {"id": "2", "tool": "count_tags", "parameters": {}, "depends_on": ["1"]},
+    ]})
+
+    ids = [step["id"] for step in steps]
+    assert len(set(ids)) == len(ids)
+    assert ids[0] == "1" and ids[2] == "2"
+    # A duplicated ID refers to the first step that used it.
+    assert steps[2]["depends_on"] == ["1"]
+
+def test_missing_ids_do_not_collide_with_given_ones():
+    steps = build_plan({"steps": [
+        {"tool": "get_tags", "depends_on": []},
+        {"id": "1", "tool": "count_tags", "depends_on": []},
+    ]})
+
+    assert len({step["id"] for step in steps}) == 2
+
+def test_unknown_and_forward_dependencies_are_rejected():
+    steps = build_plan({"steps": [
+        {"id": "1", "tool": "count_tags", "depends_on": ["2"]},
+        {"id": "2", "tool": "get_tags", "depends_on": ["9"]},
+    ]})
+
+    assert steps[0]["error"] == "depends on unknown step 2"
+    assert steps[1]["error"] == "depends on unknown step 9"
+
+def test_writes_are_ordered_after_earlier_steps_without_explicit_dependencies():
+    steps = build_plan({"steps": [
+        {"id": "1", "tool": "create_tag", "parameters": {"name": "VIP"}},
+        {"id": "2", "tool": "tag_subscriber", "parameters": {"email": "a@example.com", "tag_name": "VIP"}},
+    ]})
+
+    assert steps[1]["depends_on"] == ["1"]
+
+def test_plans_are_truncated():
+    steps = build_plan({"steps": [{"id": str(i), "tool": "count_tags"} for i in range(MAX_PLAN_STEPS + 5)]})
+
+    assert len(steps) == MAX_PLAN_STEPS
+
+def test_run_plan_skips_rejected_steps_and_their_dependents():
+    steps = build_plan({"steps": [
+        {"id": "1", "tool": "count_tags", "depends_on": ["7"]},
+        {"id": "2", "tool": "get_tags", "depends_on": ["1"]},
+        {"id": "3", "tool": "count_subscribers", "depends_on": []},
+    ]})
+    ran = []
+
+    async def run_step(step):
+        ran.append(step["tool"])
+        return step["tool"]
+
+    outcomes = asyncio.run(run_plan(steps, run_step))
+
+    assert ran == ["count_subscribers"]
+    assert outcomes[0]["skipped"] and outcomes[1]["skipped"]
+    assert outcomes[1]["error"] == "step 1 did not complete"
+    assert outcomes[2]["result"] == "count_subscribers"
+
+def test_run_plan_reports_failures_and_skips_dependents():
+    steps = build_plan({"steps": [
+        {"id": "1", "tool": "create_tag", "depends_on": []},
+        {"id": "2", "tool": "tag_subscriber", "depends_on": ["1"]},
+    ]})
+
+    async def run_step(step):
+        raise RuntimeError("Kit.com is down")
+
+    outcomes = asyncio.run(run_plan(steps, run_step))
+
+    assert outcomes[0]["error"] == "Kit.com is down" and "skipped" not in outcomes[0]
+    assert outcomes[1]["skipped"]
+
+def test_run_plan_runs_independent_steps_concurrently():
+    steps = build_plan({"steps": [{"id": str(i), "tool": "count_tags", "depends_on": []} for i in range(1, 4)]})
+    running = 0
+    peak = 0
+
+    async def run_step(step):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    asyncio.run(run_plan(steps, run_step, max_concurrency=2))
+
+    assert peak == 2
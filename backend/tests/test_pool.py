@@ -0,0 +1,67 @@
+"""
+Tests for the Kit.com API client registry.
+"""
+
+import asyncio
+
+import httpx
+
+from app.kit_client.pool import KitClientPoolConfig, KitClientRegistry
+
+def _registry(**config):
+    """Build a registry whose clients answer every request with an empty response."""
+    registry = KitClientRegistry(KitClientPoolConfig(base_url="https://kit.test/v4", **config))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+    registry._build_http_client = lambda: httpx.AsyncClient(transport=transport)
+    return registry
+
+def test_idle_eviction_keeps_mirrored_clients():
+    registry = _registry(idle_timeout=0.0)
+
+    async def main():
+        try:
+            mirrored = registry.get(api_key="mirrored")
+            mirrored._mirror_webhooks = ("https://mcp.test/api/webhooks/kit", "secret")
+            registry.get(api_key="idle")
+            return await registry.evict_idle(), registry.find(mirrored.account_id) is mirrored
+        finally:
+            await registry.close()
+
+    evicted, found = asyncio.run(main())
+
+    assert evicted == 1
+    assert found
+
+def test_overflow_eviction_keeps_mirrored_clients():
+    registry = _registry(max_clients=1)
+
+    async def main():
+        try:
+            mirrored = registry.get(api_key="mirrored")
+            mirrored._mirror_webhooks = ("https://mcp.test/api/webhooks/kit", "secret")
+            registry.get(api_key="other")
+            return registry.find(mirrored.account_id) is mirrored
+        finally:
+            await registry.close()
+
+    assert asyncio.run(main())
+
+def test_stats_keep_the_totals_of_evicted_clients():
+    registry = _registry(idle_timeout=0.0)
+
+    async def main():
+        try:
+            client = registry.get(api_key="idle")
+            client.retries = 3
+            client.cache.hits = 2
+            before = registry.stats()
+            await registry.evict_idle()
+            return before, registry.stats()
+        finally:
+            await registry.close()
+
+    before, after = asyncio.run(main())
+
+    assert after["clients"] == 0
+    assert after["evictions"] == 1
+    assert (after["retries"], after["cache_hits"]) == (before["retries"], before["cache_hits"]) == (3, 2)
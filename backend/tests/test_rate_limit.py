@@ -0,0 +1,142 @@
+"""
+Tests for Kit.com rate limiting, Retry-After handling and retries.
+"""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.kit_client.api import KitClient, KitClientConfig
+from app.kit_client.rate_limit import RollingWindowRateLimiter, backoff_delay, parse_retry_after
+
+def test_rolling_window_holds_back_requests_over_the_limit():
+    limiter = RollingWindowRateLimiter(2, period=0.1)
+
+    async def main():
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    elapsed = asyncio.run(main())
+
+    assert elapsed >= 0.09
+    assert limiter.stats()["requests"] == 3
+    assert limiter.stats()["throttled"] == 1
+    assert limiter.stats()["queue_depth"] == 0
+
+def test_requests_within_the_limit_are_not_throttled():
+    limiter = RollingWindowRateLimiter(5, period=60.0)
+
+    async def main():
+        await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+
+    asyncio.run(main())
+
+    assert limiter.stats()["throttled"] == 0
+    assert limiter.stats()["requests"] == 5
+
+def test_defer_holds_back_every_caller():
+    limiter = RollingWindowRateLimiter(100, period=60.0)
+
+    async def main():
+        limiter.defer(0.05)
+        started = time.monotonic()
+        await limiter.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(main()) >= 0.04
+
+@pytest.mark.parametrize("value, expected", [
+    (None, None),
+    ("", None),
+    ("3", 3.0),
+    ("1.5", 1.5),
+    ("-2", 0.0),
+    ("soon", None),
+])
+def test_parse_retry_after_seconds(value, expected):
+    assert parse_retry_after(value) == expected
+
+def test_parse_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+    delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+    assert 28 <= delay <= 30
+
+def test_parse_retry_after_past_date_is_zero():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_backoff_delay_is_capped():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base=0.5, cap=2.0) <= 2.0
+
+def _client(responses):
+    """Build a Kit.com client answering requests from a list of responses."""
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    config = KitClientConfig(api_key="key", base_url="https://kit.test/v4", retry_backoff_base=0.0)
+    return KitClient(config, client=httpx.AsyncClient(transport=httpx.MockTransport(handler))), requests
+
+def test_429_is_retried_after_retry_after():
+    client, requests = _client([
+        httpx.Response(429, headers={"Retry-After": "0.05"}),
+        httpx.Response(200, json={"tags": []}),
+    ])
+
+    async def main():
+        started = time.monotonic()
+        response = await client._make_request("GET", "/tags")
+        return response, time.monotonic() - started
+
+    response, elapsed = asyncio.run(main())
+
+    assert response == {"tags": []}
+    assert len(requests) == 2
+    assert elapsed >= 0.04
+    assert client.retries == 1
+    assert client.rate_limited == 1
+
+@pytest.mark.parametrize("method, attempts", [("GET", 2), ("DELETE", 2), ("POST", 1)])
+def test_server_errors_are_retried_for_idempotent_methods_only(method, attempts):
+    client, requests = _client([
+        httpx.Response(503, json={"errors": ["Unavailable"]}),
+        httpx.Response(200, json={}),
+    ])
+
+    async def main():
+        try:
+            return await client._make_request(method, "/tags")
+        except httpx.HTTPStatusError:
+            return None
+
+    asyncio.run(main())
+
+    assert len(requests) == attempts
+
+def test_429_is_retried_for_posts():
+    client, requests = _client([
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(201, json={"tag": {"id": 1}}),
+    ])
+
+    assert asyncio.run(client._make_request("POST", "/tags", data={"name": "VIP"})) == {"tag": {"id": 1}}
+    assert len(requests) == 2
+
+def test_non_retryable_errors_are_not_retried():
+    client, requests = _client([httpx.Response(404, json={"errors": ["Not Found"]})])
+
+    with pytest.raises(Exception):
+        asyncio.run(client._make_request("GET", "/tags/1"))
+
+    assert len(requests) == 1
+    assert client.retries == 0
@@ -0,0 +1,84 @@
+"""
+Tests for the local intent router.
+"""
+
+import pytest
+
+from app.intent_service.router import MAX_LIST_LIMIT, LocalIntentRouter
+
+@pytest.fixture
+def router():
+    return LocalIntentRouter()
+
+@pytest.mark.parametrize("message, tool, parameters", [
+    ("how many subscribers do I have?", "count_subscribers", {}),
+    ("list my tags", "get_tags", {}),
+    ("create a tag called VIP", "create_tag", {"name": "VIP"}),
+    ('create a tag called "VIP, Customers"', "create_tag", {"name": "VIP, Customers"}),
+    ("tag alice@example.com with VIP", "tag_subscriber", {"email": "alice@example.com", "tag_name": "VIP"}),
+    ("show me the last 20 subscribers", "get_subscribers", {"limit": 20}),
+    ("what is a tag", "explain_concept", {"concept": "tag"}),
+])
+def test_routes_simple_commands_locally(router, message, tool, parameters):
+    intent = router.route(message)
+
+    assert intent is not None
+    assert intent["tool"] == tool
+    assert intent["parameters"] == parameters
+    assert intent["source"] == "local"
+
+@pytest.mark.parametrize("message", [
+    "don't create a tag called VIP",
+    "never tag alice@example.com with VIP",
+    "how do I add alice@example.com?",
+    "should I create a tag called VIP?",
+])
+def test_defers_negated_and_questioning_writes(router, message):
+    assert router.route(message) is None
+
+@pytest.mark.parametrize("message", [
+    "create tag VIP and count my tags",
+    "create a tag called VIP and tag alice@example.com with it",
+    "add alice@example.com and tag her with VIP",
+    "list my tags and forms",
+    "show my tags, forms",
+    "how many tags and subscribers do I have?",
+])
+def test_defers_compound_requests(router, message):
+    assert router.route(message) is None
+
+@pytest.mark.parametrize("message", [
+    "create a tag VIP, Customers",
+    "create a tag called VIP and Customers",
+    "create form called Newsletter; Webinar",
+])
+def test_defers_lists_of_names(router, message):
+    assert router.route(message) is None
+
+def test_years_are_not_limits(router):
+    assert router.route("show subscribers created in 2023") is None
+
+def test_caps_the_limit(router):
+    intent = router.route("list the last 5000 subscribers")
+
+    assert intent is not None
+    assert intent["parameters"] == {"limit": MAX_LIST_LIMIT}
+
+@pytest.mark.parametrize("message, name", [
+    ("create a tag called VIP please", "VIP"),
+    ("create form called Newsletter thanks", "Newsletter"),
+])
+def test_strips_trailing_filler_from_names(router, message, name):
+    intent = router.route(message)
+
+    assert intent is not None
+    assert name in intent["parameters"].values()
+
+def test_counts_routed_and_deferred_messages(router):
+    router.route("list my tags")
+    router.route("don't create a tag called VIP")
+
+    stats = router.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
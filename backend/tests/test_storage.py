@@ -0,0 +1,128 @@
+"""
+Tests for conversation storage eviction, expiry and recreation.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.conversation.manager import ConversationManager
+from app.conversation.storage import InMemoryConversationStore, Message, SQLiteConversationStore
+
+def test_least_recently_updated_conversation_is_evicted_first():
+    store = InMemoryConversationStore(max_conversations=2)
+
+    async def main():
+        await store.create("a", "", 1.0)
+        await store.create("b", "", 2.0)
+        await store.save_context("a", {"last_intent": "get_tags"}, 3.0)
+        await store.create("c", "", 4.0)
+
+    asyncio.run(main())
+
+    assert list(store.conversations) == ["a", "c"]
+    assert store.evicted == 1
+
+def test_byte_cap_evicts_until_the_store_fits():
+    store = InMemoryConversationStore(max_bytes=2000)
+
+    async def main():
+        for index in range(5):
+            await store.create(str(index), "", float(index))
+            await store.append_message(str(index), Message("user", "x" * 500, float(index)), float(index), 20)
+
+    asyncio.run(main())
+
+    assert store.bytes <= 2000
+    assert "4" in store.conversations and "0" not in store.conversations
+    assert store.evicted >= 1
+
+def test_newest_conversation_is_never_evicted():
+    store = InMemoryConversationStore(max_bytes=10)
+
+    asyncio.run(store.create("only", "", 1.0))
+
+    assert list(store.conversations) == ["only"]
+
+def test_expiry_removes_only_conversations_older_than_the_cutoff():
+    store = InMemoryConversationStore()
+
+    async def main():
+        await store.create("old", "", 10.0)
+        await store.create("new", "", 20.0)
+        return await store.delete_older_than(15.0)
+
+    assert asyncio.run(main()) == 1
+    assert list(store.conversations) == ["new"]
+    assert store.expired == 1
+
+def test_history_keeps_the_newest_messages_and_tracks_bytes():
+    store = InMemoryConversationStore()
+
+    async def main():
+        await store.create("a", "", 1.0)
+        for index in range(5):
+            await store.append_message("a", Message("user", str(index), float(index)), float(index), 3)
+        return await store.get_messages("a", 10)
+
+    messages = asyncio.run(main())
+
+    assert [message["content"] for message in messages] == ["2", "3", "4"]
+    assert store.bytes == store.conversations["a"].size
+
+def test_create_does_not_reset_an_existing_conversation():
+    store = InMemoryConversationStore()
+
+    async def main():
+        await store.create("a", "", 1.0)
+        await store.save_context("a", {"last_intent": "get_tags"}, 2.0)
+        await store.create("a", "", 3.0)
+        return await store.get("a")
+
+    assert asyncio.run(main())["context"] == {"last_intent": "get_tags"}
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryConversationStore()
+    return SQLiteConversationStore(str(tmp_path / "conversations.db"))
+
+def test_manager_recreates_evicted_conversations(store):
+    manager = ConversationManager(store=store)
+
+    async def main():
+        await manager.open()
+        try:
+            conversation_id = await manager.create_conversation()
+            await store.delete(conversation_id)
+            assert await manager.get_context(conversation_id) == {}
+            await manager.update_context(conversation_id, "list my tags", {"tool": "get_tags", "parameters": {}})
+            await manager.add_response(conversation_id, "You have no tags.")
+            return await manager.get_context(conversation_id)
+        finally:
+            await manager.close()
+
+    context = asyncio.run(main())
+
+    assert context["last_intent"] == "get_tags"
+    assert [message["role"] for message in context["history"]] == ["user", "assistant"]
+
+def test_manager_expires_conversations_after_the_ttl(store):
+    manager = ConversationManager(store=store, ttl=60.0)
+
+    async def main():
+        await manager.open()
+        try:
+            await store.create("stale", "", time.time() - 120)
+            await store.create("fresh", "", time.time())
+            deleted = await manager.cleanup_old_conversations(60)
+            return deleted, await store.get("stale"), await store.get("fresh")
+        finally:
+            await manager.close()
+
+    deleted, stale, fresh = asyncio.run(main())
+
+    assert deleted == 1
+    assert stale is None
+    assert fresh is not None
@@ -0,0 +1,58 @@
+"""
+Tests for the local response templates.
+"""
+
+import pytest
+
+from app.intent_service.templates import MAX_LIST_ITEMS, render_response
+
+@pytest.mark.parametrize("tool, result, expected", [
+    ("count_tags", 1, "You have **1 tag** in your Kit.com account."),
+    ("count_subscribers", 12345, "You have **12,345 subscribers** in your Kit.com account."),
+    ("get_tags", [], "You don't have any tags yet."),
+    ("create_tag", {"id": 7, "name": "VIP"}, "Tag **VIP** is ready (ID: 7)."),
+    ("create_subscriber", {"id": 3, "email_address": "a@example.com", "first_name": "Ann"},
+     "Added subscriber **a@example.com** (Ann) (ID: 3)."),
+    ("explain_concept", "Tags label subscribers.", "Tags label subscribers."),
+])
+def test_renders_results(tool, result, expected):
+    assert render_response(tool, result) == expected
+
+def test_escapes_table_cells():
+    rendered = render_response("get_subscribers", [
+        {"id": 1, "email_address": "a@example.com", "first_name": "A|B\nC", "state": "active", "created_at": None}
+    ])
+
+    assert "| a@example.com | A\\|B C | active | — | 1 |" in rendered
+    assert rendered.startswith("Here is 1 subscriber:")
+
+def test_truncates_long_lists():
+    tags = [{"id": index, "name": f"tag{index}"} for index in range(MAX_LIST_ITEMS + 3)]
+
+    rendered = render_response("get_tags", tags)
+
+    assert rendered.count("\n- ") == MAX_LIST_ITEMS
+    assert rendered.endswith("…and 3 more.")
+
+def test_bulk_summary_lists_failures_and_note():
+    rendered = render_response("bulk_tag_subscribers", {
+        "requested": 3, "succeeded": 1, "enqueued": 0, "failed": 2,
+        "failures": [{"email_address": "bad@example.com", "errors": ["Email address is invalid"]}],
+        "note": "Kit.com bulk endpoints require an OAuth access token."
+    })
+
+    assert rendered.startswith("Tagged 1 subscriber out of 3 requested.")
+    assert "- bad@example.com: Email address is invalid" in rendered
+    assert "- …and 1 more" in rendered
+    assert rendered.endswith("_Kit.com bulk endpoints require an OAuth access token._")
+
+def test_segment_describes_included_and_excluded_tags():
+    rendered = render_response("segment_subscribers", {
+        "tags": ["VIP", "Paid"], "exclude_tags": ["Churned"], "count": 0, "subscribers": []
+    })
+
+    assert rendered == "0 active subscribers tagged **VIP** and **Paid** but not **Churned**."
+
+def test_unknown_tools_and_unexpected_shapes_fall_back():
+    assert render_response("no_such_tool", {}) is None
+    assert render_response("count_tags", {"count": 3}) is None
@@ -10,8 +10,15 @@ interface Message {
   content: string;
   role: 'user' | 'assistant';
   timestamp?: string;
+  streaming?: boolean;
+  requestId?: string;
 }
 
+const newRequestId = (): string =>
+  typeof crypto !== 'undefined' && 'randomUUID' in crypto
+    ? crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
 const ChatContainer: React.FC = () => {
   const [messages, setMessages] = useState<Message[]>([]);
   const [isLoading, setIsLoading] = useState(false);
@@ -104,15 +111,50 @@ const ChatContainer: React.FC = () => {
           return;
         }
         
+        // Frames of concurrent requests interleave, so each one goes to the
+        // assistant message of the request it answers.
+        const requestId: string | undefined = data.request_id ?? undefined;
+        const findStreaming = (prev: Message[]) =>
+          prev.findIndex(m => m.streaming && m.role === 'assistant' && m.requestId === requestId);
+        
+        if (data.type === 'delta') {
+          setMessages(prev => {
+            const index = findStreaming(prev);
+            if (index !== -1) {
+              const next = [...prev];
+              next[index] = { ...prev[index], content: prev[index].content + data.text };
+              return next;
+            }
+            return [
+              ...prev,
+              {
+                content: data.text,
+                role: 'assistant',
+                timestamp: data.timestamp,
+                streaming: true,
+                requestId
+              }
+            ];
+          });
+          return;
+        }
+        
         if (data.response) {
-          setMessages(prev => [
-            ...prev,
-            {
+          setMessages(prev => {
+            const complete: Message = {
               content: data.response,
               role: 'assistant',
-              timestamp: data.timestamp
+              timestamp: data.timestamp,
+              requestId
+            };
+            const index = findStreaming(prev);
+            if (index !== -1) {
+              const next = [...prev];
+              next[index] = complete;
+              return next;
             }
-          ]);
+            return [...prev, complete];
+          });
           
           if (data.conversation_id) {
             setConversationId(data.conversation_id);
@@ -145,10 +187,12 @@ const ChatContainer: React.FC = () => {
   const handleSendMessage = (message: string) => {
     if (!message.trim()) return;
     
+    const requestId = newRequestId();
     const newMessage: Message = {
       content: message,
       role: 'user',
-      timestamp: new Date().toISOString()
+      timestamp: new Date().toISOString(),
+      requestId
     };
     
     setMessages(prev => [...prev, newMessage]);
@@ -156,6 +200,7 @@ const ChatContainer: React.FC = () => {
     
     if (ws.current?.readyState === WebSocket.OPEN) {
       ws.current.send(JSON.stringify({
+        request_id: requestId,
         message,
         conversation_id: conversationId,
         kit_api_key: apiSettings.kitApiKey,